@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, Protocol, Optional, Literal, List
+from typing import Any, Dict, Protocol, Optional, Literal, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Parallelism for batch narration when the client does not advertise its own limit.
+DEFAULT_BATCH_CONCURRENCY = 8
 
 
 class LLMClient(Protocol):
@@ -110,14 +118,60 @@ class AnomalyNarrator:
         """
         Generate a human-readable description for an anomaly event.
 
+        If the LLM call fails (error or timeout) the rule-based narrative is returned instead.
+
         Returns:
             Dict with narrative_title and narrative_summary.
         """
+        return self._describe(event, tone)[0]
+
+    async def agenerate_description(self, event: AnomalyEvent, tone: Tone = "analyst") -> Dict[str, str]:
+        """Async `generate_description`; uses the client's `agenerate` when it has one."""
+        return (await self._adescribe(event, tone))[0]
+
+    def generate_descriptions(self, events: Sequence[AnomalyEvent], tones: Sequence[Tone]) -> List[Dict[str, str]]:
+        """
+        Describe many events, issuing LLM calls in parallel.
+
+        Calls are bounded by the client's `max_concurrency` (if any); results are in input order.
+        """
+        if isinstance(self.llm_client, DummyLLMClient) or len(events) <= 1:
+            return [self.generate_description(event, tone) for event, tone in zip(events, tones)]
+        workers = min(len(events), getattr(self.llm_client, "max_concurrency", DEFAULT_BATCH_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="narrate") as pool:
+            return list(pool.map(self.generate_description, events, tones))
+
+    async def agenerate_descriptions(self, events: Sequence[AnomalyEvent], tones: Sequence[Tone]) -> List[Dict[str, str]]:
+        """Async `generate_descriptions`: all descriptions are awaited concurrently."""
+        return list(await asyncio.gather(*(self.agenerate_description(e, t) for e, t in zip(events, tones))))
+
+    def _describe(self, event: AnomalyEvent, tone: Tone) -> Tuple[Dict[str, str], bool]:
+        """Return (narrative, fell_back); fell_back is True when the LLM failed and rules were used."""
+        if isinstance(self.llm_client, DummyLLMClient):
+            return self._build_rule_based_narrative(event, tone), False
+        try:
+            response = self.llm_client.generate(self._build_prompt(event, tone))
+        except Exception as exc:
+            logger.warning("LLM narration failed, using rule-based narrative: %r", exc)
+            return self._build_rule_based_narrative(event, tone), True
+        return self._parse_description(response), False
+
+    async def _adescribe(self, event: AnomalyEvent, tone: Tone) -> Tuple[Dict[str, str], bool]:
+        """Async `_describe`; blocking-only clients run in a worker thread."""
         if isinstance(self.llm_client, DummyLLMClient):
-            return self._build_rule_based_narrative(event, tone)
+            return self._build_rule_based_narrative(event, tone), False
+        agenerate = getattr(self.llm_client, "agenerate", None)
+        if agenerate is None:
+            return await asyncio.to_thread(self._describe, event, tone)
+        try:
+            response = await agenerate(self._build_prompt(event, tone))
+        except Exception as exc:
+            logger.warning("LLM narration failed, using rule-based narrative: %r", exc)
+            return self._build_rule_based_narrative(event, tone), True
+        return self._parse_description(response), False
 
-        prompt = self._build_prompt(event, tone)
-        response = self.llm_client.generate(prompt)
+    @staticmethod
+    def _parse_description(response: str) -> Dict[str, str]:
         try:
             parsed = json.loads(response)
             if isinstance(parsed, dict) and "narrative_title" in parsed and "narrative_summary" in parsed:
@@ -194,16 +248,22 @@ class AnomalyNarrator:
         Returns:
             Dict with summary_title and summary_body.
         """
-        # TODO: when a real LLM is configured, use _build_sequence_prompt and llm_client.generate
+        return self._summarize(events, tone)[0]
+
+    def _summarize(self, events: List[AnomalyEvent], tone: Tone) -> Tuple[Dict[str, str], bool]:
+        """Return (summary, fell_back); falls back to the rule-based summary if the LLM fails."""
         if isinstance(self.llm_client, DummyLLMClient):
-            return self._build_rule_based_sequence_summary(events, tone)
+            return self._build_rule_based_sequence_summary(events, tone), False
 
-        prompt = self._build_sequence_prompt(events, tone)
-        response = self.llm_client.generate(prompt)
+        try:
+            response = self.llm_client.generate(self._build_sequence_prompt(events, tone))
+        except Exception as exc:
+            logger.warning("LLM sequence summary failed, using rule-based summary: %r", exc)
+            return self._build_rule_based_sequence_summary(events, tone), True
         try:
             parsed = json.loads(response)
             if isinstance(parsed, dict) and "summary_title" in parsed and "summary_body" in parsed:
-                return {"summary_title": parsed["summary_title"], "summary_body": parsed["summary_body"]}
+                return {"summary_title": parsed["summary_title"], "summary_body": parsed["summary_body"]}, False
         except Exception:  # pragma: no cover - fallback path
             pass
-        return {"summary_title": "Anomaly sequence summary", "summary_body": response}
+        return {"summary_title": "Anomaly sequence summary", "summary_body": response}, False
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import os
-from typing import Literal
+import threading
+from typing import Literal, Optional
 
-from llm.anomaly_narrator import LLMClient, DummyLLMClient
+from llm.anomaly_narrator import AnomalyNarrator, LLMClient, DummyLLMClient
+from llm.narration_cache import CachedAnomalyNarrator, NarrationCache
 
 ProviderName = Literal["dummy", "openai"]
 
+_shared_cache: Optional[NarrationCache] = None
+_cache_lock = threading.Lock()
+
 
 def get_llm_client_from_env() -> LLMClient:
     """Return an LLM client based on env var LLM_PROVIDER."""
@@ -18,3 +23,25 @@ def get_llm_client_from_env() -> LLMClient:
 
         return OpenAILLMClient()
     return DummyLLMClient()
+
+
+def get_narration_cache_from_env() -> NarrationCache:
+    """
+    Return the process-wide narration cache.
+
+    NARRATION_CACHE_SIZE sets the in-memory LRU size (default 4096); NARRATION_CACHE_PATH, if
+    set, persists narrations to a SQLite file so they survive restarts.
+    """
+    global _shared_cache
+    with _cache_lock:
+        if _shared_cache is None:
+            _shared_cache = NarrationCache(
+                maxsize=int(os.getenv("NARRATION_CACHE_SIZE", "4096")),
+                path=os.getenv("NARRATION_CACHE_PATH") or None,
+            )
+        return _shared_cache
+
+
+def get_narrator_from_env() -> AnomalyNarrator:
+    """Return a narrator for the env-configured LLM client, backed by the shared narration cache."""
+    return CachedAnomalyNarrator(get_llm_client_from_env(), get_narration_cache_from_env())
@@ -0,0 +1,220 @@
+"""Narration cache keyed by anomaly-event fingerprint and tone."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from llm.anomaly_narrator import AnomalyEvent, AnomalyNarrator, LLMClient
+
+
+def _json_default(value: Any) -> Any:
+    """Serialise NumPy scalars by value so equal events hash equally."""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def event_fingerprint(*parts: Any) -> str:
+    """Stable sha256 over JSON-serialised parts (dataclass events are expanded with asdict)."""
+    normalised = [asdict(p) if isinstance(p, AnomalyEvent) else p for p in parts]
+    payload = json.dumps(normalised, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class NarrationCache:
+    """
+    Thread-safe LRU of narration dicts with optional SQLite persistence.
+
+    Notes:
+        - Memory is checked first; on a miss the on-disk table (if configured) is consulted and
+          hits are promoted into memory, so cached narrations survive restarts.
+        - Writes go to both tiers; the disk tier is unbounded and shared between processes.
+        - Deferred narration job records live in a separate `narration_jobs` table on the disk
+          tier (`get_job`/`put_job`), stamped with their write time so `expire_jobs` can prune
+          them without touching cached narrations.
+    """
+
+    def __init__(self, maxsize: int = 4096, path: Optional[str | Path] = None) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS narrations (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS narration_jobs (id TEXT PRIMARY KEY, value TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_narration_jobs_updated_at ON narration_jobs (updated_at)")
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached narration, or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute("SELECT value FROM narrations WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._store(key, value)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return dict(value)
+
+    def peek(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Memory-tier-only `get`: never touches disk, so it is safe on an event loop.
+
+        A hit is counted; a miss is not (callers follow up with `get`, which counts it).
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        """Cache a narration in memory and, if configured, on disk."""
+        with self._lock:
+            self._store(key, dict(value))
+            self._persist(key, value)
+
+    @property
+    def persistent(self) -> bool:
+        """True when a disk tier is configured (and so shared with other processes)."""
+        return self._conn is not None
+
+    def get_job(self, narration_id: str) -> Optional[Dict[str, Any]]:
+        """Read a deferred narration job record from the disk tier (None without one or if unknown)."""
+        with self._lock:
+            if self._conn is None:
+                return None
+            row = self._conn.execute("SELECT value FROM narration_jobs WHERE id = ?", (narration_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put_job(self, narration_id: str, value: Dict[str, Any]) -> None:
+        """Upsert a job record on the disk tier (no-op without one); it is never kept in memory."""
+        with self._lock:
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO narration_jobs (id, value, updated_at) VALUES (?, ?, ?)",
+                        (narration_id, json.dumps(value), time.time()),
+                    )
+
+    def expire_jobs(self, max_age_seconds: float) -> int:
+        """Delete job records last written more than `max_age_seconds` ago; returns the count."""
+        with self._lock:
+            if self._conn is None:
+                return 0
+            with self._conn:
+                cursor = self._conn.execute(
+                    "DELETE FROM narration_jobs WHERE updated_at < ?", (time.time() - max_age_seconds,)
+                )
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _persist(self, key: str, value: Dict[str, Any]) -> None:
+        """Upsert into the disk tier, if any (lock must be held)."""
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO narrations (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+
+    def _store(self, key: str, value: Dict[str, Any]) -> None:
+        """Insert into the LRU (lock must be held)."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class CachedAnomalyNarrator(AnomalyNarrator):
+    """
+    AnomalyNarrator whose descriptions and sequence summaries are cached.
+
+    Keys hash the method, LLM client (class and model name), tone and every AnomalyEvent field,
+    so a narrative is reused only for an identical event narrated the same way. Rule-based
+    fallbacks for failed LLM calls are returned but not cached, so the LLM is retried next time.
+    The async path checks the memory tier on the loop and runs disk-tier reads and writes in a
+    worker thread.
+    """
+
+    def __init__(self, llm_client: LLMClient, cache: NarrationCache) -> None:
+        super().__init__(llm_client)
+        self.cache = cache
+        self._client_id = f"{type(llm_client).__name__}:{getattr(llm_client, '_model_name', '')}"
+
+    def _describe(self, event: AnomalyEvent, tone: AnomalyNarrator.Tone) -> Tuple[Dict[str, str], bool]:
+        key = event_fingerprint("description", self._client_id, tone, event)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, False
+        narration, fell_back = super()._describe(event, tone)
+        if not fell_back:
+            self.cache.put(key, narration)
+        return narration, fell_back
+
+    async def _adescribe(self, event: AnomalyEvent, tone: AnomalyNarrator.Tone) -> Tuple[Dict[str, str], bool]:
+        key = event_fingerprint("description", self._client_id, tone, event)
+        cached = self.cache.peek(key)
+        if cached is not None:
+            return cached, False
+        if getattr(self.llm_client, "agenerate", None) is None:
+            # Blocking client: one worker thread does the disk lookup, the LLM call and the write.
+            return await asyncio.to_thread(self._describe, event, tone)
+        if self.cache.persistent:
+            cached = await asyncio.to_thread(self.cache.get, key)
+        else:
+            cached = self.cache.get(key)
+        if cached is not None:
+            return cached, False
+        narration, fell_back = await super()._adescribe(event, tone)
+        if not fell_back:
+            if self.cache.persistent:
+                await asyncio.to_thread(self.cache.put, key, narration)
+            else:
+                self.cache.put(key, narration)
+        return narration, fell_back
+
+    def _summarize(self, events: List[AnomalyEvent], tone: AnomalyNarrator.Tone) -> Tuple[Dict[str, str], bool]:
+        key = event_fingerprint("sequence", self._client_id, tone, *events)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached, False
+        summary, fell_back = super()._summarize(events, tone)
+        if not fell_back:
+            self.cache.put(key, summary)
+        return summary, fell_back
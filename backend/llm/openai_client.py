@@ -2,26 +2,111 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import os
-from typing import Optional
+import threading
+from typing import Any, Dict, Optional
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 
 MODEL_NAME = "gpt-4.1-mini"
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_CONCURRENCY = 16
 
 
 class OpenAILLMClient:
-    """LLM client using OpenAI's Chat Completions API."""
+    """
+    LLM client using OpenAI's Chat Completions API.
 
-    def __init__(self, model_name: str = MODEL_NAME) -> None:
-        api_key = os.getenv("OPENAI_API_KEY")
+    Notes:
+        - `generate` (blocking) and `agenerate` (async) are bounded separately: each path
+          allows at most `max_concurrency` calls in flight (with its own connection pool), so
+          a process using both can have up to 2 * `max_concurrency` requests open. Each call
+          is bounded by `timeout` seconds; a call that cannot get a slot within `timeout`
+          fails with TimeoutError instead of queueing indefinitely, so callers can fall back
+          to the rule-based narrative quickly.
+        - Connections are pooled and kept alive between calls; SDK retries are disabled so the
+          timeout is the real upper bound on a call. `close()` releases the blocking pool;
+          `aclose()` releases both pools.
+        - `base_url` (or OPENAI_BASE_URL) points the client at any compatible server, e.g. a
+          local stub in tests.
+    """
+
+    def __init__(
+        self,
+        model_name: str = MODEL_NAME,
+        *,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> None:
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY is missing")
         self._model_name = model_name
-        self._client = OpenAI(api_key=api_key)
+        self._api_key = api_key
+        self._base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        self.timeout = float(timeout if timeout is not None else os.getenv("LLM_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS))
+        self.max_concurrency = int(
+            max_concurrency if max_concurrency is not None else os.getenv("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)
+        )
+        if self.max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self._client = OpenAI(
+            api_key=api_key,
+            base_url=self._base_url,
+            timeout=self.timeout,
+            max_retries=0,
+            http_client=httpx.Client(limits=self._limits(), timeout=self.timeout),
+        )
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        # The async client and semaphore are bound to an event loop, so they are created on
+        # first use and rebuilt if called from a different loop.
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_slots: Optional[asyncio.Semaphore] = None
 
     def generate(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
-        params = {
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError(f"no LLM slot available within {self.timeout}s")
+        try:
+            response = self._client.chat.completions.create(**self._params(prompt, temperature, max_tokens))
+        finally:
+            self._slots.release()
+        return response.choices[0].message.content
+
+    async def agenerate(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
+        """Async `generate`: many calls can be awaited concurrently, up to `max_concurrency` in flight."""
+        client, slots = self._async_resources()
+        params = self._params(prompt, temperature, max_tokens)
+
+        async def call() -> str:
+            async with slots:
+                response = await client.chat.completions.create(**params)
+            return response.choices[0].message.content
+
+        return await asyncio.wait_for(call(), self.timeout)
+
+    def close(self) -> None:
+        """Close pooled connections of the blocking client (use `aclose` for both)."""
+        self._client.close()
+
+    async def aclose(self) -> None:
+        """Close pooled connections of the async client and the blocking client."""
+        client, loop = self._async_client, self._async_loop
+        self._async_client = self._async_slots = self._async_loop = None
+        if client is not None:
+            if loop is asyncio.get_running_loop():
+                await client.close()
+            else:
+                self._discard_async_client(client, loop)
+        self.close()
+
+    def _params(self, prompt: str, temperature: Optional[float], max_tokens: Optional[int]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
             "model": self._model_name,
             "messages": [{"role": "user", "content": prompt}],
         }
@@ -29,6 +114,43 @@ class OpenAILLMClient:
             params["temperature"] = temperature
         if max_tokens is not None:
             params["max_tokens"] = max_tokens
+        return params
 
-        response = self._client.chat.completions.create(**params)
-        return response.choices[0].message.content
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+
+    def _async_resources(self) -> tuple[AsyncOpenAI, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop or self._async_client is None or self._async_slots is None:
+            if self._async_client is not None:
+                self._discard_async_client(self._async_client, self._async_loop)
+            self._async_loop = loop
+            self._async_client = AsyncOpenAI(
+                api_key=self._api_key,
+                base_url=self._base_url,
+                timeout=self.timeout,
+                max_retries=0,
+                http_client=httpx.AsyncClient(limits=self._limits(), timeout=self.timeout),
+            )
+            self._async_slots = asyncio.Semaphore(self.max_concurrency)
+        return self._async_client, self._async_slots
+
+    @staticmethod
+    def _discard_async_client(client: AsyncOpenAI, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close an async client created on another event loop, on that loop if it still runs."""
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+            return
+        # The owning loop is gone, so its connections cannot be shut down cleanly; closing from
+        # here still drops the pool and its sockets instead of leaking them until collection.
+        task = asyncio.get_running_loop().create_task(_close_quietly(client))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+
+_closing: set = set()  # keeps close tasks referenced until they finish
+
+
+async def _close_quietly(client: AsyncOpenAI) -> None:
+    with contextlib.suppress(Exception):
+        await client.close()
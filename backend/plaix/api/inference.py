@@ -2,18 +2,47 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
 
+import numpy as np
 from pydantic import BaseModel
 
 # TODO: Uncomment when wiring real FastAPI app.
 # from fastapi import FastAPI
 
+from plaix.config import NarrationMode, settings
+from plaix.core.baseline_cache import BaselineCache
+from plaix.core.feature_schema import FEATURE_SCHEMA
 from plaix.core.model import AnomalyModel
-from plaix.core.ups_scorer import BaselineStats, UPSScorer
+from plaix.core.model_registry import ModelRegistry
+from plaix.core.role_baselines import RoleBaselineTable
+from plaix.core.ups_scorer import BaselineStats, HistoryProvider, UPSScorer
+from plaix.history.sqlite import SQLiteHistoryProvider
+from plaix.services.narration_worker import NarrationWorker
 from plaix.sports.cricket.features import CricketFeatureExtractor
-from llm.anomaly_narrator import AnomalyEvent, AnomalyNarrator
-from llm.factory import get_llm_client_from_env
+from plaix.utils.logger import get_logger
+from llm.anomaly_narrator import AnomalyEvent
+from llm.factory import get_narration_cache_from_env, get_narrator_from_env
+
+logger = get_logger(__name__)
+
+
+def _payload_team(payload: dict) -> str | None:
+    """Team of a scoring payload, for the role-baseline fallbacks."""
+    team = payload.get("team")
+    return None if team is None or team == "" else str(team)
+
+
+def _payload_batting_position(payload: dict) -> int | None:
+    """Batting position of a scoring payload as an int, or None if absent or not a number."""
+    try:
+        return int(payload["batting_position"])
+    except (KeyError, TypeError, ValueError):
+        return None
 
 
 class SinglePredictRequest(BaseModel):
@@ -21,6 +50,7 @@ class SinglePredictRequest(BaseModel):
 
     payload: dict
     tone: str | None = None
+    narration: NarrationMode | None = None
     model_path: str | None = None
 
 
@@ -35,6 +65,8 @@ class SinglePredictResponse(BaseModel):
     explanation: str | None = None
     narrative_title: str | None = None
     narrative_summary: str | None = None
+    narration_id: str | None = None
+    model_version: str | None = None
 
 
 class BatchPredictRequest(BaseModel):
@@ -92,63 +124,276 @@ class DummyHistoryProvider:
         return []
 
 
-def extract_features(payload: Dict[str, Any]) -> Dict[str, float]:
-    """Build feature vector consistent with training."""
-    return {
-        "baseline_mean_runs": float(payload["baseline_mean_runs"]),
-        "baseline_std_runs": float(payload["baseline_std_runs"]),
-        "current_runs": float(payload["current_runs"]),
-        "venue_flatness": float(payload.get("venue_flatness", 0.5)),
-        "opposition_strength": float(payload.get("opposition_strength", 0.5)),
-        "batting_position": int(payload.get("batting_position", 4)),
-    }
-
-
 class InferenceService:
-    """Inference service that wires UPS scoring and model inference."""
-
-    def __init__(self, model_path: str | None = None) -> None:
+    """
+    Inference service that wires UPS scoring and model inference.
+
+    The served model is held as one (version, model) tuple that is replaced atomically when the
+    registry's active version changes; each request reads the tuple once, so in-flight requests
+    finish on the model they started with.
+    """
+
+    def __init__(
+        self,
+        model_path: str | None = None,
+        history_provider: HistoryProvider | None = None,
+        registry: ModelRegistry | None = None,
+    ) -> None:
         self.feature_extractor = self._load_feature_extractor()
-        self.ups_scorer = UPSScorer(DummyHistoryProvider())
-        self.model = self._load_model(model_path)
-        self.narrator = AnomalyNarrator(get_llm_client_from_env())
+        self.ups_scorer = UPSScorer(
+            history_provider or self._load_history_provider(),
+            baseline_cache=BaselineCache(
+                maxsize=settings.baseline_cache_size,
+                ttl_seconds=settings.baseline_cache_ttl_seconds,
+            ),
+            role_baselines=self._load_role_baselines(),
+        )
+        self._history_lock = threading.Lock()
+        self._next_history_check = time.monotonic() + settings.history_poll_seconds
+        self.registry = registry if registry is not None else ModelRegistry(settings.model_registry_path)
+        self._model_lock = threading.Lock()
+        self._next_model_check = time.monotonic() + settings.model_registry_poll_seconds
+        self._served: Tuple[str | None, Any] = self._load_model(model_path)
+        self.narrator = get_narrator_from_env()
+        self.narration_worker = NarrationWorker(
+            lambda event, tone: self.narrator.generate_description(event, tone=tone or "analyst"),
+            max_workers=settings.narration_workers,
+            max_jobs=settings.narration_max_jobs,
+            store=get_narration_cache_from_env(),
+            job_ttl_seconds=settings.narration_job_ttl_seconds,
+        )
         self.demo_events = self._load_demo_events()
 
     def _load_feature_extractor(self) -> CricketFeatureExtractor:
         """Construct feature extractor (placeholder)."""
         return CricketFeatureExtractor()
 
-    def _load_model(self, model_path: str | None) -> AnomalyModel:
-        """Load model wrapper and weights."""
+    def _load_history_provider(self) -> HistoryProvider:
+        """Use the SQLite history store when configured, else the empty stub."""
+        if settings.history_db_path:
+            return SQLiteHistoryProvider(settings.history_db_path)
+        return DummyHistoryProvider()
+
+    def _load_role_baselines(self) -> RoleBaselineTable | None:
+        """Load precomputed fallback baselines if the table has been built."""
+        path = Path(settings.role_baselines_path)
+        if path.exists():
+            return RoleBaselineTable.load(path)
+        return None
+
+    @property
+    def model(self) -> Any:
+        """Model currently being served."""
+        return self._served[1]
+
+    @model.setter
+    def model(self, model: Any) -> None:
+        self._served = (None, model)
+
+    @property
+    def model_version(self) -> str | None:
+        """Registry version (or artifact name) of the model currently being served."""
+        return self._served[0]
+
+    def _load_model(self, model_path: str | None) -> Tuple[str | None, AnomalyModel]:
+        """Load the registry's active version, else the `model_path` artifact, as (version, model)."""
+        try:
+            return self.registry.load(compiled=settings.compile_model)
+        except FileNotFoundError:
+            pass
         model = AnomalyModel(model_type="logistic_regression", model_config={}, sport="cricket")
         if model_path:
             try:
-                model.load_model(model_path)
+                model.load_model(model_path, compiled=settings.compile_model)
+                return Path(model_path).name, model
             except FileNotFoundError:
-                # Model artifact missing; continue with uninitialized model for demo/testing.
                 pass
-        return model
+        # Continue with an unfitted model for demo/testing; predictions fail until one is registered.
+        logger.warning(
+            "No model found (registry=%s, model_path=%s); serving an unfitted model", self.registry.root, model_path
+        )
+        return None, model
+
+    def refresh_model(self, force: bool = False) -> bool:
+        """
+        Swap in the registry's active version if it changed. Returns True when a new model was loaded.
+
+        Checks run at most every `settings.model_registry_poll_seconds` unless forced. Only one
+        thread loads at a time; others keep serving the current model meanwhile.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_model_check:
+            return False
+        if not self._model_lock.acquire(blocking=False):
+            return False
+        try:
+            self._next_model_check = now + settings.model_registry_poll_seconds
+            active = self.registry.active_version()
+            if active is None or active == self._served[0]:
+                return False
+            try:
+                served = self.registry.load(active, compiled=settings.compile_model)
+            except Exception:
+                logger.exception("Failed to load model version %s; keeping %s", active, self._served[0])
+                return False
+            self._served = served
+            logger.info("Serving model version %s", active)
+            return True
+        finally:
+            self._model_lock.release()
+
+    def refresh_history(self, force: bool = False) -> int:
+        """
+        Drop cached baselines for players whose history changed since the last check.
+
+        Cached baselines have no TTL by default, so rows written by another process (an ingest
+        job appending to the SQLite store) only show up through this check. Runs at most every
+        `settings.history_poll_seconds` unless forced; returns `UPSScorer.sync_history`'s count.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_history_check:
+            return 0
+        if not self._history_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._next_history_check = now + settings.history_poll_seconds
+            return self.ups_scorer.sync_history()
+        finally:
+            self._history_lock.release()
 
     def preprocess_input(self, payload: dict) -> Dict[str, float]:
-        """Validate and convert raw payload to feature representation."""
-        if "baseline_mean_runs" not in payload or "baseline_std_runs" not in payload:
-            baseline = BaselineStats(mean_runs=20.0, std_runs=15.0, num_innings=0, source="default")
-            payload["baseline_mean_runs"] = baseline.mean_runs
-            payload["baseline_std_runs"] = baseline.std_runs
-        return extract_features(payload)
-
-    def run_inference(self, payload: dict, tone: str = "analyst") -> SinglePredictResponse:
-        """Run UPS scoring + model inference for a single record."""
+        """Validate and convert raw payload to feature representation (schema column -> value)."""
+        return dict(zip(FEATURE_SCHEMA.columns, self.preprocess_batch([payload])[0].tolist()))
+
+    def preprocess_batch(self, payloads: Sequence[dict]) -> np.ndarray:
+        """Convert payloads (default baselines filled in) to the shared float32 feature matrix."""
+        return FEATURE_SCHEMA.transform([self._with_default_baseline(payload) for payload in payloads])
+
+    @staticmethod
+    def _with_default_baseline(payload: dict) -> dict:
+        """The payload with the default baseline filled in when missing; a copy, never mutated."""
+        if "baseline_mean_runs" in payload and "baseline_std_runs" in payload:
+            return payload
+        baseline = BaselineStats(mean_runs=20.0, std_runs=15.0, num_innings=0, source="default")
+        return {**payload, "baseline_mean_runs": baseline.mean_runs, "baseline_std_runs": baseline.std_runs}
+
+    def run_inference(
+        self, payload: dict, tone: str = "analyst", narration: NarrationMode | None = None
+    ) -> SinglePredictResponse:
+        """Run UPS scoring + model inference for a single record (narration per `narration` mode)."""
+        self.refresh_model()
+        self.refresh_history()
+        version, model = self._served
         ups_score = self.ups_scorer.compute_ups_score(
             payload.get("player_id", "unknown"),
             payload.get("match_format", "T20"),
             current_runs=float(payload["current_runs"]),
+            team=_payload_team(payload),
+            batting_position=_payload_batting_position(payload),
+        )
+        event = self._score_event(payload, ups_score, model)
+        narrated, narration_id = self._narration_for(event, tone, narration)
+        return self._build_response(event, narrated, narration_id, model_version=version)
+
+    async def run_inference_async(
+        self, payload: dict, tone: str = "analyst", narration: NarrationMode | None = None
+    ) -> SinglePredictResponse:
+        """
+        Async `run_inference`.
+
+        History lookups are awaited (async providers) or offloaded to a worker thread, and
+        narration runs off the event loop, so concurrent requests do not hold threadpool slots
+        while waiting on I/O. Registry checks (when due) and model scoring also run in a worker
+        thread, so a model load, a history change check or a slow predict never blocks the loop.
+        """
+        if time.monotonic() >= self._next_model_check:
+            await asyncio.to_thread(self.refresh_model)
+        if time.monotonic() >= self._next_history_check:
+            await asyncio.to_thread(self.refresh_history)
+        version, model = self._served
+        ups_score = await self.ups_scorer.compute_ups_score_async(
+            payload.get("player_id", "unknown"),
+            payload.get("match_format", "T20"),
+            current_runs=float(payload["current_runs"]),
+            team=_payload_team(payload),
+            batting_position=_payload_batting_position(payload),
+        )
+        event = await asyncio.to_thread(self._score_event, payload, ups_score, model)
+        if (narration or settings.default_narration_mode) == "inline":
+            narrated, narration_id = await self._narrate_async(event, tone), None
+        else:
+            narrated, narration_id = self._narration_for(event, tone, narration)
+        return self._build_response(event, narrated, narration_id, model_version=version)
+
+    def run_inference_batch(
+        self,
+        payloads: List[dict],
+        tones: Sequence[str | None] | None = None,
+        narrations: Sequence[NarrationMode | None] | None = None,
+    ) -> List[SinglePredictResponse]:
+        """
+        Run UPS scoring + model inference for many records at once.
+
+        UPS is scored in one `score_innings_batch` pass, features are stacked into a single
+        float matrix, and one `predict_proba` call yields both probabilities and labels.
+        Inline narrations are issued in parallel rather than one after another.
+        Results match `run_inference` per record (probabilities up to matrix-product rounding).
+        """
+        if not payloads:
+            return []
+        self.refresh_model()
+        self.refresh_history()
+        version, model = self._served
+        tones = list(tones) if tones is not None else ["analyst"] * len(payloads)
+        modes = list(narrations) if narrations is not None else [None] * len(payloads)
+        ups_results = self.ups_scorer.score_innings_batch(
+            [p.get("player_id", "unknown") for p in payloads],
+            [p.get("match_format", "T20") for p in payloads],
+            [float(p["current_runs"]) for p in payloads],
+            teams=[_payload_team(p) for p in payloads],
+            batting_positions=[_payload_batting_position(p) for p in payloads],
+        )
+        payloads = [self._with_default_baseline(payload) for payload in payloads]
+        X = self.preprocess_batch(payloads)
+        probas, labels = self._predict(model, X)
+        events = [
+            self._build_event(payload, ups["ups_score"], ups["ups_anomaly_flag"], ups["ups_bucket"], float(proba), int(label))
+            for payload, ups, proba, label in zip(payloads, ups_results, probas, labels)
+        ]
+        inline = [i for i, mode in enumerate(modes) if (mode or settings.default_narration_mode) == "inline"]
+        inline_narrations = dict(
+            zip(inline, self._narrate_many([events[i] for i in inline], [tones[i] or "analyst" for i in inline]))
         )
+        responses = []
+        for i, (event, tone, mode) in enumerate(zip(events, tones, modes)):
+            if i in inline_narrations:
+                narrated, narration_id = inline_narrations[i], None
+            else:
+                narrated, narration_id = self._narration_for(event, tone or "analyst", mode)
+            responses.append(self._build_response(event, narrated, narration_id, model_version=version))
+        return responses
+
+    @staticmethod
+    def _predict(model: Any, X: Any) -> tuple[np.ndarray, np.ndarray]:
+        """Positive-class probabilities and labels from a single predict_proba call."""
+        proba_matrix = np.asarray(model.predict_proba(X))
+        backend = getattr(model, "model", model)
+        classes = getattr(backend, "classes_", None)
+        winners = np.argmax(proba_matrix, axis=1)
+        labels = np.asarray(classes)[winners] if classes is not None else winners
+        return proba_matrix[:, 1], labels
+
+    def _score_event(self, payload: dict, ups_score: float, model: Any) -> AnomalyEvent:
+        """Classify UPS, run the model and assemble the anomaly event for a payload."""
         flag, bucket = self.ups_scorer.classify_ups(ups_score)
-        features = self.preprocess_input(payload)
-        proba = float(self.model.predict_proba([[features[c] for c in features]])[0][1])
-        label = int(self.model.predict([[features[c] for c in features]])[0])
-        event = AnomalyEvent(
+        payload = self._with_default_baseline(payload)
+        probas, labels = self._predict(model, self.preprocess_batch([payload]))
+        return self._build_event(payload, ups_score, flag, bucket, float(probas[0]), int(labels[0]))
+
+    @staticmethod
+    def _build_event(payload: dict, ups_score: float, flag: int, bucket: str, proba: float, label: int) -> AnomalyEvent:
+        """Assemble the anomaly event for a scored payload."""
+        return AnomalyEvent(
             player_id=payload.get("player_id", "unknown"),
             match_format=payload.get("match_format", "T20"),
             team=payload.get("team"),
@@ -164,22 +409,59 @@ class InferenceService:
             model_anomaly_label=label,
             match_context=payload.get("match_context", {}),
         )
-        narration = {"narrative_title": None, "narrative_summary": None}
+
+    def _narrate(self, event: AnomalyEvent, tone: str) -> Dict[str, Any]:
+        """Narrate an event; narration is optional so failures yield empty fields."""
         try:
-            narration = self.narrator.generate_description(event, tone=tone or "analyst")
+            return self.narrator.generate_description(event, tone=tone or "analyst")
         except Exception:
             # TODO: add logging; narration optional
-            narration = {"narrative_title": None, "narrative_summary": None}
+            return {"narrative_title": None, "narrative_summary": None}
 
+    async def _narrate_async(self, event: AnomalyEvent, tone: str) -> Dict[str, Any]:
+        """Async `_narrate`: awaits the LLM instead of holding a worker thread."""
+        try:
+            return await self.narrator.agenerate_description(event, tone=tone or "analyst")
+        except Exception:
+            return {"narrative_title": None, "narrative_summary": None}
+
+    def _narrate_many(self, events: List[AnomalyEvent], tones: List[str]) -> List[Dict[str, Any]]:
+        """Narrate events in parallel; on an unexpected error, fall back to one-by-one `_narrate`."""
+        try:
+            return self.narrator.generate_descriptions(events, tones)
+        except Exception:
+            return [self._narrate(event, tone) for event, tone in zip(events, tones)]
+
+    def _narration_for(
+        self, event: AnomalyEvent, tone: str, mode: NarrationMode | None
+    ) -> Tuple[Dict[str, Any], str | None]:
+        """Return (narrative fields, narration_id) for a narration mode (default from settings)."""
+        mode = mode or settings.default_narration_mode
+        if mode == "deferred":
+            return {}, self.narration_worker.submit(event, tone or "analyst")
+        if mode == "none":
+            return {}, None
+        return self._narrate(event, tone), None
+
+    @staticmethod
+    def _build_response(
+        event: AnomalyEvent,
+        narration: Dict[str, Any],
+        narration_id: str | None = None,
+        model_version: str | None = None,
+    ) -> SinglePredictResponse:
+        """Assemble the prediction response from a scored event and its narration."""
         return SinglePredictResponse(
-            ups_score=ups_score,
-            ups_bucket=bucket,
-            ups_anomaly_flag_baseline=flag,
-            model_anomaly_probability=proba,
-            model_anomaly_label=label,
+            ups_score=event.ups_score,
+            ups_bucket=event.ups_bucket,
+            ups_anomaly_flag_baseline=event.ups_anomaly_flag_baseline,
+            model_anomaly_probability=event.model_anomaly_probability,
+            model_anomaly_label=event.model_anomaly_label,
             explanation=None,
             narrative_title=narration.get("narrative_title"),
             narrative_summary=narration.get("narrative_summary"),
+            narration_id=narration_id,
+            model_version=model_version,
         )
 
     def _load_demo_events(self) -> List[dict]:
@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import AsyncIterator
+
 from fastapi import FastAPI, HTTPException
 
 from plaix.config import settings
@@ -17,17 +22,61 @@ from plaix.api.inference import (
     SinglePredictResponse,
 )
 from plaix.services import anomaly_feed, live_match, report_export
+from plaix.services.feed_manager import FeedManager
+from plaix.services.feed_store import FeedRow
+from plaix.services.micro_batcher import MicroBatcher
 import pandas as pd
 from plaix.sports.cricket.scorer import score_events_from_dicts as score_cricket
 from plaix.sports.football.scorer import score_events_from_dicts as score_football
+from llm.factory import get_narration_cache_from_env
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Stop the micro-batching and narration workers and close LLM connections on shutdown."""
+    yield
+    if micro_batcher is not None:
+        await micro_batcher.close()
+    inference_service.narration_worker.shutdown(wait=False)
+    aclose = getattr(inference_service.narrator.llm_client, "aclose", None)
+    if aclose is not None:
+        await aclose()
 
-app = FastAPI(title="PLAIX", version="0.2.0")
+
+app = FastAPI(title="PLAIX", version="0.2.0", lifespan=lifespan)
 
 # Register available sports.
 registry.register("cricket", score_cricket)
 registry.register("football", score_football)
 inference_service = InferenceService(model_path="models/ups_logreg.pkl")
-feed_df = anomaly_feed.load_feed_dataset()
+
+
+def _score_single_batch(items: list[tuple[dict, str, str | None]]) -> list[SinglePredictResponse]:
+    """Score micro-batched (payload, tone, narration mode) items with one vectorized pass."""
+    payloads, tones, narrations = zip(*items)
+    return inference_service.run_inference_batch(list(payloads), tones, narrations)
+
+
+# Opt-in: hold concurrent /predict/single requests for a few ms and score them together.
+micro_batcher = (
+    MicroBatcher(
+        _score_single_batch,
+        max_batch_size=settings.micro_batch_max_size,
+        max_wait_ms=settings.micro_batch_max_wait_ms,
+        max_in_flight=settings.micro_batch_max_in_flight,
+    )
+    if settings.micro_batching_enabled
+    else None
+)
+# Feed rows are served from immutable snapshots; file changes and appended rows are rebuilt
+# in the background and swapped in atomically. Rebuilds load strictly so a half-written file
+# keeps the current snapshot (and is retried) instead of falling back to another source.
+feed_manager = FeedManager(
+    partial(anomaly_feed.load_feed_dataset, strict=True),
+    anomaly_feed.DATA_CANDIDATES,
+    poll_seconds=settings.feed_poll_seconds,
+    initial=anomaly_feed.load_feed_dataset(),
+)
 
 
 @app.get("/health")
@@ -37,12 +86,22 @@ def health() -> dict[str, str]:
 
 
 @app.get("/internal/metrics")
-def internal_metrics() -> dict[str, int]:
+def internal_metrics() -> dict[str, float]:
     """Expose basic service metrics."""
-    return {
+    metrics = {
         "active_sports": len(registry._handlers),
-        "feed_items_loaded": len(feed_df) if feed_df is not None else 0,
+        "feed_items_loaded": len(feed_manager.snapshot),
+        "feed_duplicate_event_ids": len(feed_manager.snapshot.duplicate_event_ids),
     }
+    cache = inference_service.ups_scorer.baseline_cache
+    if cache is not None:
+        metrics.update({f"baseline_cache_{name}": value for name, value in cache.stats().items()})
+    metrics.update({f"feed_{name}": value for name, value in feed_manager.stats().items()})
+    metrics.update({f"narration_{name}": value for name, value in inference_service.narration_worker.stats().items()})
+    metrics.update({f"narration_cache_{name}": value for name, value in get_narration_cache_from_env().stats().items()})
+    if micro_batcher is not None:
+        metrics.update({f"micro_batch_{name}": value for name, value in micro_batcher.stats().items()})
+    return metrics
 
 
 @app.post("/score", response_model=list[dict])
@@ -63,19 +122,49 @@ def plaix_score(request: ScoreRequest) -> ScoreResponse:
 
 
 @app.post("/predict/single", response_model=SinglePredictResponse)
-def predict_single(request: SinglePredictRequest) -> SinglePredictResponse:
+async def predict_single(request: SinglePredictRequest) -> SinglePredictResponse:
     """Inference endpoint returning UPS + model anomaly output for a single payload."""
     tone = request.tone or "analyst"
-    return inference_service.run_inference(request.payload, tone=tone)
+    if micro_batcher is not None:
+        return await micro_batcher.submit((request.payload, tone, request.narration))
+    return await inference_service.run_inference_async(request.payload, tone=tone, narration=request.narration)
 
 
 @app.post("/predict/batch", response_model=BatchPredictResponse)
-def predict_batch(request: list[SinglePredictRequest]) -> BatchPredictResponse:
-    """Inference endpoint for a batch of payloads."""
-    results = [inference_service.run_inference(item.payload, tone=item.tone or "analyst") for item in request]
+async def predict_batch(request: list[SinglePredictRequest]) -> BatchPredictResponse:
+    """Inference endpoint for a batch of payloads (one vectorized scoring pass, off the event loop)."""
+    results = await asyncio.to_thread(
+        inference_service.run_inference_batch,
+        [item.payload for item in request],
+        [item.tone for item in request],
+        [item.narration for item in request],
+    )
     return BatchPredictResponse(results=results)
 
 
+@app.get("/narration/{narration_id}")
+async def get_narration(narration_id: str, wait_ms: int = 0) -> dict:
+    """
+    Fetch a deferred narration by id.
+
+    With wait_ms > 0 the request long-polls until the narration is ready (or the wait expires),
+    so clients are pushed the result without busy polling.
+    """
+    worker = inference_service.narration_worker
+    future = worker.future(narration_id)
+    if future is None:
+        # Issued by another server process (or evicted): answer from the shared store, if any.
+        shared = await asyncio.to_thread(worker.lookup, narration_id, min(wait_ms, 30_000) / 1000)
+        if shared is None:
+            raise HTTPException(status_code=404, detail="Narration not found")
+        return shared
+    if wait_ms > 0 and not future.done():
+        waiter = asyncio.wrap_future(future)
+        waiter.add_done_callback(lambda f: f.cancelled() or f.exception())
+        await asyncio.wait({waiter}, timeout=min(wait_ms, 30_000) / 1000)
+    return worker.describe(narration_id, future)
+
+
 @app.post("/player/recent/summary")
 def player_recent_summary(request: RecentSummaryRequest) -> dict:
     """Return recent innings plus narrative summary (demo-friendly)."""
@@ -91,25 +180,52 @@ def narrate_anomaly(request: NarrateRequest) -> NarrateResponse:
 
 
 @app.get("/feed/anomalies")
-def feed_anomalies(format: str = "ALL", min_ups: float = 0.0, min_prob: float = 0.0, limit: int = 25, sort: str = "combined"):
-    """List anomalies for feed consumption."""
-    items = anomaly_feed.list_feed_items(
-        feed_df,
+def feed_anomalies(
+    format: str = "ALL",
+    min_ups: float = 0.0,
+    min_prob: float = 0.0,
+    limit: int = 25,
+    sort: str = "combined",
+    include_narrative: bool = False,
+    tone: str = "commentator",
+    cursor: str | None = None,
+):
+    """
+    List anomalies for feed consumption (optionally narrated, in parallel).
+
+    Pass the returned `next_cursor` back as `cursor` to fetch the next page.
+    """
+    page = anomaly_feed.list_feed_page(
+        feed_manager.current(),
         match_format=format,
         min_ups=min_ups,
         min_prob=min_prob,
         limit=limit,
         sort=sort,
+        cursor=cursor,
     )
-    return {"items": items}
+    if include_narrative:
+        anomaly_feed.narrate_items(page["items"], tone=tone)
+    return page
+
+
+@app.post("/feed/append", status_code=202)
+def feed_append(rows: list[FeedRow]) -> dict[str, int]:
+    """
+    Queue newly scored innings rows for the feed.
+
+    Rows use the feed columns (player_id, match_format, date, ups_score, ...) and appear once
+    the background rebuild swaps in the next snapshot (see `feed_version` in metrics).
+    """
+    return {"queued": feed_manager.append(rows)}
 
 
 @app.get("/feed/anomaly/{event_id}")
 def feed_anomaly_detail(event_id: str, tone: str = "commentator"):
     """Return anomaly detail with narrative for a given event id."""
-    row = anomaly_feed.get_event_detail(feed_df, event_id)
+    row = anomaly_feed.get_event_detail(feed_manager.current(), event_id)
     narrative = anomaly_feed.narrate_event(row, tone=tone)
-    response = row.to_dict()
+    response = anomaly_feed.to_json_record(row.to_dict())
     response["event_id"] = event_id
     response.update(narrative)
     response["headline"] = anomaly_feed._build_headline(row)  # type: ignore[attr-defined]
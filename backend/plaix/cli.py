@@ -5,13 +5,17 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+import numpy as np
+
+from plaix.config import settings
+from plaix.core.feature_schema import FEATURE_SCHEMA
 from plaix.core.model import AnomalyModel
 from plaix.core.ups_scorer import BaselineStats, UPSScorer
 from plaix.sports.cricket.features import CricketFeatureExtractor
-from llm.anomaly_narrator import AnomalyEvent, AnomalyNarrator
-from llm.factory import get_llm_client_from_env
+from llm.anomaly_narrator import AnomalyEvent
+from llm.factory import get_narrator_from_env
 
 
 class DummyHistoryProvider:
@@ -24,10 +28,19 @@ class DummyHistoryProvider:
 def load_model(model_path: Path) -> AnomalyModel:
     """Load a trained model artifact."""
     model = AnomalyModel(model_type="logistic_regression", model_config={}, sport="cricket")
-    model.load_model(str(model_path))
+    model.load_model(str(model_path), compiled=settings.compile_model)
     return model
 
 
+def predict_rows(model: Any, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (anomaly probabilities, labels) for a feature matrix from a single predict_proba call."""
+    proba = np.asarray(model.predict_proba(X))
+    classes = getattr(getattr(model, "model", model), "classes_", None)
+    winners = np.argmax(proba, axis=1)
+    labels = np.asarray(classes)[winners] if classes is not None else winners
+    return proba[:, 1], labels
+
+
 def parse_json_input(input_arg: str) -> Dict[str, Any]:
     """Parse JSON input from string or file path."""
     candidate = Path(input_arg)
@@ -47,24 +60,12 @@ def build_ups_scorer() -> UPSScorer:
     return UPSScorer(DummyHistoryProvider())
 
 
-def extract_features_from_payload(payload: Dict[str, Any]) -> Dict[str, float]:
-    """Build feature vector consistent with training."""
-    return {
-        "baseline_mean_runs": float(payload["baseline_mean_runs"]),
-        "baseline_std_runs": float(payload["baseline_std_runs"]),
-        "current_runs": float(payload["current_runs"]),
-        "venue_flatness": float(payload.get("venue_flatness", 0.5)),
-        "opposition_strength": float(payload.get("opposition_strength", 0.5)),
-        "batting_position": int(payload.get("batting_position", 4)),
-    }
-
-
 def run_predict_single(args: argparse.Namespace) -> None:
     """Run anomaly scoring for a single payload."""
     payload = parse_json_input(args.input)
     model = load_model(Path(args.model))
     ups_scorer = build_ups_scorer()
-    narrator = AnomalyNarrator(get_llm_client_from_env())
+    narrator = get_narrator_from_env()
 
     # Use provided baseline stats if present; otherwise use UPS scorer to compute baseline.
     if "baseline_mean_runs" not in payload or "baseline_std_runs" not in payload:
@@ -80,9 +81,8 @@ def run_predict_single(args: argparse.Namespace) -> None:
     )
     flag, bucket = ups_scorer.classify_ups(ups_score)
 
-    features = extract_features_from_payload(payload)
-    model_proba = model.predict_proba([[features[c] for c in features]])[0][1]
-    model_label = int(model.predict([[features[c] for c in features]])[0])
+    probas, labels = predict_rows(model, FEATURE_SCHEMA.transform_one(payload))
+    model_proba, model_label = float(probas[0]), int(labels[0])
 
     event = AnomalyEvent(
         player_id=payload.get("player_id", "unknown"),
@@ -125,7 +125,7 @@ def run_predict_batch(args: argparse.Namespace) -> None:
     model = load_model(Path(args.model))
     ups_scorer = build_ups_scorer()
 
-    results: List[Dict[str, Any]] = []
+    ups_results = []
     for payload in payloads:
         if "baseline_mean_runs" not in payload or "baseline_std_runs" not in payload:
             baseline = BaselineStats(mean_runs=20.0, std_runs=15.0, num_innings=0, source="default")
@@ -137,20 +137,19 @@ def run_predict_batch(args: argparse.Namespace) -> None:
             payload.get("match_format", "T20"),
             current_runs=float(payload["current_runs"]),
         )
-        flag, bucket = ups_scorer.classify_ups(ups_score)
-        features = extract_features_from_payload(payload)
-        model_proba = model.predict_proba([[features[c] for c in features]])[0][1]
-        model_label = int(model.predict([[features[c] for c in features]])[0])
-
-        results.append(
-            {
-                "ups_score": ups_score,
-                "ups_bucket": bucket,
-                "ups_anomaly_flag_baseline": flag,
-                "model_anomaly_probability": float(model_proba),
-                "model_anomaly_label": model_label,
-            }
-        )
+        ups_results.append((ups_score, *ups_scorer.classify_ups(ups_score)))
+
+    probas, labels = predict_rows(model, FEATURE_SCHEMA.transform(payloads)) if payloads else ([], [])
+    results: List[Dict[str, Any]] = [
+        {
+            "ups_score": ups_score,
+            "ups_bucket": bucket,
+            "ups_anomaly_flag_baseline": flag,
+            "model_anomaly_probability": float(model_proba),
+            "model_anomaly_label": int(model_label),
+        }
+        for (ups_score, flag, bucket), model_proba, model_label in zip(ups_results, probas, labels)
+    ]
 
     print(json.dumps({"results": results}, indent=2))
 
@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
+# inline: narrate before responding; deferred: respond immediately with a narration_id to fetch
+# from GET /narration/{id}; none: skip narration.
+NarrationMode = Literal["inline", "deferred", "none"]
+
 
 class Settings(BaseSettings):
     """Runtime settings for PLAIX service."""
@@ -12,6 +18,23 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     anomaly_run_threshold: float = 6.0
     anomaly_wicket_threshold: float = 1.0
+    baseline_cache_size: int = 10_000
+    baseline_cache_ttl_seconds: float | None = None
+    history_db_path: str | None = None
+    history_poll_seconds: float = 1.0
+    role_baselines_path: str = "models/role_baselines.json"
+    compile_model: bool = True
+    model_registry_path: str = "models/registry"
+    model_registry_poll_seconds: float = 5.0
+    micro_batching_enabled: bool = False
+    micro_batch_max_size: int = 64
+    micro_batch_max_wait_ms: float = 2.0
+    micro_batch_max_in_flight: int = 4
+    default_narration_mode: NarrationMode = "inline"
+    narration_workers: int = 4
+    narration_max_jobs: int = 10_000
+    narration_job_ttl_seconds: float = 3600.0
+    feed_poll_seconds: float = 5.0
 
 
 settings = Settings()
@@ -0,0 +1,109 @@
+"""Bounded LRU/TTL cache for UPS baselines."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+
+class BaselineCache:
+    """
+    Thread-safe LRU cache with optional TTL, keyed by tuples starting with (player_id, match_format).
+
+    Notes:
+        - Entries are evicted least-recently-used first once `maxsize` is reached.
+        - With `ttl_seconds`, entries older than the TTL are treated as misses and dropped.
+        - `invalidate` removes every entry for a player (and optionally a format) regardless of
+          the scorer configuration encoded in the rest of the key; call it when a new innings
+          is recorded.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        self._by_player: Dict[Tuple[Hashable, Hashable], Set[Tuple[Hashable, ...]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Return cached value for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl_seconds is None or self._clock() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+            self.misses += 1
+            return None
+
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """Store value for key, evicting the least recently used entry when full."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (self._clock(), value)
+            self._by_player.setdefault((key[0], key[1]), set()).add(key)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, player_id: str, match_format: Optional[str] = None) -> int:
+        """Drop all entries for a player (optionally a single format). Returns number removed."""
+        with self._lock:
+            if match_format is not None:
+                groups = [(player_id, match_format)]
+            else:
+                groups = [g for g in self._by_player if g[0] == player_id]
+            removed = 0
+            for group in groups:
+                for key in list(self._by_player.get(group, ())):
+                    self._remove(key)
+                    removed += 1
+            return removed
+
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_player.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+    def _remove(self, key: Tuple[Hashable, ...]) -> None:
+        """Remove key from entries and the per-player index (lock must be held)."""
+        self._entries.pop(key, None)
+        group = (key[0], key[1])
+        keys = self._by_player.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_player[group]
@@ -0,0 +1,78 @@
+"""Lightweight NumPy predictor compiled from a fitted linear classifier."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+
+class CompiledLinearPredictor:
+    """
+    Prediction-only stand-in for a fitted sklearn `LogisticRegression`.
+
+    Holds just `coef_`, `intercept_` and `classes_` and evaluates the decision function with a
+    single matrix product, skipping sklearn's per-call input validation. Probabilities follow
+    sklearn: softmax for multinomial models (for a binary one, softmax([-d, d]) = sigmoid(2d)),
+    otherwise one-vs-rest sigmoids (normalized across classes when there are more than two).
+    """
+
+    def __init__(self, coef: Any, intercept: Any, classes: Any, multinomial: bool = True) -> None:
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float64)
+        self.intercept_ = np.asarray(intercept, dtype=np.float64).ravel()
+        self.classes_ = np.asarray(classes)
+        self.multinomial = multinomial
+        self.n_features_in_ = self.coef_.shape[1]
+        self._coef_t = self.coef_.T.copy()
+
+    @classmethod
+    def from_estimator(cls, estimator: Any) -> "CompiledLinearPredictor":
+        """Compile a fitted `LogisticRegression`; raises ValueError if it is not fitted."""
+        if not hasattr(estimator, "coef_"):
+            raise ValueError("Estimator must be fitted before compiling.")
+        multi_class = getattr(estimator, "multi_class", "auto")
+        solver = getattr(estimator, "solver", "lbfgs")
+        # sklearn's "auto" means one-vs-rest for binary problems and liblinear/newton-cholesky.
+        multinomial = multi_class == "multinomial" or (
+            multi_class == "auto" and solver not in ("liblinear", "newton-cholesky") and len(estimator.classes_) > 2
+        )
+        return cls(estimator.coef_, estimator.intercept_, estimator.classes_, multinomial=multinomial)
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        """Linear scores; 1-D for binary problems as in sklearn."""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the model expects {self.n_features_in_}.")
+        scores = X @ self._coef_t + self.intercept_
+        return scores[:, 0] if scores.shape[1] == 1 else scores
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """Class probabilities, columns ordered as `classes_`."""
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            positive = _sigmoid(2.0 * scores if self.multinomial else scores)
+            return np.column_stack([1.0 - positive, positive])
+        if self.multinomial:
+            shifted = np.exp(scores - scores.max(axis=1, keepdims=True))
+            return shifted / shifted.sum(axis=1, keepdims=True)
+        proba = _sigmoid(scores)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Class labels (argmax of the decision function)."""
+        scores = self.decision_function(X)
+        if scores.ndim == 1:
+            return self.classes_[(scores > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    """Numerically stable logistic function."""
+    out = np.empty_like(z)
+    positive = z >= 0
+    out[positive] = 1.0 / (1.0 + np.exp(-z[positive]))
+    exp_z = np.exp(z[~positive])
+    out[~positive] = exp_z / (1.0 + exp_z)
+    return out
@@ -0,0 +1,100 @@
+"""Ordered feature schema shared by training and serving."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    """One model input column."""
+
+    name: str
+    default: Optional[float] = None  # None = required
+    integer: bool = False  # truncated toward zero, as int() did for batting_position
+
+
+class FeatureSchema:
+    """
+    Fixed column order plus per-column defaults and validation.
+
+    Payloads are converted column by column straight into a preallocated float32 matrix, so
+    feature order never depends on dict ordering and no per-record dicts/lists are built.
+    Missing required values and non-numeric or non-finite values raise ValueError naming the
+    column and record.
+    """
+
+    dtype = np.float32
+
+    def __init__(self, specs: Sequence[FeatureSpec]) -> None:
+        self.specs = tuple(specs)
+        self.columns: List[str] = [spec.name for spec in self.specs]
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def transform(self, payloads: Sequence[Mapping[str, Any]]) -> np.ndarray:
+        """Convert payload dicts into an (n_records, n_features) float32 matrix."""
+        n = len(payloads)
+        out = np.empty((n, len(self.specs)), dtype=self.dtype)
+        for j, spec in enumerate(self.specs):
+            if spec.default is None:
+                missing = next((i for i, p in enumerate(payloads) if spec.name not in p), None)
+                if missing is not None:
+                    raise ValueError(f"Missing required feature '{spec.name}' in record {missing}")
+                values = (p[spec.name] for p in payloads)
+            else:
+                values = (p.get(spec.name, spec.default) for p in payloads)
+            try:
+                column = np.fromiter(values, dtype=np.float64, count=n)
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"Feature '{spec.name}' must be numeric: {exc}") from exc
+            self._finish_column(spec, column)
+            out[:, j] = column
+        return out
+
+    def transform_one(self, payload: Mapping[str, Any]) -> np.ndarray:
+        """Convert a single payload into a (1, n_features) matrix."""
+        return self.transform([payload])
+
+    def transform_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Convert a training DataFrame (one column per feature) with the same defaults and checks."""
+        out = np.empty((len(df), len(self.specs)), dtype=self.dtype)
+        for j, spec in enumerate(self.specs):
+            if spec.name in df.columns:
+                column = pd.to_numeric(df[spec.name], errors="raise").to_numpy(dtype=np.float64, na_value=np.nan)
+                if spec.default is not None:
+                    column = np.where(np.isnan(column), spec.default, column)
+            elif spec.default is not None:
+                column = np.full(len(df), spec.default, dtype=np.float64)
+            else:
+                raise ValueError(f"Missing required feature column '{spec.name}'")
+            self._finish_column(spec, column)
+            out[:, j] = column
+        return out
+
+    @staticmethod
+    def _finish_column(spec: FeatureSpec, column: np.ndarray) -> None:
+        """Validate finiteness and apply integer truncation in place."""
+        bad = ~np.isfinite(column)
+        if bad.any():
+            raise ValueError(f"Feature '{spec.name}' has a missing or non-finite value in record {int(np.argmax(bad))}")
+        if spec.integer:
+            np.trunc(column, out=column)
+
+
+FEATURE_SCHEMA = FeatureSchema(
+    [
+        FeatureSpec("baseline_mean_runs"),
+        FeatureSpec("baseline_std_runs"),
+        FeatureSpec("current_runs"),
+        FeatureSpec("venue_flatness", default=0.5),
+        FeatureSpec("opposition_strength", default=0.5),
+        FeatureSpec("batting_position", default=4, integer=True),
+    ]
+)
+FEATURE_COLUMNS = FEATURE_SCHEMA.columns
@@ -0,0 +1,71 @@
+"""Isolation-forest backend with calibrated anomaly probabilities."""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.ensemble import IsolationForest
+from sklearn.linear_model import LogisticRegression
+
+# Below this many rows, scoring in parallel costs more than it saves.
+_MIN_ROWS_PER_JOB = 2_000
+
+
+class CalibratedIsolationForest:
+    """
+    Unsupervised IsolationForest whose anomaly scores are mapped to probabilities.
+
+    The anomaly score is `-decision_function(X)` (positive = more anomalous than the
+    contamination threshold). It is mapped through p = sigmoid(slope * score + intercept):
+        - with labels passed to `fit` (both classes present), slope/intercept come from Platt
+          scaling on the training scores;
+        - without labels, slope = 1 / std(training scores) and intercept = 0, so p = 0.5 exactly
+          at the forest's own threshold and `predict` agrees with IsolationForest.predict.
+    """
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, n_jobs: Optional[int] = None, **forest_params: Any) -> None:
+        self.n_jobs = n_jobs
+        self.forest_params = forest_params
+        self.forest = IsolationForest(n_jobs=n_jobs, **forest_params)
+        self.slope_ = 1.0
+        self.intercept_ = 0.0
+
+    def fit(self, X: Any, y: Any = None) -> "CalibratedIsolationForest":
+        X = np.asarray(X, dtype=np.float64)
+        self.forest.fit(X)
+        scores = self.anomaly_score(X)
+        labels = None if y is None else np.asarray(y)
+        if labels is not None and np.unique(labels).size == 2:
+            platt = LogisticRegression().fit(scores.reshape(-1, 1), labels)
+            self.slope_ = float(platt.coef_[0, 0])
+            self.intercept_ = float(platt.intercept_[0])
+        else:
+            spread = float(np.std(scores))
+            self.slope_ = 1.0 / spread if spread > 0 else 1.0
+            self.intercept_ = 0.0
+        return self
+
+    def anomaly_score(self, X: Any) -> np.ndarray:
+        """Raw anomaly scores (higher = more anomalous), scored in parallel row blocks."""
+        X = np.asarray(X, dtype=np.float64)
+        n_jobs = min(effective_n_jobs(self.n_jobs), max(1, len(X) // _MIN_ROWS_PER_JOB))
+        if n_jobs <= 1:
+            return -self.forest.decision_function(X)
+        blocks = np.array_split(X, n_jobs)
+        parts = Parallel(n_jobs=n_jobs, prefer="threads")(delayed(self.forest.decision_function)(b) for b in blocks)
+        return -np.concatenate(parts)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        z = self.slope_ * self.anomaly_score(X) + self.intercept_
+        positive = 1.0 / (1.0 + np.exp(-np.clip(z, -500.0, 500.0)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X: Any) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] > 0.5).astype(int)
+
+    def __repr__(self) -> str:
+        return f"CalibratedIsolationForest(n_jobs={self.n_jobs}, slope={self.slope_:.4g}, intercept={self.intercept_:.4g})"
@@ -2,10 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+import contextlib
+from typing import Any, ContextManager, Dict, Optional, Sequence
 
 import joblib
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
+from threadpoolctl import ThreadpoolController
+
+from plaix.core.compiled_model import CompiledLinearPredictor
+from plaix.core.isolation_model import CalibratedIsolationForest
+from plaix.core.streaming_model import StreamingLogisticRegression
+
+# Anomaly labels are binary; incremental backends need the full label set on the first chunk.
+DEFAULT_CLASSES = (0, 1)
 
 
 class AnomalyModel:
@@ -16,29 +26,58 @@ class AnomalyModel:
         Initialize the model wrapper.
 
         Args:
-            model_type: identifier for backend (e.g., "logistic_regression").
-            model_config: hyperparameters for the chosen backend.
+            model_type: identifier for backend ("logistic_regression", "sgd_logistic" for
+                incremental training with `partial_fit`, "hist_gradient_boosting", or
+                "isolation_forest" for unsupervised scoring with calibrated probabilities).
+            model_config: hyperparameters for the chosen backend. `n_jobs` sets the worker
+                count for tree backends (-1/None = all cores).
             sport: optional sport identifier for multi-sport setups.
         """
         self.model_type = model_type
         self.model_config = model_config or {}
         self.sport = sport
+        self.n_jobs = self.model_config.get("n_jobs")
         self.model = self._build_model()
+        # Scanning the loaded native libraries is the slow part of threadpoolctl, so it is done
+        # once here; `_threads` then only toggles the limit around each call.
+        self._threadpool_controller = ThreadpoolController() if self._limits_threads else None
 
     def _build_model(self):
         """Instantiate backend model based on model_type."""
         if self.model_type == "logistic_regression":
             return LogisticRegression(**self.model_config)
-        # TODO: extend with other backends (e.g., tree ensembles, isolation forests).
+        if self.model_type == "sgd_logistic":
+            return StreamingLogisticRegression(**self.model_config)
+        tree_config = {k: v for k, v in self.model_config.items() if k != "n_jobs"}
+        if self.model_type == "hist_gradient_boosting":
+            # Parallelised with OpenMP; thread count is applied per call in `_threads`.
+            return HistGradientBoostingClassifier(**tree_config)
+        if self.model_type == "isolation_forest":
+            return CalibratedIsolationForest(n_jobs=self.n_jobs, **tree_config)
         raise ValueError(f"Unsupported model_type: {self.model_type}")
 
     def fit(self, X: Any, y: Any) -> None:
-        """Train the model on features and labels."""
-        self.model.fit(X, y)
+        """Train the model on features and labels (labels only calibrate unsupervised backends)."""
+        with self._threads():
+            self.model.fit(X, y)
+
+    def partial_fit(self, X: Any, y: Any, classes: Optional[Sequence[Any]] = None) -> None:
+        """
+        Update the model with one chunk of training data (incremental backends only).
+
+        Args:
+            classes: full label set; defaults to DEFAULT_CLASSES on the first call.
+        """
+        if not hasattr(self.model, "partial_fit"):
+            raise AttributeError(f"partial_fit not supported for model_type: {self.model_type}")
+        if classes is None and not hasattr(self.model, "classes_"):
+            classes = DEFAULT_CLASSES
+        self.model.partial_fit(X, y, classes=classes)
 
     def predict(self, X: Any) -> Any:
         """Predict anomaly labels (binary or score-based)."""
-        return self.model.predict(X)
+        with self._threads():
+            return self.model.predict(X)
 
     def predict_proba(self, X: Any) -> Any:
         """
@@ -46,24 +85,54 @@ class AnomalyModel:
 
         Notes:
             - For logistic regression, returns probability for each class.
+            - For isolation forests, column 1 is the calibrated anomaly probability.
         """
         if hasattr(self.model, "predict_proba"):
-            return self.model.predict_proba(X)
+            with self._threads():
+                return self.model.predict_proba(X)
         raise AttributeError("predict_proba not supported for this model backend.")
 
     def save_model(self, path: str) -> None:
         """Persist the trained model to disk."""
         joblib.dump(self.model, path)
 
-    def load_model(self, path: str) -> None:
-        """Load a model from disk."""
+    def load_model(self, path: str, compiled: bool = False) -> None:
+        """
+        Load a model from disk.
+
+        Args:
+            path: joblib artifact written by `save_model`.
+            compiled: replace a logistic regression with its NumPy `CompiledLinearPredictor`
+                (same probabilities within float tolerance, no sklearn per-call validation).
+        """
         self.model = joblib.load(path)
+        if compiled:
+            self.compile()
+
+    def compile(self) -> None:
+        """Swap a fitted linear backend for a prediction-only NumPy predictor."""
+        if isinstance(self.model, (LogisticRegression, StreamingLogisticRegression)):
+            self.model = CompiledLinearPredictor.from_estimator(self.model)
+
+    @property
+    def is_compiled(self) -> bool:
+        """Whether the backend is a compiled predictor (prediction only; cannot be refit)."""
+        return isinstance(self.model, CompiledLinearPredictor)
+
+    @property
+    def _limits_threads(self) -> bool:
+        """Whether calls run under an OpenMP thread cap (natively threaded backend, positive n_jobs)."""
+        return self.model_type == "hist_gradient_boosting" and self.n_jobs is not None and self.n_jobs > 0
+
+    def _threads(self) -> ContextManager[Any]:
+        """Cap OpenMP threads for natively threaded backends when a positive n_jobs is set."""
+        if self._threadpool_controller is not None:
+            return self._threadpool_controller.limit(limits=self.n_jobs, user_api="openmp")
+        return contextlib.nullcontext()
 
     def __repr__(self) -> str:
         return f"AnomalyModel(type={self.model_type}, sport={self.sport}, config={self.model_config})"
 
 
 # Notes for extension:
-# - Add factory functions to create specific backends (e.g., tree ensembles, isolation forests).
-# - Add support for calibration layers if probability outputs are required.
 # - Add multi-task support when multiple anomaly labels (e.g., UPS, momentum shift) are predicted jointly.
@@ -0,0 +1,119 @@
+"""Versioned on-disk model registry with an atomically swapped active pointer."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from plaix.core.model import AnomalyModel
+
+ACTIVE_FILE = "ACTIVE"
+MODEL_FILE = "model.pkl"
+META_FILE = "meta.json"
+
+
+class ModelRegistry:
+    """
+    Directory of versioned model artifacts.
+
+    Layout:
+        <root>/<version>/model.pkl   joblib artifact written by AnomalyModel.save_model
+        <root>/<version>/meta.json   model_type, sport, config, created_at plus caller metadata
+        <root>/ACTIVE                name of the version to serve
+
+    Versions are written to a temporary directory and renamed into place, and ACTIVE is
+    replaced with os.replace, so readers never observe a partially written version.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def versions(self) -> List[str]:
+        """Registered versions, oldest first."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and (p / META_FILE).exists())
+
+    def active_version(self) -> Optional[str]:
+        """Version named by ACTIVE, or None if nothing has been activated."""
+        try:
+            version = (self.root / ACTIVE_FILE).read_text().strip()
+        except FileNotFoundError:
+            return None
+        return version or None
+
+    def metadata(self, version: str) -> Dict[str, Any]:
+        """Metadata stored with a version."""
+        return json.loads((self.root / version / META_FILE).read_text())
+
+    def register(
+        self,
+        model: AnomalyModel,
+        metadata: Optional[Dict[str, Any]] = None,
+        version: Optional[str] = None,
+        activate: bool = True,
+    ) -> str:
+        """
+        Save a trained model as a new version and optionally make it active.
+
+        Args:
+            model: fitted AnomalyModel (not compiled).
+            metadata: extra JSON-serialisable fields (metrics, data source, ...).
+            version: explicit version name; defaults to the next "v0001"-style number.
+            activate: point ACTIVE at the new version once it is fully written.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        version = version or self._next_version()
+        target = self.root / version
+        if target.exists():
+            raise ValueError(f"Model version already exists: {version}")
+        meta = {
+            "version": version,
+            "model_type": model.model_type,
+            "sport": model.sport,
+            "config": model.model_config,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **(metadata or {}),
+        }
+        staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=self.root))
+        try:
+            model.save_model(str(staging / MODEL_FILE))
+            (staging / META_FILE).write_text(json.dumps(meta, indent=2))
+            os.replace(staging, target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str) -> None:
+        """Atomically point ACTIVE at an existing version."""
+        if not (self.root / version / MODEL_FILE).exists():
+            raise ValueError(f"Unknown model version: {version}")
+        tmp = self.root / f".{ACTIVE_FILE}.tmp"
+        tmp.write_text(version)
+        os.replace(tmp, self.root / ACTIVE_FILE)
+
+    def load(self, version: Optional[str] = None, compiled: bool = False) -> Tuple[str, AnomalyModel]:
+        """Load a version (default: the active one) as (version, AnomalyModel)."""
+        version = version or self.active_version()
+        if version is None:
+            raise FileNotFoundError(f"No active model version in {self.root}")
+        meta = self.metadata(version)
+        model = AnomalyModel(
+            model_type=meta.get("model_type", "logistic_regression"),
+            model_config=meta.get("config") or {},
+            sport=meta.get("sport"),
+        )
+        model.load_model(str(self.root / version / MODEL_FILE), compiled=compiled)
+        return version, model
+
+    def _next_version(self) -> str:
+        numbers = [int(v[1:]) for v in self.versions() if v.startswith("v") and v[1:].isdigit()]
+        return f"v{max(numbers, default=0) + 1:04d}"
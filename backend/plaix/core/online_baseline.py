@@ -0,0 +1,134 @@
+"""Online (incremental) recency-weighted baselines for UPS scoring."""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@lru_cache(maxsize=None)
+def _weights(window_size: int, decay_lambda: float) -> Tuple[float, ...]:
+    return tuple(math.exp(-decay_lambda * i) for i in range(window_size))
+
+
+class OnlineBaselineState:
+    """
+    Ring buffer of the last `window_size` innings with lazily computed weighted stats.
+
+    Notes:
+        - Weights follow UPSScorer: w_i = exp(-lambda * i), i=0 most recent.
+        - Appending is O(1): the buffer shifts and the cached stats are dropped.
+        - `stats()` recomputes the weighted mean and centered variance over the buffer (at
+          most `window_size` values) with the same arithmetic as
+          `UPSScorer._compute_weighted_stats`, so online and history baselines agree exactly;
+          the result is cached until the next update.
+        - Not synchronized; `OnlineBaselineStore` serializes access.
+    """
+
+    __slots__ = ("window_size", "decay_lambda", "_runs", "_stats")
+
+    def __init__(self, window_size: int, decay_lambda: float) -> None:
+        self.window_size = window_size
+        self.decay_lambda = decay_lambda
+        self._runs: deque[float] = deque(maxlen=window_size)  # most recent on the left
+        self._stats: Optional[Tuple[float, float, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def seed(self, recent_runs: Iterable[float]) -> None:
+        """Replace state with up to `window_size` runs given most recent first."""
+        self._runs.clear()
+        for runs in recent_runs:
+            if len(self._runs) == self.window_size:
+                break
+            self._runs.append(float(runs))
+        self._stats = None
+
+    def append(self, runs: float) -> None:
+        """Record a new (most recent) innings."""
+        self._runs.appendleft(float(runs))
+        self._stats = None
+
+    def stats(self) -> Tuple[float, float, int]:
+        """Return (weighted mean, weighted std, num innings)."""
+        if self._stats is None:
+            self._stats = self._compute()
+        return self._stats
+
+    def recent_runs(self) -> List[float]:
+        """Runs in the window, most recent first."""
+        return list(self._runs)
+
+    def _compute(self) -> Tuple[float, float, int]:
+        if not self._runs:
+            return 0.0, 0.0, 0
+        weights = _weights(self.window_size, self.decay_lambda)[: len(self._runs)]
+        weight_sum = sum(weights)
+        mean = sum(v * w for v, w in zip(self._runs, weights)) / weight_sum
+        variance = sum(w * ((v - mean) * (v - mean)) for v, w in zip(self._runs, weights)) / weight_sum
+        return mean, math.sqrt(variance), len(self._runs)
+
+
+class OnlineBaselineStore:
+    """Thread-safe map of (player_id, match_format) -> OnlineBaselineState."""
+
+    def __init__(self, window_size: int = 10, decay_lambda: float = 0.3) -> None:
+        self.window_size = window_size
+        self.decay_lambda = decay_lambda
+        self._states: Dict[Tuple[str, str], OnlineBaselineState] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._states
+
+    def get(self, player_id: str, match_format: str) -> Optional[OnlineBaselineState]:
+        """Return state for a player/format, or None if never seeded."""
+        return self._states.get((player_id, match_format))
+
+    def seed(self, player_id: str, match_format: str, recent_runs: Iterable[float]) -> OnlineBaselineState:
+        """Create or replace state from runs given most recent first."""
+        state = OnlineBaselineState(self.window_size, self.decay_lambda)
+        state.seed(recent_runs)
+        with self._lock:
+            self._states[(player_id, match_format)] = state
+        return state
+
+    def seed_if_absent(self, player_id: str, match_format: str, recent_runs: Iterable[float]) -> OnlineBaselineState:
+        """
+        Seed state unless the key already has some, and return the stored state.
+
+        Lets callers fetch history without holding the lock: if another thread seeded or
+        appended to the key meanwhile, its state wins and `recent_runs` is discarded.
+        """
+        state = OnlineBaselineState(self.window_size, self.decay_lambda)
+        state.seed(recent_runs)
+        with self._lock:
+            return self._states.setdefault((player_id, match_format), state)
+
+    def stats(self, player_id: str, match_format: str) -> Optional[Tuple[float, float, int]]:
+        """(weighted mean, weighted std, num innings) for a key, or None if never seeded."""
+        with self._lock:
+            state = self._states.get((player_id, match_format))
+            return None if state is None else state.stats()
+
+    def append(self, player_id: str, match_format: str, runs: float) -> OnlineBaselineState:
+        """Record a new innings, creating empty state if the key is unseen."""
+        with self._lock:
+            state = self._states.get((player_id, match_format))
+            if state is None:
+                state = OnlineBaselineState(self.window_size, self.decay_lambda)
+                self._states[(player_id, match_format)] = state
+            state.append(runs)
+        return state
+
+    def drop(self, player_id: str, match_format: str) -> None:
+        """Forget state for a player/format."""
+        with self._lock:
+            self._states.pop((player_id, match_format), None)
@@ -0,0 +1,132 @@
+"""Data-driven team-role and global fallback baselines for UPS scoring."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+Stats = Tuple[float, float, int]  # (mean_runs, std_runs, num_innings)
+
+_SEP = "|"
+
+
+def _key(*parts: object) -> str:
+    return _SEP.join(str(p) for p in parts)
+
+
+class RoleBaselineTable:
+    """
+    Precomputed fallback baselines served in O(1) by dict lookup.
+
+    Tiers (most to least specific):
+        - team_role: (match_format, team, batting_position)
+        - role: (match_format, batting_position)
+        - format: (match_format,)
+    Also stores each player's latest (team, batting_position) per format, so a tier can be
+    resolved from (player_id, match_format) alone.
+    """
+
+    def __init__(
+        self,
+        team_role: Dict[str, Stats],
+        role: Dict[str, Stats],
+        format_stats: Dict[str, Stats],
+        player_roles: Dict[str, Tuple[Optional[str], Optional[int]]],
+    ) -> None:
+        self.team_role = team_role
+        self.role = role
+        self.format_stats = format_stats
+        self.player_roles = player_roles
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, min_innings: int = 20) -> "RoleBaselineTable":
+        """
+        Aggregate an innings dataset into fallback tiers with vectorized groupbys.
+
+        Args:
+            df: innings with match_format, runs_scored (or current_runs), and optionally
+                team, batting_position, player_id and date.
+            min_innings: groups with fewer innings are dropped as unreliable.
+        """
+        runs_col = "runs_scored" if "runs_scored" in df.columns else "current_runs"
+        data = df.copy()
+        data["runs"] = pd.to_numeric(data[runs_col], errors="coerce")
+        data = data.dropna(subset=["runs", "match_format"])
+        has_team = "team" in data.columns
+        has_position = "batting_position" in data.columns
+        if has_position:
+            data["batting_position"] = pd.to_numeric(data["batting_position"], errors="coerce").astype("Int64")
+
+        def aggregate(keys: list[str]) -> Dict[str, Stats]:
+            grouped = data.dropna(subset=keys).groupby(keys)["runs"].agg(["mean", "std", "count"])
+            grouped = grouped[grouped["count"] >= min_innings]
+            grouped["std"] = grouped["std"].fillna(0.0)
+            out: Dict[str, Stats] = {}
+            for idx, mean, std, count in zip(grouped.index, grouped["mean"], grouped["std"], grouped["count"]):
+                parts = idx if isinstance(idx, tuple) else (idx,)
+                out[_key(*parts)] = (float(mean), float(std), int(count))
+            return out
+
+        team_role = aggregate(["match_format", "team", "batting_position"]) if has_team and has_position else {}
+        role = aggregate(["match_format", "batting_position"]) if has_position else {}
+        format_stats = aggregate(["match_format"])
+
+        player_roles: Dict[str, Tuple[Optional[str], Optional[int]]] = {}
+        if "player_id" in data.columns and (has_team or has_position):
+            ordered = data.sort_values("date", kind="mergesort") if "date" in data.columns else data
+            latest = ordered.drop_duplicates(["player_id", "match_format"], keep="last")
+            teams = latest["team"] if has_team else pd.Series(None, index=latest.index)
+            positions = latest["batting_position"] if has_position else pd.Series(None, index=latest.index)
+            for player_id, match_format, team, position in zip(latest["player_id"], latest["match_format"], teams, positions):
+                player_roles[_key(player_id, match_format)] = (
+                    None if pd.isna(team) else str(team),
+                    None if pd.isna(position) else int(position),
+                )
+        return cls(team_role, role, format_stats, player_roles)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "RoleBaselineTable":
+        """Load a table written by `save`."""
+        raw = json.loads(Path(path).read_text())
+        return cls(
+            team_role={k: tuple(v) for k, v in raw["team_role"].items()},  # type: ignore[misc]
+            role={k: tuple(v) for k, v in raw["role"].items()},  # type: ignore[misc]
+            format_stats={k: tuple(v) for k, v in raw["format"].items()},  # type: ignore[misc]
+            player_roles={k: tuple(v) for k, v in raw["player_roles"].items()},  # type: ignore[misc]
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Persist the table as compact JSON (atomic replace)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "team_role": self.team_role,
+            "role": self.role,
+            "format": self.format_stats,
+            "player_roles": self.player_roles,
+        }
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")))
+        os.replace(tmp, path)
+
+    def player_role(self, player_id: str, match_format: str) -> Tuple[Optional[str], Optional[int]]:
+        """Return the player's latest (team, batting_position) in a format, if known."""
+        return self.player_roles.get(_key(player_id, match_format), (None, None))
+
+    def lookup_team_role(self, match_format: str, team: Optional[str], batting_position: Optional[int]) -> Optional[Stats]:
+        """Stats for (format, team, batting_position), if aggregated."""
+        if team is None or batting_position is None:
+            return None
+        return self.team_role.get(_key(match_format, team, batting_position))
+
+    def lookup_global(self, match_format: str, batting_position: Optional[int] = None) -> Optional[Stats]:
+        """Stats for (format, batting_position), falling back to the whole format."""
+        if batting_position is not None:
+            stats = self.role.get(_key(match_format, batting_position))
+            if stats is not None:
+                return stats
+        return self.format_stats.get(_key(match_format))
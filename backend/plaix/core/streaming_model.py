@@ -0,0 +1,66 @@
+"""Incrementally trainable logistic model for out-of-core training."""
+
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+
+import numpy as np
+from sklearn.linear_model import SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+
+class StreamingLogisticRegression:
+    """
+    StandardScaler + SGDClassifier(loss="log_loss"), both updated chunk by chunk.
+
+    Notes:
+        - `partial_fit` first updates the running feature mean/variance, then takes SGD steps on
+          the chunk scaled with the updated statistics; memory is bounded by the chunk size.
+        - `coef_`/`intercept_` are reported in the unscaled feature space, so the model can be
+          compiled into a `CompiledLinearPredictor` like a LogisticRegression.
+    """
+
+    multi_class = "ovr"
+
+    def __init__(self, **sgd_params: Any) -> None:
+        self.sgd_params = sgd_params
+        self.scaler = StandardScaler()
+        self.classifier = SGDClassifier(loss="log_loss", **sgd_params)
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.classifier.classes_
+
+    @property
+    def coef_(self) -> np.ndarray:
+        return self.classifier.coef_ / self._scale()
+
+    @property
+    def intercept_(self) -> np.ndarray:
+        return self.classifier.intercept_ - self.coef_ @ self.scaler.mean_
+
+    def fit(self, X: Any, y: Any) -> "StreamingLogisticRegression":
+        """Fit from scratch on in-memory data (multiple SGD epochs)."""
+        X = np.asarray(X, dtype=np.float64)
+        self.scaler = StandardScaler().fit(X)
+        self.classifier = SGDClassifier(loss="log_loss", **self.sgd_params).fit(self.scaler.transform(X), y)
+        return self
+
+    def partial_fit(self, X: Any, y: Any, classes: Optional[Sequence[Any]] = None) -> "StreamingLogisticRegression":
+        """Update on one chunk; `classes` is required on the first call."""
+        X = np.asarray(X, dtype=np.float64)
+        self.scaler.partial_fit(X)
+        self.classifier.partial_fit(self.scaler.transform(X), y, classes=classes)
+        return self
+
+    def decision_function(self, X: Any) -> np.ndarray:
+        return self.classifier.decision_function(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classifier.predict(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self.classifier.predict_proba(self.scaler.transform(np.asarray(X, dtype=np.float64)))
+
+    def _scale(self) -> np.ndarray:
+        return self.scaler.scale_ if self.scaler.scale_ is not None else np.ones_like(self.scaler.mean_)
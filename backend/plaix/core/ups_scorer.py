@@ -2,9 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
 import math
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Optional, Protocol
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from plaix.core.baseline_cache import BaselineCache
+from plaix.core.online_baseline import OnlineBaselineStore
+from plaix.core.role_baselines import RoleBaselineTable
+
+# Lower UPS edges of mild/strong/extreme buckets; mirrors `UPSScorer.classify_ups`.
+_BUCKET_EDGES = np.array([1.0, 2.0, 3.0])
+_BUCKET_LABELS = np.array(["normal", "mild_spike", "strong_spike", "extreme_spike"], dtype=object)
+_BUCKET_FLAGS = np.array([0, 0, 1, 1])
+
+
+def classify_ups_array(ups_scores: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized `UPSScorer.classify_ups`: returns (flags, buckets) arrays."""
+    bucket_idx = np.searchsorted(_BUCKET_EDGES, ups_scores, side="right")
+    return _BUCKET_FLAGS[bucket_idx], _BUCKET_LABELS[bucket_idx]
 
 
 class HistoryProvider(Protocol):
@@ -19,6 +37,58 @@ class HistoryProvider(Protocol):
         """
 
 
+class AsyncHistoryProvider(Protocol):
+    """Async variant of HistoryProvider used by the `*_async` scoring path."""
+
+    async def aget_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        """Return recent innings for player_id and match_format, most recent first."""
+
+
+class BulkHistoryProvider(Protocol):
+    """Optional HistoryProvider extension fetching many histories in one round trip."""
+
+    def get_many_player_innings_histories(
+        self, keys: Sequence[Tuple[str, str]], limit: Optional[int] = None
+    ) -> Dict[Tuple[str, str], Iterable[Dict[str, Any]]]:
+        """
+        Return innings for each (player_id, match_format) key, most recent first.
+
+        At most `limit` innings per key when given; keys without history may be omitted.
+        """
+
+
+class RecentRunsProvider(Protocol):
+    """Optional HistoryProvider extension returning runs directly (e.g. columnar stores)."""
+
+    def get_recent_runs(self, player_id: str, match_format: str, limit: Optional[int] = None) -> Sequence[float]:
+        """Return up to `limit` runs for player_id and match_format, most recent first."""
+
+
+# (team, batting_position) hint from the scored innings; used only by the role fallbacks.
+Role = Tuple[Optional[str], Optional[int]]
+NO_ROLE: Role = (None, None)
+
+
+class BulkRecentRunsProvider(Protocol):
+    """Optional HistoryProvider extension returning runs for many keys in one round trip."""
+
+    def get_many_recent_runs(
+        self, keys: Sequence[Tuple[str, str]], limit: Optional[int] = None
+    ) -> Dict[Tuple[str, str], Sequence[float]]:
+        """Return up to `limit` runs per (player_id, match_format) key, most recent first."""
+
+
+class ChangeTrackingHistoryProvider(Protocol):
+    """Optional HistoryProvider extension reporting which keys gained innings since a version."""
+
+    def changes_since(self, version: Optional[int]) -> Tuple[int, Optional[List[Tuple[str, str]]]]:
+        """
+        Return (current version, changed (player_id, match_format) keys).
+
+        Keys are None when everything may have changed; `version=None` only reads the version.
+        """
+
+
 @dataclass
 class BaselineStats:
     """Baseline statistics for UPS computation."""
@@ -29,6 +99,50 @@ class BaselineStats:
     source: str
 
 
+@dataclass(frozen=True)
+class BucketThresholds:
+    """
+    Run totals at which an innings enters each UPS bucket for a fixed baseline.
+
+    Each threshold is the smallest run total whose UPS reaches the bucket edge, so
+    `classify` agrees exactly with `UPSScorer.classify_ups(UPSScorer.compute_ups_score(...))`.
+    """
+
+    mild_runs: float
+    strong_runs: float
+    extreme_runs: float
+    baseline: BaselineStats
+
+    def classify(self, current_runs: float) -> tuple[int, str]:
+        """Map a run total to (flag, bucket) with at most three comparisons."""
+        if current_runs < self.mild_runs:
+            return 0, "normal"
+        if current_runs < self.strong_runs:
+            return 0, "mild_spike"
+        if current_runs < self.extreme_runs:
+            return 1, "strong_spike"
+        return 1, "extreme_spike"
+
+    def classify_array(self, current_runs: Sequence[float]) -> tuple[np.ndarray, np.ndarray]:
+        """Vectorized `classify` for many run totals (e.g. a live ball-by-ball stream)."""
+        edges = np.array([self.mild_runs, self.strong_runs, self.extreme_runs])
+        bucket_idx = np.searchsorted(edges, np.asarray(current_runs, dtype=float), side="right")
+        return _BUCKET_FLAGS[bucket_idx], _BUCKET_LABELS[bucket_idx]
+
+
+def _runs_threshold(mean_runs: float, std_runs: float, ups_edge: float) -> float:
+    """Smallest run total r with (r - mean) / std >= ups_edge, exact in floating point."""
+    if std_runs <= 0:
+        return math.inf
+    threshold = mean_runs + ups_edge * std_runs
+    # The closed form can be off by an ulp or two; step to the exact boundary.
+    while (threshold - mean_runs) / std_runs >= ups_edge:
+        threshold = math.nextafter(threshold, -math.inf)
+    while (threshold - mean_runs) / std_runs < ups_edge:
+        threshold = math.nextafter(threshold, math.inf)
+    return threshold
+
+
 class UPSScorer:
     """
     Compute UPS Score for a single batting innings.
@@ -46,6 +160,21 @@ class UPSScorer:
         * 1.0 ≤ UPS < 2.0    -> mild_spike (flag 0)
         * 2.0 ≤ UPS < 3.0    -> strong_spike (flag 1)
         * UPS ≥ 3.0          -> extreme_spike (flag 1)
+    - Optional `baseline_cache` memoizes baselines; call `invalidate_player` when a new
+      innings is recorded for a player. With a ChangeTrackingHistoryProvider, `sync_history`
+      invalidates the players whose history changed (e.g. written by an ingest process).
+    - Optional `online_store` keeps per-player ring buffers of recent runs:
+      history is read once per (player, format) to seed it, then `record_innings` updates
+      baselines incrementally with no further history I/O.
+    - `get_bucket_thresholds` precomputes per-player run totals for the mild/strong/extreme
+      edges (cached in `baseline_cache` and invalidated with the baseline), so
+      `classify_runs` is a few comparisons.
+    - Optional `role_baselines` replaces the constant team-role/global fallbacks with
+      precomputed (format, team, batting position) aggregates. Scoring methods accept the
+      innings' `team` and `batting_position`, which take precedence over the player's latest
+      role in the table (so players with no history still get a role baseline).
+    - `*_async` methods await `aget_player_innings_history` when the provider implements
+      AsyncHistoryProvider, otherwise run the sync lookup in a worker thread.
     """
 
     def __init__(
@@ -56,33 +185,74 @@ class UPSScorer:
         min_history: int = 5,
         decay_lambda: float = 0.3,
         sigma_min: float = 5.0,
+        baseline_cache: Optional[BaselineCache] = None,
+        online_store: Optional[OnlineBaselineStore] = None,
+        role_baselines: Optional[RoleBaselineTable] = None,
     ) -> None:
+        if online_store is not None and (
+            online_store.window_size != window_size or online_store.decay_lambda != decay_lambda
+        ):
+            raise ValueError("online_store window_size/decay_lambda must match the scorer configuration")
         self.history_provider = history_provider
         self.window_size = window_size
         self.min_history = min_history
         self.decay_lambda = decay_lambda
         self.sigma_min = sigma_min
+        self.baseline_cache = baseline_cache
+        self.online_store = online_store
+        self.role_baselines = role_baselines
+        self._history_version: Optional[int] = None
+        if baseline_cache is not None and hasattr(history_provider, "changes_since"):
+            self._history_version = history_provider.changes_since(None)[0]
 
-    def get_team_role_baseline(self, player_id: str, match_format: str) -> Optional[BaselineStats]:
+    def get_team_role_baseline(
+        self, player_id: str, match_format: str, team: Optional[str] = None, batting_position: Optional[int] = None
+    ) -> Optional[BaselineStats]:
         """
         Fetch team-role baseline when player history is insufficient (MVP fallback).
 
         Notes:
-            - Placeholder implementation returns a simple heuristic baseline.
-            - Replace with real team/role aggregates when data is available.
+            - With `role_baselines`, uses the (format, team, batting position) aggregate for the
+              given role, filling gaps from the player's latest role; returns None when that
+              group is unknown.
+            - Without it, returns a simple heuristic baseline.
         """
+        if self.role_baselines is not None:
+            team, batting_position = self._resolve_role(player_id, match_format, (team, batting_position))
+            stats = self.role_baselines.lookup_team_role(match_format, team, batting_position)
+            return self._role_stats_to_baseline(stats, "team_role_fallback")
         return BaselineStats(mean_runs=25.0, std_runs=max(self.sigma_min, 10.0), num_innings=0, source="team_role_fallback")
 
-    def get_global_role_baseline(self, match_format: str) -> Optional[BaselineStats]:
+    def get_global_role_baseline(self, match_format: str, batting_position: Optional[int] = None) -> Optional[BaselineStats]:
         """
         Fetch global-role baseline when player/team baselines are unavailable (MVP fallback).
 
         Notes:
-            - Placeholder implementation uses conservative global defaults.
-            - Replace with format-specific aggregates when available.
+            - With `role_baselines`, uses the (format, batting position) aggregate, then the
+              format-wide aggregate; returns None when neither exists.
+            - Without it, uses conservative global defaults.
         """
+        if self.role_baselines is not None:
+            stats = self.role_baselines.lookup_global(match_format, batting_position)
+            return self._role_stats_to_baseline(stats, "global_fallback")
         return BaselineStats(mean_runs=22.0, std_runs=max(self.sigma_min, 12.0), num_innings=0, source="global_fallback")
 
+    def _resolve_role(self, player_id: str, match_format: str, role: Role) -> Role:
+        """Given (team, batting_position), with missing parts from the player's latest role in the table."""
+        team, batting_position = role
+        if self.role_baselines is not None and (team is None or batting_position is None):
+            latest_team, latest_position = self.role_baselines.player_role(player_id, match_format)
+            team = latest_team if team is None else team
+            batting_position = latest_position if batting_position is None else batting_position
+        return team, batting_position
+
+    def _role_stats_to_baseline(self, stats: Optional[Tuple[float, float, int]], source: str) -> Optional[BaselineStats]:
+        """Wrap a role table entry as BaselineStats, applying sigma_min."""
+        if stats is None:
+            return None
+        mean_runs, std_runs, n = stats
+        return BaselineStats(mean_runs=mean_runs, std_runs=max(std_runs, self.sigma_min), num_innings=n, source=source)
+
     def _compute_weighted_stats(self, values: Iterable[float]) -> tuple[float, float, int]:
         """Compute exponential-weighted mean and std for a sequence of values."""
         values_list = list(values)
@@ -91,50 +261,332 @@ class UPSScorer:
         if weight_sum == 0:
             return 0.0, 0.0, 0
         mean = sum(v * w for v, w in zip(values_list, weights)) / weight_sum
-        variance = sum(w * (v - mean) ** 2 for v, w in zip(values_list, weights)) / weight_sum
+        variance = sum(w * ((v - mean) * (v - mean)) for v, w in zip(values_list, weights)) / weight_sum
         std = math.sqrt(variance)
         return mean, std, len(values_list)
 
-    def compute_player_baseline(self, player_id: str, match_format: str) -> BaselineStats:
+    def _compute_weighted_stats_batch(self, runs: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         """
-        Compute player-specific baseline for runs_scored with recency weighting.
+        Vectorized `_compute_weighted_stats` over a (n_keys, width) matrix of runs.
 
-        - Uses up to `window_size` most recent innings from history_provider.
-        - Requires >= min_history innings; otherwise falls back to team/global/default baselines.
-        - Default baseline: mean_runs=20, std_runs=15, source="default".
+        Rows are most recent first and zero-padded beyond `counts`. Sums are accumulated
+        column by column in the same order as the scalar path, so results are bit-identical.
         """
+        n_rows, width = runs.shape
+        decay = np.array([math.exp(-self.decay_lambda * i) for i in range(width)])
+        weights = np.where(np.arange(width) < counts[:, None], decay, 0.0)
+        weight_sum = np.zeros(n_rows)
+        weighted_runs = np.zeros(n_rows)
+        for i in range(width):
+            weight_sum += weights[:, i]
+            weighted_runs += runs[:, i] * weights[:, i]
+        has_weight = weight_sum > 0
+        safe_sum = np.where(has_weight, weight_sum, 1.0)
+        mean = np.where(has_weight, weighted_runs / safe_sum, 0.0)
+        weighted_sq = np.zeros(n_rows)
+        for i in range(width):
+            diff = runs[:, i] - mean
+            weighted_sq += weights[:, i] * (diff * diff)
+        std = np.where(has_weight, np.sqrt(weighted_sq / safe_sum), 0.0)
+        return mean, std
+
+    def _fetch_recent_runs(self, player_id: str, match_format: str) -> List[float]:
+        """Return up to `window_size` most recent runs for a player/format, most recent first."""
+        get_recent_runs = getattr(self.history_provider, "get_recent_runs", None)
+        if get_recent_runs is not None:
+            return [float(r) for r in get_recent_runs(player_id, match_format, self.window_size)]
         history = list(self.history_provider.get_player_innings_history(player_id, match_format))
-        if history:
-            history = history[: self.window_size]
-        if len(history) >= self.min_history:
-            runs = [float(item.get("runs_scored", 0.0)) for item in history]
-            mean_runs, std_runs, n = self._compute_weighted_stats(runs)
-            sigma_eff = max(std_runs, self.sigma_min)
-            return BaselineStats(mean_runs=mean_runs, std_runs=sigma_eff, num_innings=n, source="player")
+        return [float(item.get("runs_scored", 0.0)) for item in history[: self.window_size]]
+
+    def _fetch_recent_runs_many(self, keys: Sequence[Tuple[str, str]]) -> List[Sequence[float]]:
+        """
+        Return recent runs for many keys, aligned with `keys`.
+
+        Bulk calls win, so SQL-backed providers answer the batch in a few statements:
+        `get_many_recent_runs` (runs only), then `get_many_player_innings_histories`. Without
+        either, falls back to `get_recent_runs` or a history lookup per distinct key.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        get_many_runs = getattr(self.history_provider, "get_many_recent_runs", None)
+        get_many = getattr(self.history_provider, "get_many_player_innings_histories", None)
+        runs_by_key: Dict[Tuple[str, str], Sequence[float]]
+        if get_many_runs is not None:
+            found = get_many_runs(unique_keys, limit=self.window_size)
+            runs_by_key = {key: found.get(key, [])[: self.window_size] for key in unique_keys}
+        elif get_many is not None:
+            histories = get_many(unique_keys, limit=self.window_size)
+            runs_by_key = {
+                key: [float(item.get("runs_scored", 0.0)) for item in list(histories.get(key, []))[: self.window_size]]
+                for key in unique_keys
+            }
+        else:
+            runs_by_key = {key: self._fetch_recent_runs(*key) for key in unique_keys}
+        return [runs_by_key[key] for key in keys]
 
-        # TODO: attempt team-role or global-role baselines.
-        team_baseline = self.get_team_role_baseline(player_id, match_format)
+    def _fallback_baseline(self, player_id: str, match_format: str, role: Role = NO_ROLE) -> BaselineStats:
+        """Resolve team-role, global-role or default baseline when player history is insufficient."""
+        team, batting_position = self._resolve_role(player_id, match_format, role)
+        team_baseline = self.get_team_role_baseline(player_id, match_format, team, batting_position)
         if team_baseline:
             return team_baseline
-        global_baseline = self.get_global_role_baseline(match_format)
+        global_baseline = self.get_global_role_baseline(match_format, batting_position)
         if global_baseline:
             return global_baseline
 
         return BaselineStats(mean_runs=20.0, std_runs=15.0, num_innings=0, source="default")
 
-    def compute_ups_score(self, player_id: str, match_format: str, current_runs: float) -> float:
+    def compute_player_baseline(
+        self, player_id: str, match_format: str, team: Optional[str] = None, batting_position: Optional[int] = None
+    ) -> BaselineStats:
+        """
+        Compute player-specific baseline for runs_scored with recency weighting.
+
+        - Uses up to `window_size` most recent innings from history_provider.
+        - Requires >= min_history innings; otherwise falls back to team/global/default baselines
+          (for the given team/batting_position when known).
+        - Default baseline: mean_runs=20, std_runs=15, source="default".
+        - Served from `baseline_cache` when configured.
+        """
+        role = (team, batting_position)
+        if self.baseline_cache is None:
+            return self._build_player_baseline(player_id, match_format, role)
+        key = self._baseline_cache_key(player_id, match_format, role)
+        baseline = self.baseline_cache.get(key)
+        if baseline is None:
+            baseline = self._build_player_baseline(player_id, match_format, role)
+            self.baseline_cache.put(key, baseline)
+        return baseline
+
+    def _baseline_cache_key(self, player_id: str, match_format: str, role: Role = NO_ROLE) -> Tuple[Any, ...]:
+        """Cache key covering every parameter that shapes a baseline."""
+        return (player_id, match_format, self.window_size, self.decay_lambda, self.min_history, self.sigma_min, *role)
+
+    def invalidate_player(self, player_id: str, match_format: Optional[str] = None) -> None:
+        """Drop cached baselines for a player (optionally one format), e.g. after a new innings."""
+        if self.baseline_cache is not None:
+            self.baseline_cache.invalidate(player_id, match_format)
+
+    def sync_history(self) -> int:
+        """
+        Invalidate cached baselines for keys the history provider reports as changed.
+
+        No-op unless both `baseline_cache` and a ChangeTrackingHistoryProvider are configured.
+        Returns the number of (player, format) keys invalidated (-1 when the cache was cleared).
+        """
+        changes_since = getattr(self.history_provider, "changes_since", None)
+        if changes_since is None or self.baseline_cache is None:
+            return 0
+        version, keys = changes_since(self._history_version)
+        self._history_version = version
+        if keys is None:
+            self.baseline_cache.clear()
+            return -1
+        for player_id, match_format in keys:
+            self.baseline_cache.invalidate(player_id, match_format)
+        return len(keys)
+
+    def record_innings(self, player_id: str, match_format: str, runs_scored: float) -> None:
+        """
+        Record a newly completed innings.
+
+        With `online_store`, the player's state is updated in place (seeded from history first
+        if unseen, so pass innings not yet visible to the history provider). Cached baselines
+        for the player/format are invalidated either way.
+        """
+        if self.online_store is not None:
+            if self.online_store.get(player_id, match_format) is None:
+                self.online_store.seed_if_absent(player_id, match_format, self._fetch_recent_runs(player_id, match_format))
+            self.online_store.append(player_id, match_format, runs_scored)
+        self.invalidate_player(player_id, match_format)
+
+    def _online_baseline(self, player_id: str, match_format: str, role: Role = NO_ROLE) -> BaselineStats:
+        """Baseline from incremental state, seeding it from history on first use."""
+        assert self.online_store is not None
+        stats = self.online_store.stats(player_id, match_format)
+        if stats is None:
+            self.online_store.seed_if_absent(player_id, match_format, self._fetch_recent_runs(player_id, match_format))
+            stats = self.online_store.stats(player_id, match_format) or (0.0, 0.0, 0)  # dropped meanwhile
+        mean_runs, std_runs, n = stats
+        if n >= self.min_history:
+            return BaselineStats(mean_runs=mean_runs, std_runs=max(std_runs, self.sigma_min), num_innings=n, source="player")
+        return self._fallback_baseline(player_id, match_format, role)
+
+    def _build_player_baseline(self, player_id: str, match_format: str, role: Role = NO_ROLE) -> BaselineStats:
+        """Compute a player baseline from history, bypassing any cache."""
+        if self.online_store is not None:
+            return self._online_baseline(player_id, match_format, role)
+        runs = self._fetch_recent_runs(player_id, match_format)
+        return self._baseline_from_runs(player_id, match_format, runs, role)
+
+    def _baseline_from_runs(
+        self, player_id: str, match_format: str, runs: Sequence[float], role: Role = NO_ROLE
+    ) -> BaselineStats:
+        """Player baseline from recent runs (most recent first), or fallback if too few."""
+        if len(runs) >= self.min_history:
+            mean_runs, std_runs, n = self._compute_weighted_stats(runs)
+            sigma_eff = max(std_runs, self.sigma_min)
+            return BaselineStats(mean_runs=mean_runs, std_runs=sigma_eff, num_innings=n, source="player")
+        return self._fallback_baseline(player_id, match_format, role)
+
+    async def _fetch_recent_runs_async(self, player_id: str, match_format: str) -> List[float]:
+        """Async `_fetch_recent_runs`: awaits an async provider or offloads a sync one to a thread."""
+        aget = getattr(self.history_provider, "aget_player_innings_history", None)
+        if aget is None:
+            return await asyncio.to_thread(self._fetch_recent_runs, player_id, match_format)
+        history = list(await aget(player_id, match_format))
+        return [float(item.get("runs_scored", 0.0)) for item in history[: self.window_size]]
+
+    async def compute_player_baseline_async(
+        self, player_id: str, match_format: str, team: Optional[str] = None, batting_position: Optional[int] = None
+    ) -> BaselineStats:
+        """Async `compute_player_baseline`; cache and online-store hits do no I/O."""
+        role = (team, batting_position)
+        key = self._baseline_cache_key(player_id, match_format, role)
+        if self.baseline_cache is not None:
+            cached = self.baseline_cache.get(key)
+            if cached is not None:
+                return cached
+        if self.online_store is not None and self.online_store.get(player_id, match_format) is not None:
+            baseline = self._online_baseline(player_id, match_format, role)
+        else:
+            runs = await self._fetch_recent_runs_async(player_id, match_format)
+            if self.online_store is not None:
+                self.online_store.seed_if_absent(player_id, match_format, runs)
+                baseline = self._online_baseline(player_id, match_format, role)
+            else:
+                baseline = self._baseline_from_runs(player_id, match_format, runs, role)
+        if self.baseline_cache is not None:
+            self.baseline_cache.put(key, baseline)
+        return baseline
+
+    def compute_player_baselines_batch(
+        self, keys: Sequence[Tuple[str, str]], roles: Optional[Sequence[Role]] = None
+    ) -> List[BaselineStats]:
+        """
+        Compute baselines for many (player_id, match_format) keys in one vectorized pass.
+
+        Histories are fetched once per key; recency-weighted stats for every key with
+        enough history are reduced together. Output matches `compute_player_baseline`;
+        keys already in `baseline_cache` are served from it. `roles` optionally gives a
+        (team, batting_position) per key for the fallbacks.
+        """
+        roles = list(roles) if roles is not None else [NO_ROLE] * len(keys)
+        if self.baseline_cache is None:
+            return self._build_player_baselines_batch(keys, roles)
+        cache_keys = [self._baseline_cache_key(*key, role) for key, role in zip(keys, roles)]
+        baselines: List[Optional[BaselineStats]] = [self.baseline_cache.get(key) for key in cache_keys]
+        missing = [idx for idx, baseline in enumerate(baselines) if baseline is None]
+        if missing:
+            computed = self._build_player_baselines_batch([keys[idx] for idx in missing], [roles[idx] for idx in missing])
+            for idx, baseline in zip(missing, computed):
+                baselines[idx] = baseline
+                self.baseline_cache.put(cache_keys[idx], baseline)
+        return baselines  # type: ignore[return-value]
+
+    def _build_player_baselines_batch(self, keys: Sequence[Tuple[str, str]], roles: Sequence[Role]) -> List[BaselineStats]:
+        """Vectorized baseline computation for many keys, bypassing any cache."""
+        if self.online_store is not None:
+            unseeded = [key for key in dict.fromkeys(keys) if self.online_store.get(*key) is None]
+            for key, runs in zip(unseeded, self._fetch_recent_runs_many(unseeded)):
+                self.online_store.seed_if_absent(key[0], key[1], runs)
+            return [self._online_baseline(*key, role) for key, role in zip(keys, roles)]
+        runs_per_key = self._fetch_recent_runs_many(keys)
+        counts = np.array([len(runs) for runs in runs_per_key], dtype=np.int64)
+        eligible = np.flatnonzero(counts >= self.min_history)
+
+        baselines: List[Optional[BaselineStats]] = [None] * len(keys)
+        if eligible.size:
+            width = int(counts[eligible].max())
+            matrix = np.zeros((eligible.size, width))
+            for row, idx in enumerate(eligible):
+                matrix[row, : counts[idx]] = runs_per_key[idx]
+            means, stds = self._compute_weighted_stats_batch(matrix, counts[eligible])
+            sigma_eff = np.maximum(stds, self.sigma_min)
+            for row, idx in enumerate(eligible):
+                baselines[idx] = BaselineStats(
+                    mean_runs=float(means[row]),
+                    std_runs=float(sigma_eff[row]),
+                    num_innings=int(counts[idx]),
+                    source="player",
+                )
+        for idx, baseline in enumerate(baselines):
+            if baseline is None:
+                baselines[idx] = self._fallback_baseline(*keys[idx], roles[idx])
+        return baselines  # type: ignore[return-value]
+
+    def compute_ups_score(
+        self,
+        player_id: str,
+        match_format: str,
+        current_runs: float,
+        team: Optional[str] = None,
+        batting_position: Optional[int] = None,
+    ) -> float:
         """
         Compute UPS score for a single innings.
 
         z = (current_runs - μ) / sigma_eff
         UPS = min(max(z, 0), 5)
         """
-        baseline = self.compute_player_baseline(player_id, match_format)
+        baseline = self.compute_player_baseline(player_id, match_format, team, batting_position)
+        return self._ups_from_baseline(baseline, current_runs)
+
+    async def compute_ups_score_async(
+        self,
+        player_id: str,
+        match_format: str,
+        current_runs: float,
+        team: Optional[str] = None,
+        batting_position: Optional[int] = None,
+    ) -> float:
+        """Async `compute_ups_score`."""
+        baseline = await self.compute_player_baseline_async(player_id, match_format, team, batting_position)
+        return self._ups_from_baseline(baseline, current_runs)
+
+    @staticmethod
+    def _ups_from_baseline(baseline: BaselineStats, current_runs: float) -> float:
+        """Clipped positive z-score of current_runs against a baseline."""
         z = (current_runs - baseline.mean_runs) / baseline.std_runs if baseline.std_runs > 0 else 0.0
         z_pos = max(z, 0.0)
         ups = min(z_pos, 5.0)
         return ups
 
+    def get_bucket_thresholds(
+        self, player_id: str, match_format: str, team: Optional[str] = None, batting_position: Optional[int] = None
+    ) -> BucketThresholds:
+        """
+        Run totals at which an innings for this player/format becomes mild, strong or extreme.
+
+        `team`/`batting_position` select the fallback baseline as in `compute_player_baseline`.
+        Cached in `baseline_cache` (when configured) next to the baseline, keyed by role too, so
+        `invalidate_player`/`record_innings` drop both together.
+        """
+        role = (team, batting_position)
+        key = self._baseline_cache_key(player_id, match_format, role) + ("bucket_thresholds",)
+        if self.baseline_cache is not None:
+            cached = self.baseline_cache.get(key)
+            if cached is not None:
+                return cached
+        baseline = self.compute_player_baseline(player_id, match_format, team, batting_position)
+        mild, strong, extreme = (
+            _runs_threshold(baseline.mean_runs, baseline.std_runs, float(edge)) for edge in _BUCKET_EDGES
+        )
+        thresholds = BucketThresholds(mild_runs=mild, strong_runs=strong, extreme_runs=extreme, baseline=baseline)
+        if self.baseline_cache is not None:
+            self.baseline_cache.put(key, thresholds)
+        return thresholds
+
+    def classify_runs(
+        self,
+        player_id: str,
+        match_format: str,
+        current_runs: float,
+        team: Optional[str] = None,
+        batting_position: Optional[int] = None,
+    ) -> tuple[int, str]:
+        """Bucket a run total via precomputed thresholds (same result as classify_ups of its UPS)."""
+        return self.get_bucket_thresholds(player_id, match_format, team, batting_position).classify(current_runs)
+
     def classify_ups(self, ups_score: float) -> tuple[int, str]:
         """
         Map UPS score to anomaly flag and bucket.
@@ -150,14 +602,37 @@ class UPSScorer:
             return 1, "strong_spike"
         return 1, "extreme_spike"
 
-    def score_innings(self, player_id: str, match_format: str, current_runs: float) -> Dict[str, Any]:
+    def score_innings(
+        self,
+        player_id: str,
+        match_format: str,
+        current_runs: float,
+        team: Optional[str] = None,
+        batting_position: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
         End-to-end UPS computation for an innings.
 
         Returns dict with UPS score, anomaly flag, bucket, and baseline stats.
         """
-        baseline = self.compute_player_baseline(player_id, match_format)
-        ups_score = self.compute_ups_score(player_id, match_format, current_runs)
+        baseline = self.compute_player_baseline(player_id, match_format, team, batting_position)
+        return self._score_from_baseline(baseline, current_runs)
+
+    async def score_innings_async(
+        self,
+        player_id: str,
+        match_format: str,
+        current_runs: float,
+        team: Optional[str] = None,
+        batting_position: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Async `score_innings`; many calls can await history lookups concurrently."""
+        baseline = await self.compute_player_baseline_async(player_id, match_format, team, batting_position)
+        return self._score_from_baseline(baseline, current_runs)
+
+    def _score_from_baseline(self, baseline: BaselineStats, current_runs: float) -> Dict[str, Any]:
+        """Build the score_innings result dict for a resolved baseline."""
+        ups_score = self._ups_from_baseline(baseline, current_runs)
         flag, bucket = self.classify_ups(ups_score)
         return {
             "ups_score": ups_score,
@@ -167,3 +642,52 @@ class UPSScorer:
             "baseline_std_runs": baseline.std_runs,
             "baseline_source": baseline.source,
         }
+
+    def score_innings_batch(
+        self,
+        player_ids: Sequence[str],
+        match_formats: Sequence[str],
+        current_runs: Sequence[float],
+        teams: Optional[Sequence[Optional[str]]] = None,
+        batting_positions: Optional[Sequence[Optional[int]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Vectorized `score_innings` over parallel arrays of innings.
+
+        Baselines are computed once per distinct (player_id, match_format, team,
+        batting_position); z-scores, clipping and bucketing run as single NumPy operations
+        over the whole batch. Each returned dict matches `score_innings` for the same inputs
+        exactly.
+        """
+        teams = teams if teams is not None else [None] * len(player_ids)
+        batting_positions = batting_positions if batting_positions is not None else [None] * len(player_ids)
+        if not len(player_ids) == len(match_formats) == len(current_runs) == len(teams) == len(batting_positions):
+            raise ValueError("player_ids, match_formats, current_runs, teams and batting_positions must have the same length")
+        if len(player_ids) == 0:
+            return []
+
+        keys = list(zip(player_ids, match_formats, teams, batting_positions))
+        unique_keys = list(dict.fromkeys(keys))
+        key_index = {key: idx for idx, key in enumerate(unique_keys)}
+        baselines = self.compute_player_baselines_batch([key[:2] for key in unique_keys], [key[2:] for key in unique_keys])
+        rows = np.array([key_index[key] for key in keys], dtype=np.int64)
+
+        means = np.array([b.mean_runs for b in baselines])[rows]
+        stds = np.array([b.std_runs for b in baselines])[rows]
+        runs = np.asarray(current_runs, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(stds > 0, (runs - means) / np.where(stds > 0, stds, 1.0), 0.0)
+        ups = np.minimum(np.maximum(z, 0.0), 5.0)
+        flags, buckets = classify_ups_array(ups)
+
+        return [
+            {
+                "ups_score": float(ups[i]),
+                "ups_anomaly_flag": int(flags[i]),
+                "ups_bucket": str(buckets[i]),
+                "baseline_mean_runs": baselines[rows[i]].mean_runs,
+                "baseline_std_runs": baselines[rows[i]].std_runs,
+                "baseline_source": baselines[rows[i]].source,
+            }
+            for i in range(len(keys))
+        ]
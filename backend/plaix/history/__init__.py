@@ -0,0 +1 @@
+"""History providers backing UPS baselines."""
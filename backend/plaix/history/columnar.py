@@ -0,0 +1,187 @@
+"""Memory-mapped columnar history store for UPS baselines."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+RUNS_FILE = "runs.npy"
+TIMESTAMPS_FILE = "timestamps.npy"
+KEYS_FILE = "keys.npy"
+OFFSETS_FILE = "offsets.npy"
+INDEX_FILE = "index.json"
+CURRENT_FILE = "CURRENT"  # name of the live version directory
+
+_KEY_SEP = "\x1f"  # unit separator: below every printable character
+
+
+def _encode_key(player_id: str, match_format: str) -> bytes:
+    """Byte key of a (player_id, match_format) pair as stored in keys.npy."""
+    return f"{player_id}{_KEY_SEP}{match_format}".encode("utf-8")
+
+
+def write_columnar_history(df: pd.DataFrame, root: str | Path) -> Path:
+    """
+    Write innings history as contiguous column arrays plus a per-player offset index.
+
+    Args:
+        df: innings with player_id, match_format, runs_scored (or current_runs) and
+            timestamp (epoch seconds) or date columns.
+        root: output directory.
+    Layout:
+        - v<ns>/runs.npy (float32), v<ns>/timestamps.npy (int64, epoch seconds)
+        - v<ns>/keys.npy: sorted fixed-width byte keys "player_id\x1fmatch_format"
+        - v<ns>/offsets.npy: int64 [start, stop) row bounds per key, shape (num_keys, 2)
+        - v<ns>/index.json: {"formats": [...], "num_rows": n, "num_keys": k} (small metadata)
+        - CURRENT: name of the live version directory.
+        Rows are grouped by (player_id, match_format) and ordered most recent first, so any
+        player's history is one contiguous slice.
+
+    Each write goes to a fresh version directory and then swaps `CURRENT` atomically, so
+    files that open providers have memory-mapped are never rewritten. Older versions except
+    the previous one are removed.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    runs_col = "runs_scored" if "runs_scored" in df.columns else "current_runs"
+    if "timestamp" in df.columns:
+        timestamps = pd.to_numeric(df["timestamp"], errors="coerce").fillna(0).astype(np.int64)
+    elif "date" in df.columns:
+        dates = pd.to_datetime(df["date"], errors="coerce").fillna(pd.Timestamp(0))
+        timestamps = dates.astype("int64") // 10**9
+    else:
+        timestamps = pd.Series(np.arange(len(df), dtype=np.int64), index=df.index)
+
+    data = pd.DataFrame(
+        {
+            "player_id": df["player_id"].astype(str).to_numpy(),
+            "match_format": df["match_format"].astype(str).to_numpy(),
+            "runs": df[runs_col].astype(np.float32).to_numpy(),
+            "timestamp": np.asarray(timestamps, dtype=np.int64),
+        }
+    )
+    data = data.sort_values(
+        ["player_id", "match_format", "timestamp"], ascending=[True, True, False], kind="mergesort"
+    ).reset_index(drop=True)
+
+    formats = sorted(data["match_format"].unique().tolist())
+    group_sizes = data.groupby(["player_id", "match_format"], sort=False).size()
+    sizes = group_sizes.to_numpy(dtype=np.int64)
+    stops = np.cumsum(sizes)
+    offsets = np.stack([stops - sizes, stops], axis=1)
+    keys = np.array([_encode_key(player_id, match_format) for player_id, match_format in group_sizes.index], dtype=bytes)
+    by_key = np.argsort(keys, kind="stable")
+
+    version = f"v{time.time_ns()}"
+    staging = root / f".{version}.tmp"
+    staging.mkdir()
+    np.save(staging / RUNS_FILE, data["runs"].to_numpy(np.float32))
+    np.save(staging / TIMESTAMPS_FILE, data["timestamp"].to_numpy(np.int64))
+    np.save(staging / KEYS_FILE, keys[by_key])
+    np.save(staging / OFFSETS_FILE, offsets[by_key])
+    (staging / INDEX_FILE).write_text(json.dumps({"formats": formats, "num_rows": len(data), "num_keys": len(keys)}))
+    os.rename(staging, root / version)
+
+    previous = _current_version(root)
+    tmp_pointer = root / f".{CURRENT_FILE}.tmp"
+    tmp_pointer.write_text(version)
+    os.replace(tmp_pointer, root / CURRENT_FILE)
+    for stale in root.glob("v*"):
+        if stale.is_dir() and stale.name not in (version, previous):
+            shutil.rmtree(stale, ignore_errors=True)
+    return root
+
+
+def _current_version(root: Path) -> Optional[str]:
+    try:
+        return (root / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def resolve_columnar_history(root: str | Path) -> Path:
+    """Directory holding the live arrays of a store (`root` itself for the legacy flat layout)."""
+    root = Path(root)
+    version = _current_version(root)
+    return root if version is None else root / version
+
+
+class ColumnarHistoryProvider:
+    """
+    HistoryProvider over a `write_columnar_history` directory.
+
+    Notes:
+        - Column arrays and the key/offset index are opened with np.load(mmap_mode="r"): a cold
+          process maps the files instead of parsing them (start-up cost does not grow with the
+          number of players), and every worker on the host shares the same page cache.
+        - A lookup is a binary search (np.searchsorted) over the sorted keys.
+        - `get_recent_runs` returns a zero-copy view into the mapped runs column.
+        - The provider maps the version that was live when it was created; a later
+          `write_columnar_history` publishes a new version without touching these files.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.path = resolve_columnar_history(self.root)
+        index = json.loads((self.path / INDEX_FILE).read_text())
+        self.formats: List[str] = index["formats"]
+        self._keys = np.load(self.path / KEYS_FILE, mmap_mode="r")
+        self._offsets = np.load(self.path / OFFSETS_FILE, mmap_mode="r")
+        self.runs = np.load(self.path / RUNS_FILE, mmap_mode="r")
+        self.timestamps = np.load(self.path / TIMESTAMPS_FILE, mmap_mode="r")
+
+    def __len__(self) -> int:
+        return int(self.runs.shape[0])
+
+    def _bounds(self, player_id: str, match_format: str, limit: Optional[int]) -> tuple[int, int]:
+        """Return [start, stop) row bounds for a player/format, truncated to limit rows."""
+        start, stop = self._bounds_many([(player_id, match_format)], limit)[0]
+        return int(start), int(stop)
+
+    def _bounds_many(self, keys: Sequence[Tuple[str, str]], limit: Optional[int]) -> np.ndarray:
+        """[start, stop) bounds per key as an (n, 2) array; unknown keys get (0, 0)."""
+        bounds = np.zeros((len(keys), 2), dtype=np.int64)
+        if not len(keys) or not len(self._keys):
+            return bounds
+        queries = np.array([_encode_key(player_id, match_format) for player_id, match_format in keys], dtype=bytes)
+        positions = np.minimum(np.searchsorted(self._keys, queries), len(self._keys) - 1)
+        found = self._keys[positions] == queries
+        bounds[found] = self._offsets[positions[found]]
+        if limit is not None:
+            bounds[:, 1] = np.minimum(bounds[:, 1], bounds[:, 0] + limit)
+        return bounds
+    def get_recent_runs(self, player_id: str, match_format: str, limit: Optional[int] = None) -> np.ndarray:
+        """Return runs most recent first as a read-only view (no copy)."""
+        start, stop = self._bounds(player_id, match_format, limit)
+        return self.runs[start:stop]
+
+    def get_player_innings_history(self, player_id: str, match_format: str) -> List[Dict[str, Any]]:
+        """Return innings most recent first, as dicts (HistoryProvider protocol)."""
+        return self._history_slice(player_id, match_format, None)
+
+    def get_many_player_innings_histories(
+        self, keys: Sequence[Tuple[str, str]], limit: Optional[int] = None
+    ) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """Return histories for many (player_id, match_format) keys (BulkHistoryProvider)."""
+        return {key: self._history_slice(key[0], key[1], limit) for key in keys}
+
+    def get_many_recent_runs(
+        self, keys: Sequence[Tuple[str, str]], limit: Optional[int] = None
+    ) -> Dict[Tuple[str, str], np.ndarray]:
+        """Return runs for many keys as zero-copy views, with one vectorized index search (BulkRecentRunsProvider)."""
+        bounds = self._bounds_many(keys, limit)
+        return {key: self.runs[start:stop] for key, (start, stop) in zip(keys, bounds.tolist())}
+
+    def _history_slice(self, player_id: str, match_format: str, limit: Optional[int]) -> List[Dict[str, Any]]:
+        """Materialize a player's innings slice as dicts."""
+        start, stop = self._bounds(player_id, match_format, limit)
+        runs = self.runs[start:stop].tolist()
+        timestamps = self.timestamps[start:stop].tolist()
+        return [{"runs_scored": r, "timestamp": t} for r, t in zip(runs, timestamps)]
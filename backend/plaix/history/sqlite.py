@@ -0,0 +1,180 @@
+"""SQLite-backed innings history store for UPS baselines."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS innings (
+    id INTEGER PRIMARY KEY,
+    player_id TEXT NOT NULL,
+    match_format TEXT NOT NULL,
+    date TEXT NOT NULL,
+    runs_scored REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_innings_player_format_date
+    ON innings (player_id, match_format, date DESC, id DESC);
+"""
+
+_SELECT_HISTORY = (
+    "SELECT runs_scored, date FROM innings "
+    "WHERE player_id = ? AND match_format = ? "
+    "ORDER BY date DESC, id DESC LIMIT ?"
+)
+_INSERT_INNINGS = "INSERT INTO innings (player_id, match_format, date, runs_scored) VALUES (?, ?, ?, ?)"
+_SELECT_MAX_ID = "SELECT COALESCE(MAX(id), 0) FROM innings"
+_SELECT_CHANGED_KEYS = "SELECT DISTINCT player_id, match_format FROM innings WHERE id > ? AND id <= ?"
+
+# Bulk lookups bind a fixed number of keys per statement so the prepared statement is reused;
+# short chunks are padded with NULL keys, which never match.
+BULK_CHUNK_SIZE = 128
+
+
+def _bulk_select_sql(chunk_size: int) -> str:
+    """Windowed query returning the latest innings for `chunk_size` (player, format) keys."""
+    values = ", ".join(["(?, ?)"] * chunk_size)
+    return (
+        f"WITH keys(player_id, match_format) AS (VALUES {values}) "
+        "SELECT player_id, match_format, runs_scored, date FROM ("
+        "  SELECT i.player_id, i.match_format, i.runs_scored, i.date, i.id,"
+        "         ROW_NUMBER() OVER ("
+        "             PARTITION BY i.player_id, i.match_format ORDER BY i.date DESC, i.id DESC"
+        "         ) AS rn"
+        "  FROM innings i JOIN keys k ON i.player_id = k.player_id AND i.match_format = k.match_format"
+        ") WHERE rn <= ? ORDER BY player_id, match_format, rn"
+    )
+
+
+class SQLiteHistoryProvider:
+    """
+    HistoryProvider over a SQLite database with an indexed (player_id, match_format, date) schema.
+
+    Notes:
+        - Each thread gets its own connection (a per-thread pool); sqlite3 caches the prepared
+          statements per connection, and every query uses constant SQL text so they are reused.
+        - The database runs in WAL mode, so API workers keep reading while an ingest job writes.
+        - Implements the bulk (`get_many_player_innings_histories`, `get_many_recent_runs`) and
+          runs-only (`get_recent_runs`) extensions used by UPSScorer.
+        - `changes_since` reports keys with innings appended by any process (ids only grow), so
+          scorers caching baselines can invalidate exactly those players.
+    """
+
+    def __init__(self, path: str | Path, *, timeout: float = 30.0, cached_statements: int = 128) -> None:
+        self.path = str(path)
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._bulk_sql = _bulk_select_sql(BULK_CHUNK_SIZE)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can run from any thread; queries stay per-thread.
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                cached_statements=self.cached_statements,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def add_innings(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert innings in a single transaction. Returns number of rows written.
+
+        Each record needs player_id, match_format, date (ISO string) and runs_scored
+        (or current_runs).
+        """
+        rows = [
+            (
+                str(rec["player_id"]),
+                str(rec["match_format"]),
+                str(rec["date"]),
+                float(rec["runs_scored"] if "runs_scored" in rec else rec["current_runs"]),
+            )
+            for rec in records
+        ]
+        conn = self._connection()
+        with conn:
+            conn.executemany(_INSERT_INNINGS, rows)
+        return len(rows)
+
+    def changes_since(self, version: Optional[int]) -> Tuple[int, Optional[List[Tuple[str, str]]]]:
+        """
+        Return (current version, keys with innings added after `version`) (ChangeTrackingHistoryProvider).
+
+        The version is the largest innings id. Keys are None when the table shrank (rebuilt or
+        truncated), meaning every cached baseline is stale; `version=None` just reads the version.
+        """
+        conn = self._connection()
+        current = conn.execute(_SELECT_MAX_ID).fetchone()[0]
+        if version is None or current == version:
+            return current, []
+        if current < version:
+            return current, None
+        return current, [tuple(row) for row in conn.execute(_SELECT_CHANGED_KEYS, (version, current))]
+
+    def get_player_innings_history(self, player_id: str, match_format: str) -> List[Dict[str, Any]]:
+        """Return innings most recent first (HistoryProvider protocol)."""
+        rows = self._connection().execute(_SELECT_HISTORY, (player_id, match_format, -1)).fetchall()
+        return [{"runs_scored": runs, "date": date} for runs, date in rows]
+
+    def get_recent_runs(self, player_id: str, match_format: str, limit: Optional[int] = None) -> List[float]:
+        """Return up to `limit` runs, most recent first."""
+        rows = self._connection().execute(
+            _SELECT_HISTORY, (player_id, match_format, -1 if limit is None else limit)
+        ).fetchall()
+        return [runs for runs, _ in rows]
+
+    def get_many_player_innings_histories(
+        self, keys: Sequence[Tuple[str, str]], limit: Optional[int] = None
+    ) -> Dict[Tuple[str, str], List[Dict[str, Any]]]:
+        """Return histories for many keys using chunked windowed queries (BulkHistoryProvider)."""
+        unique_keys = list(dict.fromkeys(keys))
+        histories: Dict[Tuple[str, str], List[Dict[str, Any]]] = {key: [] for key in unique_keys}
+        for player_id, match_format, runs, date in self._bulk_rows(unique_keys, limit):
+            histories[(player_id, match_format)].append({"runs_scored": runs, "date": date})
+        return histories
+
+    def get_many_recent_runs(
+        self, keys: Sequence[Tuple[str, str]], limit: Optional[int] = None
+    ) -> Dict[Tuple[str, str], List[float]]:
+        """Return runs (most recent first) for many keys with the same chunked queries."""
+        unique_keys = list(dict.fromkeys(keys))
+        runs_by_key: Dict[Tuple[str, str], List[float]] = {key: [] for key in unique_keys}
+        for player_id, match_format, runs, _ in self._bulk_rows(unique_keys, limit):
+            runs_by_key[(player_id, match_format)].append(runs)
+        return runs_by_key
+
+    def _bulk_rows(self, unique_keys: List[Tuple[str, str]], limit: Optional[int]) -> Iterator[Tuple[str, str, float, str]]:
+        """(player_id, match_format, runs_scored, date) rows, one statement per BULK_CHUNK_SIZE keys."""
+        conn = self._connection()
+        max_rows = 2**62 if limit is None else limit
+        for offset in range(0, len(unique_keys), BULK_CHUNK_SIZE):
+            chunk = unique_keys[offset : offset + BULK_CHUNK_SIZE]
+            padded: List[Tuple[Any, Any]] = chunk + [(None, None)] * (BULK_CHUNK_SIZE - len(chunk))
+            params: List[Any] = [value for key in padded for value in key]
+            params.append(max_rows)
+            yield from conn.execute(self._bulk_sql, params)
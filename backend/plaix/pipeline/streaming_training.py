@@ -0,0 +1,88 @@
+"""Out-of-core training: stream innings chunks from disk into an incremental model."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+
+from plaix.core.feature_schema import FEATURE_SCHEMA, FeatureSchema
+from plaix.core.model import AnomalyModel
+
+Chunk = Tuple[np.ndarray, np.ndarray, np.ndarray]  # (row_numbers, X, y)
+
+
+def iter_csv_chunks(
+    path: str | Path,
+    label_column: str,
+    chunksize: int = 100_000,
+    schema: FeatureSchema = FEATURE_SCHEMA,
+) -> Iterator[Chunk]:
+    """
+    Yield (row_numbers, X, y) chunks from a CSV, reading only the schema and label columns.
+
+    X is built with `schema.transform_frame`, so defaults and validation match serving.
+    Memory is bounded by `chunksize` rows regardless of file size.
+    """
+    offset = 0
+    wanted = {*schema.columns, label_column}
+    reader = pd.read_csv(path, usecols=lambda column: column in wanted, chunksize=chunksize)
+    for chunk in reader:
+        X = schema.transform_frame(chunk)
+        y = chunk[label_column].to_numpy()
+        yield np.arange(offset, offset + len(chunk)), X, y
+        offset += len(chunk)
+
+
+def train_incremental(
+    model: AnomalyModel,
+    chunks: Callable[[], Iterable[Chunk]],
+    epochs: int = 1,
+    holdout_every: int = 5,
+) -> Dict[str, float]:
+    """
+    Train `model` with `partial_fit` over streamed chunks and evaluate on a held-out slice.
+
+    Args:
+        model: AnomalyModel with an incremental backend (e.g. "sgd_logistic").
+        chunks: callable returning a fresh chunk iterator; called once per epoch plus once
+            for evaluation, so data is re-read from disk instead of kept in memory.
+        epochs: passes over the training rows.
+        holdout_every: every n-th row (by row number) is held out for validation; 0 disables.
+
+    Returns:
+        accuracy/precision/recall on held-out rows plus n_train and n_val, computed from
+        running confusion counts.
+    """
+    n_train = 0
+    for epoch in range(epochs):
+        for rows, X, y in chunks():
+            train_mask = rows % holdout_every != 0 if holdout_every else np.ones(len(rows), dtype=bool)
+            if not train_mask.any():
+                continue
+            model.partial_fit(X[train_mask], y[train_mask])
+            if epoch == 0:
+                n_train += int(train_mask.sum())
+
+    tp = fp = fn = tn = 0
+    if holdout_every:
+        for rows, X, y in chunks():
+            val_mask = rows % holdout_every == 0
+            if not val_mask.any():
+                continue
+            y_true = np.asarray(y[val_mask]).astype(bool)
+            y_pred = np.asarray(model.predict(X[val_mask])).astype(bool)
+            tp += int((y_true & y_pred).sum())
+            fp += int((~y_true & y_pred).sum())
+            fn += int((y_true & ~y_pred).sum())
+            tn += int((~y_true & ~y_pred).sum())
+    n_val = tp + fp + fn + tn
+    return {
+        "accuracy": (tp + tn) / n_val if n_val else 0.0,
+        "precision": tp / (tp + fp) if tp + fp else 0.0,
+        "recall": tp / (tp + fn) if tp + fn else 0.0,
+        "n_train": n_train,
+        "n_val": n_val,
+    }
@@ -0,0 +1,189 @@
+"""Point-in-time UPS backfill over full career histories (vectorized, no lookahead)."""
+
+from __future__ import annotations
+
+import math
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from plaix.core.role_baselines import RoleBaselineTable
+from plaix.core.ups_scorer import BaselineStats, UPSScorer, classify_ups_array
+
+_NO_TEAM = ""
+_NO_POSITION = -1
+
+
+class _NoHistoryProvider:
+    """Backfill resolves fallbacks only; player history comes from the frame itself."""
+
+    def get_player_innings_history(self, player_id: str, match_format: str):
+        return []
+
+
+def backfill_ups(
+    df: pd.DataFrame,
+    *,
+    window_size: int = 10,
+    min_history: int = 5,
+    decay_lambda: float = 0.3,
+    sigma_min: float = 5.0,
+    role_baselines: Optional[RoleBaselineTable] = None,
+) -> pd.DataFrame:
+    """
+    Score every innings against only the innings that precede it for the same player/format.
+
+    Steps:
+        - Stable-sort by (player_id, match_format, date) so each group is contiguous.
+        - For lag k = 1..window_size, take the k-th previous innings within the group with one
+          shifted array per lag, and accumulate recency weights exp(-lambda * (k - 1)).
+        - Rows with fewer than `min_history` prior innings use UPSScorer fallbacks
+          (team-role/global/default, or `role_baselines` when given), resolved with the row's
+          own `team` and `batting_position` when those columns exist.
+    Work is O(rows * window_size) NumPy operations; results match `UPSScorer.score_innings`
+    (with the row's team/batting_position) evaluated with the prior innings as history.
+
+    Note:
+        `role_baselines` are aggregates over whatever data the table was built from, usually
+        the full dataset, and supply each player's latest role when a row has none. Fallback
+        rows scored with them therefore see information from after the innings; the rest of
+        the backfill stays point-in-time. Omit the table for a strictly lookahead-free result.
+
+    Returns:
+        Copy of df (original row order) with baseline_mean_runs, baseline_std_runs,
+        baseline_num_innings, baseline_source, ups_score, ups_anomaly_flag and ups_bucket.
+    """
+    runs_col = "runs_scored" if "runs_scored" in df.columns else "current_runs"
+    order_cols = ["player_id", "match_format"]
+    sort_frame = pd.DataFrame({"player_id": df["player_id"].to_numpy(), "match_format": df["match_format"].to_numpy()})
+    if "date" in df.columns:
+        sort_frame["date"] = pd.to_datetime(df["date"], errors="coerce").to_numpy()
+        order_cols.append("date")
+    order = sort_frame.sort_values(order_cols, kind="mergesort").index.to_numpy()
+
+    players = df["player_id"].to_numpy()[order]
+    formats = df["match_format"].to_numpy()[order]
+    runs = pd.to_numeric(df[runs_col], errors="coerce").fillna(0.0).to_numpy(dtype=float)[order]
+    n_rows = len(runs)
+
+    new_group = np.ones(n_rows, dtype=bool)
+    if n_rows:
+        new_group[1:] = (players[1:] != players[:-1]) | (formats[1:] != formats[:-1])
+    group_start = np.maximum.accumulate(np.where(new_group, np.arange(n_rows), 0)) if n_rows else np.zeros(0, dtype=int)
+    position = np.arange(n_rows) - group_start  # number of prior innings in the group
+    counts = np.minimum(position, window_size)
+
+    decay = [math.exp(-decay_lambda * i) for i in range(window_size)]
+
+    def lagged(k: int) -> tuple[np.ndarray, np.ndarray]:
+        """k-th previous innings in the group (0 when absent) and its recency weight."""
+        in_group = position >= k
+        values = np.zeros(n_rows)
+        values[k:] = runs[:-k]
+        return np.where(in_group, values, 0.0), np.where(in_group, decay[k - 1], 0.0)
+
+    # Lags are regenerated per pass (most recent first, as in UPSScorer) to keep memory O(rows).
+    weight_sum = np.zeros(n_rows)
+    weighted_runs = np.zeros(n_rows)
+    for k in range(1, window_size + 1):
+        values, weights = lagged(k)
+        weight_sum += weights
+        weighted_runs += values * weights
+    has_weight = weight_sum > 0
+    safe_sum = np.where(has_weight, weight_sum, 1.0)
+    mean = np.where(has_weight, weighted_runs / safe_sum, 0.0)
+    weighted_sq = np.zeros(n_rows)
+    for k in range(1, window_size + 1):
+        values, weights = lagged(k)
+        diff = values - mean
+        weighted_sq += weights * (diff * diff)
+    std = np.where(has_weight, np.sqrt(weighted_sq / safe_sum), 0.0)
+
+    eligible = counts >= min_history
+    baseline_mean = mean.copy()
+    baseline_std = np.maximum(std, sigma_min)
+    baseline_n = counts.astype(np.int64)
+    source = np.full(n_rows, "player", dtype=object)
+
+    fallback_rows = np.flatnonzero(~eligible)
+    if fallback_rows.size:
+        scorer = UPSScorer(
+            _NoHistoryProvider(),
+            window_size=window_size,
+            min_history=min_history,
+            decay_lambda=decay_lambda,
+            sigma_min=sigma_min,
+            role_baselines=role_baselines,
+        )
+        # Fallbacks depend only on (player, format, team, batting position): resolve once per
+        # distinct key and scatter. Missing roles use sentinels so the keys factorize cleanly.
+        teams, positions = _row_roles(df, order[fallback_rows])
+        codes, unique_keys = pd.factorize(
+            pd.MultiIndex.from_arrays([players[fallback_rows], formats[fallback_rows], teams, positions])
+        )
+        resolved: List[BaselineStats] = [
+            scorer._fallback_baseline(
+                player_id,
+                match_format,
+                (None if team == _NO_TEAM else team, None if position == _NO_POSITION else int(position)),
+            )
+            for player_id, match_format, team, position in unique_keys
+        ]
+        baseline_mean[fallback_rows] = np.array([b.mean_runs for b in resolved])[codes]
+        baseline_std[fallback_rows] = np.array([b.std_runs for b in resolved])[codes]
+        baseline_n[fallback_rows] = np.array([b.num_innings for b in resolved], dtype=np.int64)[codes]
+        source[fallback_rows] = np.array([b.source for b in resolved], dtype=object)[codes]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(baseline_std > 0, (runs - baseline_mean) / np.where(baseline_std > 0, baseline_std, 1.0), 0.0)
+    ups = np.minimum(np.maximum(z, 0.0), 5.0)
+    flags, buckets = classify_ups_array(ups)
+
+    out = df.copy()
+    restore = np.empty(n_rows, dtype=np.int64)
+    restore[order] = np.arange(n_rows)
+    out["baseline_mean_runs"] = baseline_mean[restore]
+    out["baseline_std_runs"] = baseline_std[restore]
+    out["baseline_num_innings"] = baseline_n[restore]
+    out["baseline_source"] = source[restore]
+    out["ups_score"] = ups[restore]
+    out["ups_anomaly_flag"] = flags[restore]
+    out["ups_bucket"] = buckets[restore]
+    return out
+
+
+def _row_roles(df: pd.DataFrame, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(team, batting_position) of `rows`, as in the scoring API; missing values become sentinels."""
+    n_rows = len(rows)
+    teams = np.full(n_rows, _NO_TEAM, dtype=object)
+    if "team" in df.columns:
+        values = df["team"].to_numpy(dtype=object)[rows]
+        present = ~pd.isna(values)
+        teams[present] = [str(team) for team in values[present]]
+    positions = np.full(n_rows, _NO_POSITION, dtype=np.int64)
+    if "batting_position" in df.columns:
+        values = pd.to_numeric(df["batting_position"], errors="coerce").to_numpy(dtype=float)[rows]
+        present = ~np.isnan(values)
+        positions[present] = values[present].astype(np.int64)
+    return teams, positions
+
+
+def write_backfill(df: pd.DataFrame, path: str | Path) -> Path:
+    """
+    Write backfill output; `.parquet` uses the columnar format, anything else CSV.
+
+    Written to a temporary file and renamed into place, so readers polling the path (the
+    live feed) never see a partial file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    if path.suffix == ".parquet":
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
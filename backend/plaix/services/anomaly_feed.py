@@ -2,24 +2,27 @@
 
 from __future__ import annotations
 
-import math
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List
+from typing import Any, List, Mapping
 
 import pandas as pd
 from fastapi import HTTPException
 
-from llm.anomaly_narrator import AnomalyEvent, AnomalyNarrator
-from llm.factory import get_llm_client_from_env
+from llm.anomaly_narrator import AnomalyEvent
+from llm.factory import get_narrator_from_env
+from plaix.services.feed_snapshot import ALL_FORMATS, FeedSnapshot, decode_cursor, encode_cursor
+from plaix.services.feed_store import read_feed_file
 
 
 DATA_CANDIDATES = [
+    Path("data/processed/per_innings_with_ups.arrow"),
+    Path("data/processed/per_innings_with_ups.parquet"),
     Path("data/processed/per_innings_with_ups.csv"),
     Path("data/synthetic_ups_dataset.csv"),
 ]
 
-_NARRATOR = AnomalyNarrator(get_llm_client_from_env())
+_NARRATOR = get_narrator_from_env()
 
 
 def _build_demo_dataset() -> pd.DataFrame:
@@ -65,36 +68,42 @@ def _build_demo_dataset() -> pd.DataFrame:
     return pd.DataFrame.from_records(records)
 
 
-def load_feed_dataset() -> pd.DataFrame:
-    """Load feed dataset, with demo fallback."""
+def feed_source() -> Path | None:
+    """The candidate `load_feed_dataset(strict=True)` reads: the first that exists, if any."""
+    return next((path for path in DATA_CANDIDATES if path.exists()), None)
+
+
+def load_feed_dataset(strict: bool = False) -> pd.DataFrame:
+    """
+    Load feed dataset, with demo fallback.
+
+    The memory-mapped Arrow store (see scripts/build_feed_store.py) is preferred over Parquet
+    and CSV. By default the first readable candidate wins and unreadable ones are skipped.
+    With `strict=True` (live rebuilds), only `feed_source()` is read and its errors propagate,
+    so a half-written file fails the rebuild instead of swapping in a lower-priority file or
+    the demo data; the demo data is used only when no candidate exists.
+    """
+    if strict:
+        source = feed_source()
+        return read_feed_file(source) if source is not None else _build_demo_dataset()
     for path in DATA_CANDIDATES:
         if path.exists():
             try:
-                df = pd.read_csv(path)
+                return read_feed_file(path)
             except Exception:
                 continue
-            if "player_id" not in df.columns and "player_name" in df.columns:
-                df = df.rename(columns={"player_name": "player_id"})
-            if "current_runs" not in df.columns and "runs_scored" in df.columns:
-                df = df.rename(columns={"runs_scored": "current_runs"})
-            if "date" in df.columns:
-                df["date"] = df["date"].astype(str)
-            else:
-                df["date"] = ""
-            return df
     return _build_demo_dataset()
 
 
-def _combined_score(row: pd.Series) -> float:
-    """Compute combined severity using UPS and model probability when available."""
-    ups = row.get("ups_score", 0.0) or 0.0
-    prob = row.get("model_anomaly_probability", math.nan)
-    if pd.notna(prob):
-        return 0.7 * ups + 0.3 * (prob * 5.0)
-    return ups
+MAX_PAGE_SIZE = 100
+
+
+def to_json_record(record: Mapping[str, Any]) -> dict:
+    """Copy of a feed record with NaN floats (missing values) replaced by None for JSON."""
+    return {key: None if isinstance(value, float) and value != value else value for key, value in record.items()}
 
 
-def _build_headline(row: pd.Series) -> str:
+def _build_headline(row: Mapping[str, Any]) -> str:
     """Rule-based sports headline."""
     player = row.get("player_id", "Player")
     fmt = row.get("match_format", "T20")
@@ -109,7 +118,7 @@ def _build_headline(row: pd.Series) -> str:
     return f"Featured anomaly: {player} posts {runs} in {fmt}"
 
 
-def _build_key_drivers(row: pd.Series) -> List[str]:
+def _build_key_drivers(row: Mapping[str, Any]) -> List[str]:
     """Rule-based bullets describing drivers."""
     drivers: List[str] = []
     ups = row.get("ups_score", None)
@@ -142,47 +151,59 @@ def _build_key_drivers(row: pd.Series) -> List[str]:
     return drivers[:3]
 
 
-def list_feed_items(df: pd.DataFrame, match_format: str = "ALL", min_ups: float = 0.0, min_prob: float = 0.0, limit: int = 25, sort: str = "combined") -> List[dict]:
-    """Filter and rank feed items."""
-    data = df.copy()
-    if match_format and match_format != "ALL":
-        data = data[data["match_format"] == match_format]
-    if "ups_score" in data.columns:
-        data = data[data["ups_score"] >= min_ups]
-    if "model_anomaly_probability" in data.columns and not data["model_anomaly_probability"].isna().all():
-        data = data[data["model_anomaly_probability"].fillna(0) >= min_prob]
-
-    if data.empty:
-        return []
-
-    data["combined_score"] = data.apply(_combined_score, axis=1)
-    sort_col = "combined_score" if sort == "combined" and "combined_score" in data.columns else "ups_score"
-    data = data.sort_values(sort_col, ascending=False).head(min(limit, 100))
-
-    items = []
-    for _, row in data.iterrows():
-        event_id = f"{row.get('player_id', 'player')}-{row.get('date', '')}-{row.get('match_format', 'T20')}"
-        item = row.to_dict()
-        item["event_id"] = event_id
-        item["headline"] = _build_headline(row)
-        item["key_drivers"] = _build_key_drivers(row)
-        items.append(item)
-    return items
-
-
-def get_event_detail(df: pd.DataFrame, event_id: str) -> pd.Series:
-    """Retrieve event by id."""
-    matches = df.apply(
-        lambda r: f"{r.get('player_id', '')}-{r.get('date', '')}-{r.get('match_format', '')}" == event_id, axis=1
-    )
-    if not matches.any():
+def list_feed_items(snapshot: FeedSnapshot, match_format: str = "ALL", min_ups: float = 0.0, min_prob: float = 0.0, limit: int = 25, sort: str = "combined") -> List[dict]:
+    """Filter and rank feed items (first page only; see `list_feed_page`)."""
+    return list_feed_page(snapshot, match_format, min_ups, min_prob, limit, sort)["items"]
+
+
+def list_feed_page(
+    snapshot: FeedSnapshot,
+    match_format: str = "ALL",
+    min_ups: float = 0.0,
+    min_prob: float = 0.0,
+    limit: int = 25,
+    sort: str = "combined",
+    cursor: str | None = None,
+) -> dict:
+    """
+    One page of ranked feed items plus `next_cursor` (None on the last page).
+
+    Pages hold at most MAX_PAGE_SIZE items. Cursors encode the last item's sort key and
+    event id, so a page costs the same wherever it is in the feed and cursors stay valid
+    across feed reloads. Reuse a cursor with the filters it was issued under.
+    """
+    match_format = match_format or ALL_FORMATS
+    sort = "combined" if sort == "combined" else "ups"
+    limit = max(0, min(limit, MAX_PAGE_SIZE))
+    try:
+        after = decode_cursor(cursor, match_format, sort) if cursor else None
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    positions = snapshot.top(match_format, sort=sort, min_ups=min_ups, min_prob=min_prob, limit=limit + 1, after=after)
+    next_cursor = None
+    if len(positions) > limit and limit > 0:
+        last = positions[limit - 1]
+        next_cursor = encode_cursor(match_format, sort, snapshot.sort_key_value(sort, last), snapshot.event_ids[last])
+    positions = positions[:limit]
+    items = [to_json_record(record) for record in snapshot.df.iloc[positions].to_dict("records")]
+    for position, item in zip(positions, items):
+        item["event_id"] = snapshot.event_ids[position]
+        item["headline"] = _build_headline(item)
+        item["key_drivers"] = _build_key_drivers(item)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def get_event_detail(snapshot: FeedSnapshot, event_id: str) -> pd.Series:
+    """Retrieve event by id (O(1) via the snapshot index)."""
+    row = snapshot.row(event_id)
+    if row is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    return df[matches].iloc[0]
+    return row
 
 
-def narrate_event(row: pd.Series, tone: str = "commentator") -> dict:
-    """Generate narrative for an event row."""
-    event = AnomalyEvent(
+def _row_event(row: Mapping[str, Any]) -> AnomalyEvent:
+    """Build the narration event for a feed row (Series or item dict)."""
+    return AnomalyEvent(
         player_id=row.get("player_id", "unknown"),
         match_format=row.get("match_format", "T20"),
         team=None,
@@ -198,4 +219,16 @@ def narrate_event(row: pd.Series, tone: str = "commentator") -> dict:
         model_anomaly_label=row.get("model_anomaly_label", 0),
         match_context={},
     )
-    return _NARRATOR.generate_description(event, tone=tone or "commentator")
+
+
+def narrate_event(row: pd.Series, tone: str = "commentator") -> dict:
+    """Generate narrative for an event row."""
+    return _NARRATOR.generate_description(_row_event(row), tone=tone or "commentator")
+
+
+def narrate_items(items: List[dict], tone: str = "commentator") -> List[dict]:
+    """Attach narratives to feed items in place, issuing the LLM calls in parallel."""
+    narratives = _NARRATOR.generate_descriptions([_row_event(item) for item in items], [tone or "commentator"] * len(items))
+    for item, narrative in zip(items, narratives):
+        item.update(narrative)
+    return items
@@ -0,0 +1,214 @@
+"""Live-reloading anomaly feed: background rebuilds with atomic snapshot swaps."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from plaix.services.feed_snapshot import FeedSnapshot, build_event_ids
+from plaix.services.feed_store import FeedRow, normalize_feed_frame
+from plaix.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FileSignature = Optional[Tuple[str, int, int]]  # (path, mtime_ns, size) of the first existing file
+
+MAX_RETRY_SECONDS = 300.0
+
+
+def _ids_in(frame: pd.DataFrame, event_ids: set) -> np.ndarray:
+    """Boolean mask of rows whose event id is in `event_ids`."""
+    return np.fromiter((event_id in event_ids for event_id in build_event_ids(frame)), dtype=bool, count=len(frame))
+
+
+class FeedManager:
+    """
+    Owns the current FeedSnapshot and rebuilds it off the request path.
+
+    Notes:
+        - `current()` never blocks on a rebuild: it returns the live snapshot and, at most every
+          `poll_seconds`, checks the watched files' mtime/size. `watch_paths` are in priority
+          order and only the first existing one (the file `load` reads) is compared, so changes
+          to lower-priority files do not trigger rebuilds; a change to it, or a different file
+          becoming first, schedules a rebuild.
+        - `load` should raise on unreadable files rather than fall back, so the retry below
+          applies; `initial` optionally supplies the first snapshot's rows (e.g. from a lenient
+          loader at startup) instead of calling `load`.
+        - `append(rows)` queues newly scored rows; they are merged into the next snapshot. Rows
+          whose event id is already in the loaded files are dropped (the files win), and
+          appended rows survive file reloads otherwise.
+        - Rebuilds run on one background thread; work that arrives meanwhile is coalesced into
+          one more pass. Each result is swapped in with a single reference assignment, so a
+          request sees either the old or the new snapshot, never a partial one. A failed
+          rebuild is logged and the previous snapshot keeps serving; its work stays queued and
+          is retried by a later `poll()` (or `append()`), backing off from `poll_seconds` up to
+          `MAX_RETRY_SECONDS` while failures continue.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], pd.DataFrame],
+        watch_paths: Sequence[str | Path] = (),
+        poll_seconds: float = 5.0,
+        initial: Optional[pd.DataFrame] = None,
+    ) -> None:
+        self._load = load
+        self.watch_paths = [Path(p) for p in watch_paths]
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._worker: Optional[threading.Thread] = None
+        self._reload_pending = False
+        self._appended: List[pd.DataFrame] = []
+        self._appended_pending = False
+        self._next_poll = time.monotonic() + poll_seconds
+        self._retry_at = 0.0
+        self._failures = 0
+        self.version = 0
+        self.rebuilds = 0
+        self.rebuild_errors = 0
+        self.last_rebuild_seconds = 0.0
+        self._signature = self._file_signature()
+        self._base = load() if initial is None else initial
+        self._snapshot = FeedSnapshot.build(self._base)
+        self._base_ids = set(self._snapshot.event_ids)
+
+    @property
+    def snapshot(self) -> FeedSnapshot:
+        """The snapshot currently being served (no polling)."""
+        return self._snapshot
+
+    def current(self) -> FeedSnapshot:
+        """Poll for file changes (throttled) and return the live snapshot without waiting."""
+        self.poll()
+        return self._snapshot
+
+    def poll(self, force: bool = False) -> bool:
+        """
+        Schedule a reload if a watched file changed, or retry work left by a failed rebuild once
+        its backoff has passed (`force` skips both the poll throttle and the backoff). Returns
+        True when a rebuild was scheduled.
+        """
+        now = time.monotonic()
+        if not force and now < self._next_poll:
+            return False
+        self._next_poll = now + self.poll_seconds
+        signature = self._file_signature()
+        with self._lock:
+            if signature != self._signature:
+                self._signature = signature
+                self._reload_pending = True
+            elif not (self._reload_pending or self._appended_pending) or (not force and now < self._retry_at):
+                return False
+            self._ensure_worker()
+        return True
+
+    def append(self, rows: Sequence[FeedRow | Dict]) -> int:
+        """
+        Queue rows for the next snapshot; returns how many were queued.
+
+        Raises:
+            pydantic.ValidationError: if any row does not match `FeedRow` (nothing is queued).
+        """
+        if not rows:
+            return 0
+        validated = [FeedRow.model_validate(row) for row in rows]
+        frame = normalize_feed_frame(pd.DataFrame.from_records([row.model_dump() for row in validated]))
+        with self._lock:
+            self._appended.append(frame)
+            self._appended_pending = True
+            self._ensure_worker()
+        return len(frame)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued rebuilds finish (for scripts and tests). Returns False on timeout."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._worker is None, timeout=timeout)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            appended = sum(len(frame) for frame in self._appended)
+            rebuilding = self._worker is not None
+        return {
+            "rows": len(self._snapshot),
+            "version": self.version,
+            "appended_rows": appended,
+            "rebuilding": int(rebuilding),
+            "rebuilds": self.rebuilds,
+            "rebuild_errors": self.rebuild_errors,
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+        }
+
+    def _ensure_worker(self) -> None:
+        """Start the rebuild thread if it is not running (lock must be held)."""
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="feed-rebuild", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not (self._reload_pending or self._appended_pending):
+                    self._worker = None
+                    self._idle.notify_all()
+                    return
+                reload, self._reload_pending = self._reload_pending, False
+                self._appended_pending = False
+                appended = list(self._appended)
+            started = time.perf_counter()
+            try:
+                if reload:
+                    base = self._load()
+                    base_ids = set(build_event_ids(base))
+                else:
+                    base, base_ids = self._base, self._base_ids
+                appended = [frame[~_ids_in(frame, base_ids)] for frame in appended]
+                snapshot = FeedSnapshot.build(self._merge(base, appended))
+            except Exception:
+                with self._lock:
+                    # Requeue the work; the worker stops so a broken file is not retried in a loop.
+                    self._reload_pending = self._reload_pending or reload
+                    self._appended_pending = self._appended_pending or bool(self._appended)
+                    self._failures += 1
+                    backoff = min(self.poll_seconds * 2 ** (self._failures - 1), MAX_RETRY_SECONDS)
+                    self._retry_at = time.monotonic() + backoff
+                    self.rebuild_errors += 1
+                    self._worker = None
+                    self._idle.notify_all()
+                logger.exception("Feed rebuild failed; keeping snapshot version %d, retrying in %.0fs", self.version, backoff)
+                return
+            with self._lock:
+                self._failures = 0
+                # Forget appended rows the files now contain; keep rows appended since we started.
+                self._appended = [frame for frame in appended if not frame.empty] + self._appended[len(appended) :]
+            self._base, self._base_ids = base, base_ids
+            self._snapshot = snapshot
+            self.version += 1
+            self.rebuilds += 1
+            self.last_rebuild_seconds = time.perf_counter() - started
+            logger.info("Feed snapshot %d: %d rows (%.2fs)", self.version, len(snapshot), self.last_rebuild_seconds)
+
+    @staticmethod
+    def _merge(base: pd.DataFrame, appended: List[pd.DataFrame]) -> pd.DataFrame:
+        """Base rows plus appended rows; a later append of the same event replaces an earlier one."""
+        frames = [frame for frame in appended if not frame.empty]
+        if not frames:
+            return base
+        extra = pd.concat(frames, ignore_index=True)
+        extra = extra[~pd.Series(build_event_ids(extra)).duplicated(keep="last").to_numpy()]
+        return pd.concat([base, extra], ignore_index=True)
+
+    def _file_signature(self) -> FileSignature:
+        for path in self.watch_paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            return str(path), stat.st_mtime_ns, stat.st_size
+        return None
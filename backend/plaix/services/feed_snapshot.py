@@ -0,0 +1,239 @@
+"""Immutable, indexed view of the anomaly feed dataset."""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import json
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from plaix.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Defaults used when an id column is missing, matching the ids clients see in the feed.
+_EVENT_ID_PARTS = (("player_id", "player"), ("date", ""), ("match_format", "T20"))
+
+ALL_FORMATS = "ALL"
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def build_event_ids(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized f"{player_id}-{date}-{match_format}" for every row."""
+    parts = [
+        df[column].astype(str) if column in df.columns else pd.Series(default, index=df.index)
+        for column, default in _EVENT_ID_PARTS
+    ]
+    return (parts[0] + "-" + parts[1] + "-" + parts[2]).to_numpy(dtype=object)
+
+
+def combined_scores(df: pd.DataFrame) -> np.ndarray:
+    """Severity blending UPS with model probability (0.7 * ups + 1.5 * prob) where a probability exists."""
+    ups = _float_column(df, "ups_score", 0.0)
+    prob = _float_column(df, "model_anomaly_probability", np.nan)
+    return np.where(np.isnan(prob), ups, 0.7 * ups + 0.3 * (prob * 5.0))
+
+
+def _float_column(df: pd.DataFrame, column: str, default: float) -> np.ndarray:
+    if column not in df.columns:
+        return np.full(len(df), default)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+
+@dataclass(frozen=True, eq=False)
+class RankedView:
+    """Row positions sorted by key descending (event id ascending on ties; NaN keys last)."""
+
+    positions: np.ndarray
+    neg_keys: np.ndarray  # -key in position order, ascending, for searchsorted threshold cuts
+
+    def cut(self, min_key: float) -> int:
+        """Length of the prefix of the view whose key is >= min_key."""
+        return int(np.searchsorted(self.neg_keys, -min_key, side="right"))
+
+    def start_after(self, key: float, event_id: str, event_ids: np.ndarray) -> int:
+        """
+        Index of the first entry ranked after (key, event_id), which need not be in the view.
+
+        Binary searches the key, then the event id within the tie group, so resuming is
+        O(log n) and still works after rows are added or removed.
+        """
+        lo = int(np.searchsorted(self.neg_keys, -key, side="left"))
+        hi = int(np.searchsorted(self.neg_keys, -key, side="right"))
+        return bisect.bisect_right(self.positions, event_id, lo=lo, hi=hi, key=lambda position: event_ids[position])
+
+
+@dataclass(frozen=True, eq=False)
+class FeedSnapshot:
+    """
+    Feed rows plus an event_id -> row-position index, built once per load.
+
+    Notes:
+        - Treat `df` as read-only: snapshots are shared between concurrent requests.
+        - Duplicate event ids resolve to their first row (as the old scan did); they are
+          logged and listed in `duplicate_event_ids`, or rejected with `strict=True`.
+        - `combined_score` is added as a column and the rows are presorted per match format
+          (plus "ALL") by combined and UPS score, so `top` is a threshold cut plus a top-k scan
+          with no copy or sort per request.
+    """
+
+    df: pd.DataFrame
+    event_ids: np.ndarray
+    positions: Dict[str, int]
+    duplicate_event_ids: Tuple[str, ...]
+    views: Dict[Tuple[str, str], RankedView]
+    ups: np.ndarray
+    probs: np.ndarray  # missing probabilities as 0
+    has_ups: bool
+    has_probs: bool
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, strict: bool = False) -> "FeedSnapshot":
+        if df.index.equals(pd.RangeIndex(len(df))):
+            df = df.copy(deep=False)  # keep memory-mapped column buffers shared, not copied
+        else:
+            df = df.reset_index(drop=True)
+        df["combined_score"] = combined_scores(df)
+        event_ids = build_event_ids(df)
+        duplicated = pd.Series(event_ids).duplicated(keep="first").to_numpy()
+        duplicates = tuple(dict.fromkeys(event_ids[duplicated]))
+        if duplicates:
+            if strict:
+                raise ValueError(f"{len(duplicates)} duplicate feed event ids, e.g. {list(duplicates[:5])}")
+            logger.warning("Feed has %d duplicate event ids; keeping first rows (e.g. %s)", len(duplicates), duplicates[:5])
+        keep = np.flatnonzero(~duplicated)
+        positions = dict(zip(event_ids[keep], keep.tolist()))
+        ups = _float_column(df, "ups_score", 0.0)
+        probs = _float_column(df, "model_anomaly_probability", np.nan)
+        return cls(
+            df=df,
+            event_ids=event_ids,
+            positions=positions,
+            duplicate_event_ids=duplicates,
+            views=_build_views(df, event_ids, {"combined": df["combined_score"].to_numpy(dtype=float), "ups": ups}),
+            ups=ups,
+            probs=np.nan_to_num(probs, nan=0.0),
+            has_ups="ups_score" in df.columns,
+            has_probs=bool(len(probs)) and not np.isnan(probs).all(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def position(self, event_id: str) -> Optional[int]:
+        """Row position for an event id, or None."""
+        return self.positions.get(event_id)
+
+    def row(self, event_id: str) -> Optional[pd.Series]:
+        """Feed row for an event id, or None."""
+        position = self.positions.get(event_id)
+        return None if position is None else self.df.iloc[position]
+
+    def top(
+        self,
+        match_format: str = ALL_FORMATS,
+        sort: str = "combined",
+        min_ups: float = 0.0,
+        min_prob: float = 0.0,
+        limit: int = 25,
+        after: Optional[Tuple[float, str]] = None,
+    ) -> np.ndarray:
+        """
+        Positions of the `limit` highest-ranked rows passing the filters.
+
+        With `after=(sort key, event_id)` (see `decode_cursor`), ranking resumes just past that
+        entry, so pages can be walked with no offset scan.
+
+        Rows need ups_score >= min_ups (when the column exists) and model probability
+        >= min_prob (missing probabilities count as 0; skipped if the column is absent or
+        empty). Sorting by "ups" turns the UPS filter into a binary-search cut; remaining
+        filters are applied to growing slices of the presorted view until `limit` rows pass.
+        """
+        sort_key = "combined" if sort == "combined" else "ups"
+        view = self.views.get((match_format or ALL_FORMATS, sort_key))
+        if view is None or limit <= 0:
+            return _EMPTY
+        filters = []
+        start = view.start_after(after[0], after[1], self.event_ids) if after is not None else 0
+        if sort_key == "ups" and self.has_ups:
+            candidates = view.positions[start : max(start, view.cut(min_ups))]
+        else:
+            candidates = view.positions[start:]
+            if self.has_ups:
+                filters.append(lambda rows: self.ups[rows] >= min_ups)
+        if self.has_probs:
+            filters.append(lambda rows: self.probs[rows] >= min_prob)
+        return _take(candidates, filters, limit)
+
+    def sort_key_value(self, sort: str, position: int) -> float:
+        """Value of the sort key ("combined" or "ups") for a row."""
+        if sort == "combined":
+            return float(self.df["combined_score"].iat[position])
+        return float(self.ups[position])
+
+
+def encode_cursor(match_format: str, sort: str, key: float, event_id: str) -> str:
+    """Opaque, URL-safe cursor for the entry (key, event_id) of a ranked view."""
+    payload = json.dumps({"f": match_format, "s": sort, "k": key, "id": event_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, match_format: str, sort: str) -> Tuple[float, str]:
+    """
+    Return (key, event_id) from a cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed or was issued for another format or sort.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        key, event_id = float(data["k"]), str(data["id"])
+        issued_for = (data["f"], data["s"])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if issued_for != (match_format, sort):
+        raise ValueError("Cursor was issued for a different format or sort")
+    return key, event_id
+
+
+def _build_views(df: pd.DataFrame, event_ids: np.ndarray, keys: Dict[str, np.ndarray]) -> Dict[Tuple[str, str], RankedView]:
+    """Presort row positions per (format, sort key), including the ALL format."""
+    # Rank event ids once (fixed-width strings sort much faster than objects) so each view is
+    # a numeric lexsort: key descending, then event id ascending.
+    id_rank = np.empty(len(event_ids), dtype=np.int64)
+    id_rank[np.argsort(event_ids.astype(str), kind="stable")] = np.arange(len(event_ids))
+    formats = df["match_format"].astype(str) if "match_format" in df.columns else pd.Series("T20", index=df.index)
+    codes, labels = pd.factorize(formats)
+    views: Dict[Tuple[str, str], RankedView] = {}
+    for sort_key, key in keys.items():
+        order = np.lexsort((id_rank, -key))
+        views[(ALL_FORMATS, sort_key)] = RankedView(order, -key[order])
+        order_codes = codes[order]
+        for code, fmt in enumerate(labels):
+            subset = order[order_codes == code]
+            views[(str(fmt), sort_key)] = RankedView(subset, -key[subset])
+    return views
+
+
+def _take(candidates: np.ndarray, filters: list[Callable[[np.ndarray], np.ndarray]], limit: int) -> np.ndarray:
+    """First `limit` candidates passing every filter, scanning in doubling chunks."""
+    if not filters:
+        return candidates[:limit]
+    kept = []
+    found = 0
+    start = 0
+    step = max(2 * limit, 256)
+    while start < len(candidates) and found < limit:
+        chunk = candidates[start : start + step]
+        mask = np.ones(len(chunk), dtype=bool)
+        for keep in filters:
+            mask &= keep(chunk)
+        kept.append(chunk[mask])
+        found += int(mask.sum())
+        start += step
+        step *= 2
+    return np.concatenate(kept)[:limit] if kept else _EMPTY
@@ -0,0 +1,165 @@
+"""Columnar, memory-mappable storage for the anomaly feed dataset."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Sequence
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+from pydantic import BaseModel, ConfigDict
+
+# Columns the feed serves; anything else in a source file is never materialized.
+FEED_COLUMNS = (
+    "player_id",
+    "match_format",
+    "date",
+    "team",
+    "opposition",
+    "venue",
+    "current_runs",
+    "baseline_mean_runs",
+    "baseline_std_runs",
+    "ups_score",
+    "ups_bucket",
+    "ups_anomaly_flag",
+    "ups_anomaly_flag_baseline",
+    "model_anomaly_probability",
+    "model_anomaly_label",
+    "venue_flatness",
+    "opposition_strength",
+    "batting_position",
+)
+NUMERIC_FEED_COLUMNS = (
+    "current_runs",
+    "baseline_mean_runs",
+    "baseline_std_runs",
+    "ups_score",
+    "ups_anomaly_flag",
+    "ups_anomaly_flag_baseline",
+    "model_anomaly_probability",
+    "model_anomaly_label",
+    "venue_flatness",
+    "opposition_strength",
+    "batting_position",
+)
+# Source column names accepted in place of feed column names.
+COLUMN_ALIASES = {"player_name": "player_id", "runs_scored": "current_runs"}
+
+ARROW_SUFFIXES = (".arrow", ".feather")
+
+
+class FeedRow(BaseModel):
+    """One feed row, e.g. a newly scored innings appended to the live feed."""
+
+    model_config = ConfigDict(extra="ignore")
+
+    player_id: str
+    match_format: str
+    date: str
+    team: str | None = None
+    opposition: str | None = None
+    venue: str | None = None
+    current_runs: float | None = None
+    baseline_mean_runs: float | None = None
+    baseline_std_runs: float | None = None
+    ups_score: float | None = None
+    ups_bucket: str | None = None
+    ups_anomaly_flag: int | None = None
+    ups_anomaly_flag_baseline: int | None = None
+    model_anomaly_probability: float | None = None
+    model_anomaly_label: int | None = None
+    venue_flatness: float | None = None
+    opposition_strength: float | None = None
+    batting_position: int | None = None
+
+
+def normalize_feed_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Apply column aliases, make `date` a string column (empty if missing) and coerce numeric
+    feed columns to numbers (unparseable values become NaN).
+    """
+    renames = {src: dst for src, dst in COLUMN_ALIASES.items() if src in df.columns and dst not in df.columns}
+    if renames:
+        df = df.rename(columns=renames)
+    for column in NUMERIC_FEED_COLUMNS:
+        if column in df.columns and not is_numeric_dtype(df[column]):
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    if "date" in df.columns:
+        df["date"] = df["date"].astype(str)
+    else:
+        df["date"] = ""
+    return df
+
+
+def _wanted(columns: Sequence[str] | None) -> set[str] | None:
+    if columns is None:
+        return None
+    wanted = set(columns)
+    wanted.update(src for src, dst in COLUMN_ALIASES.items() if dst in wanted)
+    return wanted
+
+
+def read_feed_csv(path: str | Path, columns: Sequence[str] | None = FEED_COLUMNS) -> pd.DataFrame:
+    """Parse a feed CSV, reading only `columns` (plus their aliases); None reads everything."""
+    wanted = _wanted(columns)
+    usecols = None if wanted is None else (lambda column: column in wanted)
+    return normalize_feed_frame(pd.read_csv(path, usecols=usecols))
+
+
+def read_feed_parquet(path: str | Path, columns: Sequence[str] | None = FEED_COLUMNS) -> pd.DataFrame:
+    """Read a feed Parquet file, decoding only `columns` (plus their aliases)."""
+    import pyarrow.parquet as pq
+
+    wanted = _wanted(columns)
+    present = pq.read_schema(path).names
+    selected = present if wanted is None else [c for c in present if c in wanted]
+    return normalize_feed_frame(pd.read_parquet(path, columns=selected))
+
+
+def read_feed_arrow(path: str | Path, columns: Sequence[str] | None = FEED_COLUMNS) -> pd.DataFrame:
+    """
+    Memory-map an Arrow IPC (Feather v2) feed file and materialize only `columns`.
+
+    Nothing is parsed: unselected columns are never touched, and null-free numeric columns
+    are converted zero-copy, so they stay backed by the page cache shared with every other
+    process mapping the same file. String columns still become Python objects.
+    """
+    import pyarrow as pa
+
+    wanted = _wanted(columns)
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    if wanted is not None:
+        table = table.select([c for c in table.column_names if c in wanted])
+    return normalize_feed_frame(table.to_pandas(split_blocks=True))
+
+
+def read_feed_file(path: str | Path, columns: Sequence[str] | None = FEED_COLUMNS) -> pd.DataFrame:
+    """Read a feed file by suffix: Arrow IPC (.arrow/.feather), Parquet, else CSV."""
+    suffix = Path(path).suffix
+    if suffix in ARROW_SUFFIXES:
+        return read_feed_arrow(path, columns)
+    if suffix == ".parquet":
+        return read_feed_parquet(path, columns)
+    return read_feed_csv(path, columns)
+
+
+def write_feed_arrow(df: pd.DataFrame, path: str | Path) -> Path:
+    """
+    Write a feed frame as an uncompressed Arrow IPC file (compression would defeat mmap).
+
+    The file is written next to `path` and renamed into place, so readers never map a
+    partially written file.
+    """
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(normalize_feed_frame(df.copy()), preserve_index=False)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
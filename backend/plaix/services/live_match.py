@@ -10,8 +10,8 @@ from typing import Dict, List
 from fastapi import HTTPException
 
 from plaix.api.inference import InferenceService
-from llm.anomaly_narrator import AnomalyEvent, AnomalyNarrator
-from llm.factory import get_llm_client_from_env
+from llm.anomaly_narrator import AnomalyEvent
+from llm.factory import get_narrator_from_env
 
 
 @dataclass
@@ -22,7 +22,7 @@ class LiveSession:
 
 _sessions: Dict[str, LiveSession] = {}
 _inference = InferenceService(model_path="models/ups_logreg.pkl")
-_narrator = AnomalyNarrator(get_llm_client_from_env())
+_narrator = get_narrator_from_env()
 
 
 def generate_innings_stream(seed: int, overs: int = 20, scenario: str = "normal") -> List[dict]:
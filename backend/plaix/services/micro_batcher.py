@@ -0,0 +1,154 @@
+"""Micro-batching of concurrent single-record predictions."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from plaix.utils.metrics import Histogram
+
+_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+
+class MicroBatcher:
+    """
+    Hold concurrent requests briefly and score them with one batch call.
+
+    A batch is dispatched when `max_batch_size` requests are pending or `max_wait_ms` has
+    passed since the first one arrived, whichever comes first. `process_batch` runs in a worker
+    thread and must return one result per item, in order; results are fanned back out to the
+    awaiting callers. Up to `max_in_flight` batches run at once while the next one is being
+    collected; when all slots are busy, requests keep queueing and form larger batches. If a
+    batch fails, its items are retried individually (concurrently) so a single bad record
+    only fails its own request.
+
+    Queue depth (seen by each arriving request) and dispatched batch sizes are recorded as
+    histograms; see `stats()`.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        *,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        max_in_flight: int = 4,
+    ) -> None:
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be positive")
+        if max_in_flight <= 0:
+            raise ValueError("max_in_flight must be positive")
+        self.process_batch = process_batch
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue_depth = Histogram(_SIZE_BUCKETS)
+        self.batch_size = Histogram(_SIZE_BUCKETS)
+        self._pending: Deque[Tuple[Any, asyncio.Future]] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._has_items: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its result."""
+        self._ensure_worker()
+        assert self._has_items is not None and self._batch_full is not None
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        self.queue_depth.observe(len(self._pending))
+        self._has_items.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_full.set()
+        return await future
+
+    async def close(self) -> None:
+        """Stop the worker and in-flight batches; pending requests are cancelled."""
+        tasks = [task for task in (self._worker, *self._in_flight) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._in_flight.clear()
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._worker = None
+
+    def stats(self) -> Dict[str, float]:
+        """Flat metrics: pending and in-flight batch counts plus queue-depth and batch-size histograms."""
+        metrics: Dict[str, float] = {"pending": len(self._pending), "in_flight": len(self._in_flight)}
+        metrics.update({f"queue_depth_{k}": v for k, v in self.queue_depth.snapshot().items()})
+        metrics.update({f"batch_size_{k}": v for k, v in self.batch_size.snapshot().items()})
+        return metrics
+
+    def _ensure_worker(self) -> None:
+        """Start the worker on the running loop (restarting it if the loop changed)."""
+        loop = asyncio.get_running_loop()
+        if self._worker is not None and self._loop is loop and not self._worker.done():
+            return
+        self._loop = loop
+        self._pending.clear()
+        self._has_items = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._in_flight = set()
+        self._worker = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        assert self._has_items is not None and self._batch_full is not None and self._slots is not None
+        loop = asyncio.get_running_loop()
+        slots, in_flight = self._slots, self._in_flight
+        while True:
+            await slots.acquire()
+            await self._has_items.wait()
+            deadline = loop.time() + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            batch = [self._pending.popleft() for _ in range(min(self.max_batch_size, len(self._pending)))]
+            if not self._pending:
+                self._has_items.clear()
+                self._batch_full.clear()
+            self.batch_size.observe(len(batch))
+            task = loop.create_task(self._dispatch(batch))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await asyncio.to_thread(self.process_batch, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"process_batch returned {len(results)} results for {len(items)} items")
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:
+            if len(batch) == 1:
+                _resolve(batch[0][1], exception=exc)
+                return
+            await asyncio.gather(*(self._dispatch([entry]) for entry in batch))
+            return
+        for (_, future), result in zip(batch, results):
+            _resolve(future, result=result)
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exception: Optional[BaseException] = None) -> None:
+    """Complete a caller's future unless it was cancelled (e.g. client disconnected)."""
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
@@ -0,0 +1,198 @@
+"""Background narration so scoring latency is not bound to the LLM."""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from llm.anomaly_narrator import AnomalyEvent
+from llm.narration_cache import NarrationCache
+from plaix.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+NarrateFn = Callable[[AnomalyEvent, str], Dict[str, Any]]
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+_STORE_POLL_SECONDS = 0.1
+
+
+class NarrationWorker:
+    """
+    Runs narrations on a thread pool and hands out ids to fetch them later.
+
+    Notes:
+        - `submit` returns immediately with a narration id; `get` returns the current status and,
+          once done, the narrative fields. `get(..., wait=seconds)` long-polls until the narration
+          is ready, so a client can be pushed the result without busy polling.
+        - At most `max_jobs` narrations are retained; the oldest are forgotten first.
+        - Worker threads start lazily on the first submission (and again after `shutdown`).
+        - Without a persistent `store`, ids are only known to the process that issued them, so
+          a deployment running several server processes must pass a `NarrationCache` backed by
+          a SQLite file shared by all of them (NARRATION_CACHE_PATH). Job status is then
+          written there and `get` answers for ids issued by any process.
+        - Store writes run on one dedicated thread, in submission order, so `submit` never
+          blocks on SQLite (it may be called from the event loop). An id can therefore reach
+          other processes a moment after `submit` returns. Job records older than
+          `job_ttl_seconds` are pruned from the store by the same thread.
+    """
+
+    def __init__(
+        self,
+        narrate: NarrateFn,
+        max_workers: int = 4,
+        max_jobs: int = 10_000,
+        store: Optional[NarrationCache] = None,
+        job_ttl_seconds: float = 3600.0,
+    ) -> None:
+        self._narrate = narrate
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.store = store if store is not None and store.persistent else None
+        self.job_ttl_seconds = job_ttl_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._store_executor: Optional[ThreadPoolExecutor] = None
+        self._store_writes: Optional[Future] = None
+        self._next_expiry = 0.0
+        self._jobs: "OrderedDict[str, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Separate lock: cancelling an evicted job runs `_publish` while `_lock` is held.
+        self._store_lock = threading.Lock()
+
+    def submit(self, event: AnomalyEvent, tone: str = "analyst") -> str:
+        """Queue a narration and return its id."""
+        narration_id = uuid.uuid4().hex
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="narration")
+            if self.store is not None:
+                with self._store_lock:
+                    self._write_store(narration_id, Future())
+            future = self._executor.submit(self._narrate, event, tone)
+            self._jobs[narration_id] = future
+            while len(self._jobs) > self.max_jobs:
+                _, evicted = self._jobs.popitem(last=False)
+                evicted.cancel()
+        if self.store is not None:
+            future.add_done_callback(lambda done: self._publish(narration_id, done))
+        return narration_id
+
+    def future(self, narration_id: str) -> Optional[Future]:
+        """Underlying future for a narration id (None if unknown or evicted)."""
+        with self._lock:
+            return self._jobs.get(narration_id)
+
+    def get(self, narration_id: str, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Return {"narration_id", "status", "narrative_title", "narrative_summary"}, or None if unknown.
+
+        Args:
+            wait: seconds to block for completion before reporting a pending status.
+        """
+        future = self.future(narration_id)
+        if future is None:
+            return self.lookup(narration_id, wait)
+        if wait > 0:
+            try:
+                future.exception(timeout=wait)
+            except (FutureTimeoutError, CancelledError):
+                pass
+        return self.describe(narration_id, future)
+
+    def lookup(self, narration_id: str, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Status payload from the shared store (for ids issued by other processes), or None.
+
+        Args:
+            wait: seconds to keep polling the store while the narration is pending.
+        """
+        if self.store is None:
+            return None
+        deadline = time.monotonic() + wait
+        while True:
+            record = self.store.get_job(narration_id)
+            if record is None or record["status"] != PENDING or time.monotonic() >= deadline:
+                return record
+            time.sleep(min(_STORE_POLL_SECONDS, max(deadline - time.monotonic(), 0.0)))
+
+    @staticmethod
+    def describe(narration_id: str, future: Future) -> Dict[str, Any]:
+        """Status payload for a narration future."""
+        result: Dict[str, Any] = {
+            "narration_id": narration_id,
+            "status": PENDING,
+            "narrative_title": None,
+            "narrative_summary": None,
+        }
+        if not future.done():
+            return result
+        if future.cancelled() or future.exception() is not None:
+            result["status"] = FAILED
+            return result
+        narration = future.result() or {}
+        result.update(
+            status=DONE,
+            narrative_title=narration.get("narrative_title"),
+            narrative_summary=narration.get("narrative_summary"),
+        )
+        return result
+
+    def _publish(self, narration_id: str, future: Future) -> None:
+        with self._store_lock:
+            self._write_store(narration_id, future)
+
+    def _write_store(self, narration_id: str, future: Future) -> None:
+        """Queue a job record write on the store thread (`_store_lock` must be held)."""
+        if self._store_executor is None:
+            self._store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="narration-store")
+        self._store_writes = self._store_executor.submit(self._put_job, narration_id, self.describe(narration_id, future))
+
+    def _put_job(self, narration_id: str, record: Dict[str, Any]) -> None:
+        assert self.store is not None
+        try:
+            self.store.put_job(narration_id, record)
+            now = time.monotonic()
+            if now >= self._next_expiry:
+                self._next_expiry = now + self.job_ttl_seconds / 10
+                self.store.expire_jobs(self.job_ttl_seconds)
+        except Exception:
+            logger.exception("Failed to store narration job %s", narration_id)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued store writes have landed (for scripts and tests). Returns False on timeout."""
+        with self._store_lock:
+            last = self._store_writes
+        if last is None:
+            return True
+        try:
+            last.result(timeout=timeout)
+        except FutureTimeoutError:
+            return False
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of retained narrations by status."""
+        with self._lock:
+            futures = list(self._jobs.values())
+        pending = sum(1 for f in futures if not f.done())
+        return {"retained": len(futures), "pending": pending}
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker threads; without `wait`, queued narrations are cancelled."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=not wait)
+        with self._store_lock:
+            store_executor, self._store_executor = self._store_executor, None
+        if store_executor is not None:
+            # Queued store writes are never cancelled, so other processes still see final statuses.
+            store_executor.shutdown(wait=wait)
@@ -13,10 +13,10 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.pdfgen import canvas
 from reportlab.platypus import Paragraph
 
-from llm.anomaly_narrator import AnomalyEvent, AnomalyNarrator
-from llm.factory import get_llm_client_from_env
+from llm.anomaly_narrator import AnomalyEvent
+from llm.factory import get_narrator_from_env
 
-narrator = AnomalyNarrator(get_llm_client_from_env())
+narrator = get_narrator_from_env()
 
 
 def _draw_bar(c: canvas.Canvas, x: float, y: float, width: float, height: float, label: str, value: float):
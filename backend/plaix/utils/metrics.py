@@ -0,0 +1,39 @@
+"""Minimal in-process metrics primitives."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Sequence
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with cumulative ("le") counts, Prometheus style.
+
+    `snapshot()` returns {"le_<bound>": count, ..., "le_inf": count, "count": n, "sum": total}.
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = sorted(bounds)
+        self._counts = [0] * (len(self.bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.bounds, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            out: Dict[str, float] = {}
+            running = 0
+            for bound, count in zip(self.bounds, self._counts):
+                running += count
+                out[f"le_{bound:g}"] = running
+            running += self._counts[-1]
+            out["le_inf"] = running
+            out["count"] = running
+            out["sum"] = self._sum
+            return out
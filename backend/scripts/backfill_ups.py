@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""Backfill point-in-time UPS scores for every historical innings."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from plaix.core.role_baselines import RoleBaselineTable  # noqa: E402
+from plaix.pipeline.ups_backfill import backfill_ups, write_backfill  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Score each innings against only the innings before it.")
+    parser.add_argument("--input", type=Path, required=True, help="Per-innings CSV or Parquet (player_id, match_format, date, runs).")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/processed/per_innings_with_ups.parquet"),
+        help="Output path; .parquet writes columnar output, otherwise CSV.",
+    )
+    parser.add_argument(
+        "--role-baselines",
+        type=Path,
+        default=None,
+        help=(
+            "Optional role baseline table (JSON) for rows with short histories. The table aggregates "
+            "its whole source dataset, so those rows are no longer strictly point-in-time."
+        ),
+    )
+    parser.add_argument("--window-size", type=int, default=10)
+    parser.add_argument("--min-history", type=int, default=5)
+    parser.add_argument("--decay-lambda", type=float, default=0.3)
+    parser.add_argument("--sigma-min", type=float, default=5.0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    df = pd.read_parquet(args.input) if args.input.suffix == ".parquet" else pd.read_csv(args.input)
+    if "player_id" not in df.columns and "player_name" in df.columns:
+        df = df.rename(columns={"player_name": "player_id"})
+    role_baselines = RoleBaselineTable.load(args.role_baselines) if args.role_baselines else None
+    scored = backfill_ups(
+        df,
+        window_size=args.window_size,
+        min_history=args.min_history,
+        decay_lambda=args.decay_lambda,
+        sigma_min=args.sigma_min,
+        role_baselines=role_baselines,
+    )
+    write_backfill(scored, args.output)
+    print(f"Backfilled {len(scored)} innings in {time.perf_counter() - started:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+"""Build a memory-mapped columnar innings history store from a CSV."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from plaix.history.columnar import write_columnar_history  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build columnar history arrays for ColumnarHistoryProvider.")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=Path("data/processed/per_innings_with_ups.csv"),
+        help="Per-innings CSV with player_id, match_format, runs_scored/current_runs and date.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/processed/history_columnar"),
+        help="Output directory for column arrays and index.",
+    )
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    if "player_id" not in df.columns and "player_name" in df.columns:
+        df = df.rename(columns={"player_name": "player_id"})
+    root = write_columnar_history(df, args.output)
+    print(f"Wrote {len(df)} innings to {root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+"""Convert a feed CSV or Parquet file into the memory-mapped Arrow feed store."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from plaix.services.feed_store import FEED_COLUMNS, read_feed_file, write_feed_arrow  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the Arrow IPC feed store loaded by the anomaly feed.")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=Path("data/processed/per_innings_with_ups.csv"),
+        help="Per-innings feed data (.csv or .parquet).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/processed/per_innings_with_ups.arrow"),
+        help="Output Arrow IPC file (memory-mapped by the API at startup).",
+    )
+    parser.add_argument(
+        "--all-columns",
+        action="store_true",
+        help="Keep every source column instead of only the columns the feed serves.",
+    )
+    args = parser.parse_args()
+
+    df = read_feed_file(args.input, columns=None if args.all_columns else FEED_COLUMNS)
+    path = write_feed_arrow(df, args.output)
+    print(f"Wrote {len(df)} feed rows ({len(df.columns)} columns) to {path}")
+
+
+if __name__ == "__main__":
+    main()
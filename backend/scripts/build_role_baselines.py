@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+"""Aggregate team-role and global fallback baselines from an innings dataset."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from plaix.core.role_baselines import RoleBaselineTable  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the fallback baseline lookup table loaded by UPSScorer.")
+    parser.add_argument(
+        "--input",
+        type=Path,
+        default=Path("data/processed/per_innings_with_ups.csv"),
+        help="Per-innings CSV with match_format, runs and team/batting_position columns.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=BACKEND_ROOT / "models" / "role_baselines.json",
+        help="Output JSON lookup table.",
+    )
+    parser.add_argument("--min-innings", type=int, default=20, help="Minimum innings per group (default: 20)")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    if "player_id" not in df.columns and "player_name" in df.columns:
+        df = df.rename(columns={"player_name": "player_id"})
+    table = RoleBaselineTable.from_dataframe(df, min_innings=args.min_innings)
+    table.save(args.output)
+    print(
+        f"Saved {len(table.team_role)} team-role, {len(table.role)} role and "
+        f"{len(table.format_stats)} format baselines to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,15 @@
 #!/usr/bin/env python
-"""Run a quick benchmark on the synthetic UPS dataset."""
+"""Run a quick benchmark on the synthetic UPS dataset, comparing accuracy and throughput per backend."""
 
 from __future__ import annotations
 
+import argparse
 import json
 import subprocess
 import sys
+import time
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score
@@ -21,6 +23,7 @@ for candidate in (BACKEND_ROOT, SRC_PATH):
     if candidate.exists() and str(candidate) not in sys.path:
         sys.path.insert(0, str(candidate))
 
+from plaix.core.feature_schema import FEATURE_SCHEMA  # noqa: E402
 from plaix.core.model import AnomalyModel  # noqa: E402
 
 
@@ -28,16 +31,15 @@ DATA_PATH = BACKEND_ROOT / "data" / "synthetic_ups_dataset.csv"
 MODEL_PATH = BACKEND_ROOT / "models" / "ups_logreg.pkl"
 METRICS_PATH = BACKEND_ROOT / "data" / "benchmark_metrics.json"
 
-FEATURE_COLUMNS = [
-    "baseline_mean_runs",
-    "baseline_std_runs",
-    "current_runs",
-    "venue_flatness",
-    "opposition_strength",
-    "batting_position",
-]
 LABEL_COLUMN = "ups_anomaly_flag"
 
+BACKEND_CONFIGS: Dict[str, Dict[str, Any]] = {
+    "logistic_regression": {"max_iter": 200},
+    "sgd_logistic": {"random_state": 42},
+    "hist_gradient_boosting": {"random_state": 42},
+    "isolation_forest": {"n_estimators": 200, "random_state": 42},
+}
+
 
 def ensure_dataset() -> None:
     """Generate synthetic dataset if missing."""
@@ -48,46 +50,75 @@ def ensure_dataset() -> None:
     subprocess.run([sys.executable, str(generator)], check=True)
 
 
-def compute_metrics(df: pd.DataFrame) -> Dict[str, float]:
-    """Train/val split, fit logistic regression, compute metrics."""
-    X = df[FEATURE_COLUMNS]
-    y = df[LABEL_COLUMN]
+def compute_metrics(
+    df: pd.DataFrame, model_type: str = "logistic_regression", n_jobs: Optional[int] = None
+) -> Dict[str, float]:
+    """Train/val split, fit the backend, compute accuracy metrics plus fit time and scoring throughput."""
+    X = FEATURE_SCHEMA.transform_frame(df)
+    y = df[LABEL_COLUMN].to_numpy()
 
     X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
-    model = AnomalyModel(model_type="logistic_regression", model_config={"max_iter": 200})
+    config = dict(BACKEND_CONFIGS.get(model_type, {}))
+    if n_jobs is not None and model_type in ("hist_gradient_boosting", "isolation_forest"):
+        config["n_jobs"] = n_jobs
+    model = AnomalyModel(model_type=model_type, model_config=config)
+    started = time.perf_counter()
     model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
 
-    y_pred = model.predict(X_val)
+    started = time.perf_counter()
     y_proba = model.predict_proba(X_val)[:, 1]
+    predict_seconds = time.perf_counter() - started
+    y_pred = (y_proba > 0.5).astype(int)
 
     metrics = {
         "accuracy": float(accuracy_score(y_val, y_pred)),
         "precision": float(precision_score(y_val, y_pred, zero_division=0)),
         "recall": float(recall_score(y_val, y_pred, zero_division=0)),
         "roc_auc": float(roc_auc_score(y_val, y_proba)),
+        "fit_seconds": float(fit_seconds),
+        "predict_rows_per_second": float(len(X_val) / predict_seconds) if predict_seconds > 0 else float("inf"),
         "n_train": int(len(X_train)),
         "n_val": int(len(X_val)),
     }
 
-    MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
-    model.save_model(str(MODEL_PATH))
+    if model_type == "logistic_regression":
+        MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
+        model.save_model(str(MODEL_PATH))
 
     return metrics
 
 
-def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark UPS anomaly backends on the synthetic dataset")
+    parser.add_argument(
+        "--backends",
+        default=",".join(BACKEND_CONFIGS),
+        help="Comma-separated model types to compare (first one is reported at the top level)",
+    )
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Worker count for tree backends (-1 = all cores)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
     ensure_dataset()
     df = pd.read_csv(DATA_PATH)
-    metrics = compute_metrics(df)
+    backends = [name.strip() for name in args.backends.split(",") if name.strip()]
+    comparison = {name: compute_metrics(df, name, n_jobs=args.n_jobs) for name in backends}
+    metrics: Dict[str, Any] = {**comparison[backends[0]], "backends": comparison}
 
     METRICS_PATH.parent.mkdir(parents=True, exist_ok=True)
     METRICS_PATH.write_text(json.dumps(metrics, indent=2))
 
     print("Benchmark metrics (synthetic dataset):")
-    for k, v in metrics.items():
-        print(f"  {k}: {v:.3f}" if isinstance(v, float) else f"  {k}: {v}")
-    print(f"Saved model to {MODEL_PATH}")
+    columns = ["accuracy", "precision", "recall", "roc_auc", "fit_seconds", "predict_rows_per_second"]
+    print(f"  {'backend':<24}" + "".join(f"{c:>25}" for c in columns))
+    for name, result in comparison.items():
+        print(f"  {name:<24}" + "".join(f"{result[c]:>25.3f}" for c in columns))
+    if "logistic_regression" in comparison:
+        print(f"Saved model to {MODEL_PATH}")
     print(f"Saved metrics to {METRICS_PATH}")
 
 
@@ -12,6 +12,7 @@ REPO_ROOT = CURRENT_DIR.parent
 sys.path.append(str(REPO_ROOT / "src"))
 sys.path.append(str(REPO_ROOT))
 
+from plaix.core.feature_schema import FEATURE_SCHEMA
 from plaix.core.model import AnomalyModel
 from plaix.core.ups_scorer import BaselineStats, UPSScorer
 import scripts.generate_synthetic_ups_data as generate_synthetic_ups_data
@@ -33,7 +34,7 @@ def ensure_data_and_model() -> None:
     if not DATA_PATH.exists():
         generate_synthetic_ups_data.main()
     if not MODEL_PATH.exists():
-        train_ups_model.main()
+        train_ups_model.main([])
 
 
 def main() -> None:
@@ -67,16 +68,9 @@ def main() -> None:
     # Model inference
     model = AnomalyModel(model_type="logistic_regression", model_config={}, sport="cricket")
     model.load_model(str(MODEL_PATH))
-    feature_vec = [
-        payload["baseline_mean_runs"],
-        payload["baseline_std_runs"],
-        payload["current_runs"],
-        payload["venue_flatness"],
-        payload["opposition_strength"],
-        payload["batting_position"],
-    ]
-    model_proba = float(model.predict_proba([feature_vec])[0][1])
-    model_label = int(model.predict([feature_vec])[0])
+    proba = model.predict_proba(FEATURE_SCHEMA.transform_one(payload))[0]
+    model_proba = float(proba[1])
+    model_label = int(model.model.classes_[proba.argmax()])
 
     summary = {
         "player_id": payload["player_id"],
@@ -1,36 +1,40 @@
-"""Train a simple UPS anomaly model (logistic regression) on synthetic data."""
+"""
+Train a simple UPS anomaly model (logistic regression) on synthetic data.
+
+With --stream, trains the incremental sgd_logistic backend from CSV chunks instead, so
+datasets larger than memory train with bounded memory.
+"""
 
 from __future__ import annotations
 
+import argparse
 import json
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 from sklearn.metrics import accuracy_score, precision_score, recall_score
 from sklearn.model_selection import train_test_split
 
+from plaix.core.feature_schema import FEATURE_SCHEMA
 from plaix.core.model import AnomalyModel
+from plaix.core.model_registry import ModelRegistry
+from plaix.pipeline.streaming_training import iter_csv_chunks, train_incremental
 
 DATA_PATH = Path(__file__).resolve().parents[1] / "data" / "synthetic_ups_dataset.csv"
 MODEL_PATH = Path(__file__).resolve().parents[1] / "models" / "ups_logreg.pkl"
+REGISTRY_PATH = Path(__file__).resolve().parents[1] / "models" / "registry"
 
-FEATURE_COLUMNS = [
-    "baseline_mean_runs",
-    "baseline_std_runs",
-    "current_runs",
-    "venue_flatness",
-    "opposition_strength",
-    "batting_position",
-]
 LABEL_COLUMN = "ups_anomaly_flag"
 
 
-def main() -> None:
-    df = pd.read_csv(DATA_PATH)
+def train_in_memory(data_path: Path) -> Tuple[AnomalyModel, Dict[str, float]]:
+    """Load the full dataset and fit logistic regression on a stratified split."""
+    df = pd.read_csv(data_path)
 
-    X = df[FEATURE_COLUMNS]
-    y = df[LABEL_COLUMN]
+    X = FEATURE_SCHEMA.transform_frame(df)
+    y = df[LABEL_COLUMN].to_numpy()
 
     X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
 
@@ -38,11 +42,40 @@ def main() -> None:
     model.fit(X_train, y_train)
 
     y_pred = model.predict(X_val)
-    y_proba = model.predict_proba(X_val)[:, 1]
+    return model, {
+        "accuracy": accuracy_score(y_val, y_pred),
+        "precision": precision_score(y_val, y_pred, zero_division=0),
+        "recall": recall_score(y_val, y_pred, zero_division=0),
+    }
+
+
+def train_streaming(data_path: Path, chunksize: int, epochs: int) -> Tuple[AnomalyModel, Dict[str, float]]:
+    """Fit sgd_logistic with partial_fit over CSV chunks; every 5th row is held out."""
+    model = AnomalyModel(model_type="sgd_logistic", model_config={"random_state": 42})
+    metrics = train_incremental(
+        model,
+        lambda: iter_csv_chunks(data_path, LABEL_COLUMN, chunksize=chunksize),
+        epochs=epochs,
+    )
+    return model, metrics
+
 
-    acc = accuracy_score(y_val, y_pred)
-    prec = precision_score(y_val, y_pred, zero_division=0)
-    rec = recall_score(y_val, y_pred, zero_division=0)
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the UPS anomaly model")
+    parser.add_argument("--data", type=Path, default=DATA_PATH, help="Innings CSV with features and label")
+    parser.add_argument("--stream", action="store_true", help="Train incrementally from CSV chunks (bounded memory)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk when streaming")
+    parser.add_argument("--epochs", type=int, default=3, help="Passes over the data when streaming")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.stream:
+        model, metrics = train_streaming(args.data, args.chunksize, args.epochs)
+    else:
+        model, metrics = train_in_memory(args.data)
+    acc, prec, rec = metrics["accuracy"], metrics["precision"], metrics["recall"]
 
     MODEL_PATH.parent.mkdir(parents=True, exist_ok=True)
     model.save_model(str(MODEL_PATH))
@@ -53,11 +86,6 @@ def main() -> None:
     print(f"Saved model to {MODEL_PATH}")
 
     # Save metrics
-    metrics = {
-        "accuracy": acc,
-        "precision": prec,
-        "recall": rec,
-    }
     metrics_path = MODEL_PATH.parent / "metrics.json"
     with open(metrics_path, "w") as f:
         json.dump(metrics, f, indent=2)
@@ -66,15 +94,21 @@ def main() -> None:
     # Save metadata
     meta = {
         "trained_at": datetime.now(timezone.utc).isoformat(),
-        "model_type": "logistic_regression",
-        "config": {"max_iter": 200},
-        "data_source": str(DATA_PATH.name),
+        "model_type": model.model_type,
+        "config": model.model_config,
+        "data_source": str(Path(args.data).name),
     }
     meta_path = MODEL_PATH.parent / "meta.json"
     with open(meta_path, "w") as f:
         json.dump(meta, f, indent=2)
     print(f"Saved metadata to {meta_path}")
 
+    # Register a new version and make it active; running services pick it up without a restart.
+    version = ModelRegistry(REGISTRY_PATH).register(
+        model, metadata={"metrics": metrics, "data_source": meta["data_source"]}
+    )
+    print(f"Registered model version {version} in {REGISTRY_PATH}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Iterable
+
+from plaix.api.inference import InferenceService
+from plaix.core.baseline_cache import BaselineCache
+from plaix.core.online_baseline import OnlineBaselineStore
+from plaix.core.ups_scorer import UPSScorer
+
+HISTORY = [{"runs_scored": r} for r in (20, 22, 25, 18, 30, 24, 21)]
+
+
+class SlowAsyncHistoryProvider:
+    """Async provider that simulates remote I/O latency."""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        self.delay = delay
+        self.calls = 0
+
+    async def aget_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return HISTORY if player_id.startswith("P") else []
+
+    def get_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        return HISTORY if player_id.startswith("P") else []
+
+
+class DummyModel:
+    def predict_proba(self, X):
+        return [[0.3, 0.7] for _ in X]
+
+    def predict(self, X):
+        return [1 for _ in X]
+
+
+class SyncHistoryProvider:
+    def get_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        return HISTORY
+
+
+def test_async_lookups_run_concurrently() -> None:
+    provider = SlowAsyncHistoryProvider(delay=0.05)
+    scorer = UPSScorer(provider)
+
+    async def run() -> list:
+        return await asyncio.gather(*(scorer.score_innings_async(f"P{i}", "T20", 60) for i in range(20)))
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert provider.calls == 20
+    assert elapsed < 0.5
+    assert all(result == scorer.score_innings("P0", "T20", 60) for result in results)
+
+
+def test_async_path_falls_back_to_sync_provider_and_uses_cache() -> None:
+    scorer = UPSScorer(SyncHistoryProvider(), baseline_cache=BaselineCache())
+
+    result = asyncio.run(scorer.score_innings_async("P1", "T20", 45))
+
+    assert result == scorer.score_innings("P1", "T20", 45)
+    assert scorer.baseline_cache is not None and scorer.baseline_cache.stats()["hits"] == 1
+
+
+def test_async_path_seeds_online_store() -> None:
+    provider = SlowAsyncHistoryProvider(delay=0)
+    scorer = UPSScorer(provider, online_store=OnlineBaselineStore())
+
+    asyncio.run(scorer.compute_player_baseline_async("P1", "T20"))
+    scorer.record_innings("P1", "T20", 100)
+    asyncio.run(scorer.compute_player_baseline_async("P1", "T20"))
+
+    assert provider.calls == 1
+    assert scorer.online_store is not None and len(scorer.online_store.get("P1", "T20")) == len(HISTORY) + 1
+
+
+def test_run_inference_async_matches_sync() -> None:
+    service = InferenceService(history_provider=SyncHistoryProvider())
+    service.model = DummyModel()
+    payload = {"player_id": "P1", "match_format": "T20", "current_runs": 70, "baseline_mean_runs": 22, "baseline_std_runs": 10}
+
+    async_result = asyncio.run(service.run_inference_async(dict(payload)))
+
+    assert async_result == service.run_inference(dict(payload))
+    assert async_result.ups_score > 0
+
+
+def test_run_inference_async_keeps_model_work_off_the_event_loop(monkeypatch) -> None:
+    service = InferenceService(history_provider=SyncHistoryProvider())
+    service.model = DummyModel()
+    threads = {}
+
+    def refresh_model(force: bool = False) -> bool:
+        threads["refresh"] = threading.get_ident()
+        return False
+
+    score_event = service._score_event
+
+    def recording_score_event(*args):
+        threads["score"] = threading.get_ident()
+        return score_event(*args)
+
+    monkeypatch.setattr(service, "refresh_model", refresh_model)
+    monkeypatch.setattr(service, "_score_event", recording_score_event)
+    service._next_model_check = 0.0
+    payload = {"player_id": "P1", "match_format": "T20", "current_runs": 70, "baseline_mean_runs": 22, "baseline_std_runs": 10}
+
+    async def run() -> int:
+        await service.run_inference_async(payload)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(run())
+    assert threads["refresh"] != loop_thread and threads["score"] != loop_thread
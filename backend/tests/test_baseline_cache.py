@@ -0,0 +1,92 @@
+from typing import Any, Dict, Iterable, List, Tuple
+
+from plaix.core.baseline_cache import BaselineCache
+from plaix.core.ups_scorer import UPSScorer
+
+
+class CountingHistoryProvider:
+    """History provider that counts lookups."""
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, str]] = []
+        self.data = {("P1", "T20"): [{"runs_scored": r} for r in (20, 22, 25, 18, 30, 24)]}
+
+    def get_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        self.calls.append((player_id, match_format))
+        return list(self.data.get((player_id, match_format), []))
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_eviction_and_counters() -> None:
+    cache = BaselineCache(maxsize=2)
+    cache.put(("A", "T20"), 1)
+    cache.put(("B", "T20"), 2)
+    assert cache.get(("A", "T20")) == 1  # A becomes most recent
+    cache.put(("C", "T20"), 3)  # evicts B
+
+    assert cache.get(("B", "T20")) is None
+    assert cache.get(("C", "T20")) == 3
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["evictions"] == 1
+    assert stats["size"] == 2
+
+
+def test_ttl_expiry() -> None:
+    clock = FakeClock()
+    cache = BaselineCache(maxsize=10, ttl_seconds=5.0, clock=clock)
+    cache.put(("A", "T20"), 1)
+    clock.now = 4.9
+    assert cache.get(("A", "T20")) == 1
+    clock.now = 5.0
+    assert cache.get(("A", "T20")) is None
+    assert len(cache) == 0
+
+
+def test_invalidate_by_player_and_format() -> None:
+    cache = BaselineCache()
+    cache.put(("A", "T20", 10), 1)
+    cache.put(("A", "T20", 5), 2)
+    cache.put(("A", "ODI", 10), 3)
+    cache.put(("B", "T20", 10), 4)
+
+    assert cache.invalidate("A", "T20") == 2
+    assert cache.get(("A", "ODI", 10)) == 3
+    assert cache.invalidate("A") == 1
+    assert cache.get(("B", "T20", 10)) == 4
+
+
+def test_scorer_uses_cache_and_invalidate_hook() -> None:
+    provider = CountingHistoryProvider()
+    scorer = UPSScorer(provider, baseline_cache=BaselineCache())
+
+    first = scorer.score_innings("P1", "T20", current_runs=60)
+    second = scorer.score_innings("P1", "T20", current_runs=60)
+    assert first == second
+    assert len(provider.calls) == 1
+
+    provider.data[("P1", "T20")].insert(0, {"runs_scored": 90})
+    scorer.invalidate_player("P1", "T20")
+    third = scorer.score_innings("P1", "T20", current_runs=60)
+    assert len(provider.calls) == 2
+    assert third["baseline_mean_runs"] > first["baseline_mean_runs"]
+
+
+def test_batch_path_shares_cache() -> None:
+    provider = CountingHistoryProvider()
+    scorer = UPSScorer(provider, baseline_cache=BaselineCache())
+    scorer.compute_player_baseline("P1", "T20")
+
+    results = scorer.score_innings_batch(["P1", "P2", "P2"], ["T20", "T20", "T20"], [40, 10, 50])
+
+    assert provider.calls == [("P1", "T20"), ("P2", "T20")]
+    assert results[0] == UPSScorer(CountingHistoryProvider()).score_innings("P1", "T20", 40)
+    assert scorer.baseline_cache is not None and scorer.baseline_cache.stats()["size"] == 2
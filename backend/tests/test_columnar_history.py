@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from plaix.core.ups_scorer import UPSScorer
+from plaix.history.columnar import ColumnarHistoryProvider, write_columnar_history
+
+
+class DictHistoryProvider:
+    def __init__(self, data):
+        self.data = data
+
+    def get_player_innings_history(self, player_id, match_format):
+        return self.data.get((player_id, match_format), [])
+
+
+def _innings() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "player_id": ["P1"] * 7 + ["P2"] * 3 + ["P1"] * 2,
+            "match_format": ["T20"] * 7 + ["T20"] * 3 + ["ODI"] * 2,
+            "date": [f"2024-01-{d:02d}" for d in (1, 5, 3, 9, 7, 2, 4)] + ["2024-02-01", "2024-02-03", "2024-02-02"] + ["2024-03-01", "2024-03-05"],
+            "runs_scored": [10, 50, 30, 90, 70, 20, 40, 5, 15, 25, 60, 80],
+        }
+    )
+
+
+def test_write_and_read_recent_runs(tmp_path: Path) -> None:
+    write_columnar_history(_innings(), tmp_path)
+    provider = ColumnarHistoryProvider(tmp_path)
+
+    runs = provider.get_recent_runs("P1", "T20")
+    assert runs.tolist() == [90, 70, 50, 40, 30, 20, 10]
+    assert isinstance(provider.runs, np.memmap)
+    assert np.shares_memory(runs, provider.runs)
+    assert provider.get_recent_runs("P1", "T20", limit=2).tolist() == [90, 70]
+    assert provider.get_recent_runs("P2", "ODI").size == 0
+    assert provider.get_recent_runs("NOPE", "T20").size == 0
+    assert len(provider) == 12
+
+    history = provider.get_player_innings_history("P1", "ODI")
+    assert [h["runs_scored"] for h in history] == [80, 60]
+    assert history[0]["timestamp"] > history[1]["timestamp"]
+
+
+def test_offset_index_is_memory_mapped_and_searched(tmp_path: Path) -> None:
+    df = pd.concat([_innings(), pd.DataFrame({"player_id": ["Zoë"], "match_format": ["T20"], "date": ["2024-04-01"], "runs_scored": [33]})])
+    write_columnar_history(df, tmp_path)
+    provider = ColumnarHistoryProvider(tmp_path)
+
+    assert isinstance(provider._keys, np.memmap) and isinstance(provider._offsets, np.memmap)
+    assert provider.get_recent_runs("Zoë", "T20").tolist() == [33]
+    runs = provider.get_many_recent_runs([("P1", "ODI"), ("P1", "T20X"), ("P1", "T2"), ("Zoë", "T20"), ("P2", "T20")], limit=2)
+    assert {key: value.tolist() for key, value in runs.items()} == {
+        ("P1", "ODI"): [80, 60],
+        ("P1", "T20X"): [],
+        ("P1", "T2"): [],
+        ("Zoë", "T20"): [33],
+        ("P2", "T20"): [15, 25],
+    }
+
+
+def test_scorer_matches_dict_provider(tmp_path: Path) -> None:
+    df = _innings()
+    write_columnar_history(df, tmp_path)
+    columnar = UPSScorer(ColumnarHistoryProvider(tmp_path))
+
+    ordered = df.sort_values("date", ascending=False)
+    data = {
+        key: [{"runs_scored": r} for r in group["runs_scored"]]
+        for key, group in ordered.groupby(["player_id", "match_format"])
+    }
+    reference = UPSScorer(DictHistoryProvider(data))
+
+    for player_id, match_format in [("P1", "T20"), ("P2", "T20"), ("P1", "ODI")]:
+        assert columnar.score_innings(player_id, match_format, 75) == reference.score_innings(player_id, match_format, 75)
+
+
+def test_bulk_histories_respect_limit(tmp_path: Path) -> None:
+    write_columnar_history(_innings(), tmp_path)
+    provider = ColumnarHistoryProvider(tmp_path)
+
+    histories = provider.get_many_player_innings_histories([("P1", "T20"), ("P2", "T20"), ("X", "T20")], limit=2)
+
+    assert [h["runs_scored"] for h in histories[("P1", "T20")]] == [90, 70]
+    assert [h["runs_scored"] for h in histories[("P2", "T20")]] == [15, 25]
+    assert histories[("X", "T20")] == []
+
+
+def test_rewrite_publishes_new_version_without_touching_mapped_files(tmp_path: Path) -> None:
+    write_columnar_history(_innings(), tmp_path)
+    old = ColumnarHistoryProvider(tmp_path)
+
+    df = _innings()
+    df["runs_scored"] = df["runs_scored"] + 1
+    write_columnar_history(df, tmp_path)
+    new = ColumnarHistoryProvider(tmp_path)
+
+    assert old.get_recent_runs("P1", "T20").tolist() == [90, 70, 50, 40, 30, 20, 10]
+    assert new.get_recent_runs("P1", "T20").tolist() == [91, 71, 51, 41, 31, 21, 11]
+    assert new.path != old.path
+
+    write_columnar_history(_innings(), tmp_path)
+    assert sorted(p.name for p in tmp_path.glob("v*")) == sorted([new.path.name, ColumnarHistoryProvider(tmp_path).path.name])
+    assert old.get_recent_runs("P1", "T20").tolist()[0] == 90  # still mapped after its directory is removed
+
+
+def test_batch_scoring_reads_runs_column_not_history_dicts(tmp_path: Path, monkeypatch) -> None:
+    write_columnar_history(_innings(), tmp_path)
+    provider = ColumnarHistoryProvider(tmp_path)
+    scorer = UPSScorer(provider)
+    keys = [("P1", "T20"), ("P2", "T20"), ("P1", "ODI"), ("P1", "T20")]
+    expected = [scorer.compute_player_baseline(*key) for key in keys]
+
+    def no_dicts(*args, **kwargs):
+        raise AssertionError("history dicts should not be built")
+
+    monkeypatch.setattr(provider, "get_many_player_innings_histories", no_dicts)
+    monkeypatch.setattr(provider, "get_player_innings_history", no_dicts)
+
+    assert scorer.compute_player_baselines_batch(keys) == expected
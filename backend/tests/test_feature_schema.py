@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from plaix.core.feature_schema import FEATURE_COLUMNS, FEATURE_SCHEMA
+
+
+def test_transform_orders_columns_and_applies_defaults() -> None:
+    payloads = [
+        {"current_runs": 40, "baseline_std_runs": 10, "baseline_mean_runs": 22, "batting_position": 3.9},
+        {"baseline_mean_runs": "18", "baseline_std_runs": 7.5, "current_runs": 5, "venue_flatness": 0.8, "extra": "x"},
+    ]
+
+    X = FEATURE_SCHEMA.transform(payloads)
+
+    assert X.dtype == np.float32 and X.shape == (2, len(FEATURE_COLUMNS))
+    np.testing.assert_array_equal(X[0], np.array([22, 10, 40, 0.5, 0.5, 3], dtype=np.float32))
+    np.testing.assert_array_equal(X[1], np.array([18, 7.5, 5, 0.8, 0.5, 4], dtype=np.float32))
+    np.testing.assert_array_equal(FEATURE_SCHEMA.transform_one(payloads[0]), X[:1])
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ({"baseline_mean_runs": 22, "baseline_std_runs": 10}, "current_runs"),
+        ({"baseline_mean_runs": 22, "baseline_std_runs": 10, "current_runs": "many"}, "current_runs"),
+        ({"baseline_mean_runs": 22, "baseline_std_runs": None, "current_runs": 4}, "baseline_std_runs"),
+        ({"baseline_mean_runs": float("inf"), "baseline_std_runs": 10, "current_runs": 4}, "baseline_mean_runs"),
+    ],
+)
+def test_transform_validates_columns(payload, message) -> None:
+    with pytest.raises(ValueError, match=message):
+        FEATURE_SCHEMA.transform([{"baseline_mean_runs": 1, "baseline_std_runs": 1, "current_runs": 1}, payload])
+
+
+def test_transform_frame_matches_payload_transform() -> None:
+    payloads = [
+        {"baseline_mean_runs": 22, "baseline_std_runs": 10, "current_runs": 40, "batting_position": 2},
+        {"baseline_mean_runs": 30, "baseline_std_runs": 12, "current_runs": 7, "venue_flatness": 0.2},
+    ]
+    df = pd.DataFrame(payloads)
+
+    np.testing.assert_array_equal(FEATURE_SCHEMA.transform_frame(df), FEATURE_SCHEMA.transform(payloads))
+    with pytest.raises(ValueError, match="current_runs"):
+        FEATURE_SCHEMA.transform_frame(df.drop(columns="current_runs"))
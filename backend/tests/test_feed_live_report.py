@@ -24,6 +24,13 @@ def test_feed_list_and_detail() -> None:
         assert key in d_json
 
 
+def test_feed_list_with_narratives() -> None:
+    resp = client.get("/feed/anomalies", params={"limit": 3, "include_narrative": True, "tone": "casual"})
+    assert resp.status_code == 200
+    items = resp.json()["items"]
+    assert items and all(item["narrative_title"] and item["narrative_summary"] for item in items)
+
+
 def test_live_start_and_step() -> None:
     start = client.post(
         "/live/start",
@@ -69,3 +76,31 @@ def test_report_pdf() -> None:
     assert "application/pdf" in resp.headers.get("content-type", "")
     body = resp.content
     assert body.startswith(b"%PDF")
+
+
+def test_feed_cursor_pagination() -> None:
+    first = client.get("/feed/anomalies", params={"limit": 2, "min_ups": -100}).json()
+    assert first["next_cursor"]
+    second = client.get("/feed/anomalies", params={"limit": 2, "min_ups": -100, "cursor": first["next_cursor"]}).json()
+    assert {i["event_id"] for i in first["items"]}.isdisjoint(i["event_id"] for i in second["items"])
+    assert client.get("/feed/anomalies", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_feed_append_is_served_after_rebuild() -> None:
+    from plaix.api.main import feed_manager
+
+    row = {"player_id": "P_APPENDED", "match_format": "ODI", "date": "2030-01-01", "ups_score": 4.2, "current_runs": 99}
+    resp = client.post("/feed/append", json=[row])
+    assert resp.status_code == 202 and resp.json() == {"queued": 1}
+    assert feed_manager.wait_idle(timeout=10)
+
+    detail = client.get("/feed/anomaly/P_APPENDED-2030-01-01-ODI")
+    assert detail.status_code == 200
+    assert detail.json()["current_runs"] == 99
+
+
+def test_feed_append_rejects_rows_with_bad_numbers() -> None:
+    row = {"player_id": "ZZ", "date": "2030-01-01", "match_format": "T20", "ups_score": 99, "baseline_mean_runs": "oops"}
+    resp = client.post("/feed/append", json=[row])
+    assert resp.status_code == 422
+    assert client.get("/feed/anomalies").status_code == 200
@@ -0,0 +1,152 @@
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+
+from plaix.services.feed_manager import FeedManager
+from plaix.services.feed_store import normalize_feed_frame, read_feed_csv
+
+
+def _rows(prefix: str, n: int, ups: float = 2.0) -> list[dict]:
+    return [
+        {"player_id": f"{prefix}{i}", "match_format": "T20", "date": "2024-05-01", "ups_score": ups + i, "current_runs": 50 + i}
+        for i in range(n)
+    ]
+
+
+def _write(path: Path, rows: list[dict], bump_ns: int = 0) -> None:
+    pd.DataFrame(rows).to_csv(path, index=False)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + bump_ns))
+
+
+def test_appended_rows_appear_in_a_new_snapshot() -> None:
+    manager = FeedManager(lambda: pd.DataFrame(_rows("BASE", 3)))
+    before = manager.current()
+
+    assert manager.append(_rows("NEW", 2, ups=9.0)) == 2
+    assert manager.wait_idle(timeout=10)
+
+    after = manager.current()
+    assert after is not before
+    assert len(before) == 3 and before.row("NEW0-2024-05-01-T20") is None
+    assert len(after) == 5 and after.row("NEW1-2024-05-01-T20")["ups_score"] == 10.0
+    assert after.event_ids[after.top(limit=1)][0] == "NEW1-2024-05-01-T20"
+    assert manager.stats()["version"] == 1
+
+
+def test_file_change_reloads_and_files_win_over_appended_rows(tmp_path: Path) -> None:
+    path = tmp_path / "feed.csv"
+    _write(path, _rows("P", 2))
+    manager = FeedManager(lambda: read_feed_csv(path), [path], poll_seconds=3600)
+    manager.append(_rows("LIVE", 2, ups=5.0))
+    manager.wait_idle(timeout=10)
+
+    assert not manager.poll()  # throttled
+    _write(path, _rows("P", 2) + _rows("LIVE", 1, ups=0.5), bump_ns=10**9)
+    assert manager.poll(force=True)
+    assert manager.wait_idle(timeout=10)
+
+    snapshot = manager.current()
+    assert len(snapshot) == 4
+    assert snapshot.row("LIVE0-2024-05-01-T20")["ups_score"] == 0.5  # file row replaces the appended one
+    assert snapshot.row("LIVE1-2024-05-01-T20")["ups_score"] == 6.0
+    assert manager.stats()["appended_rows"] == 1
+    assert not manager.poll(force=True)
+
+
+def test_requests_do_not_block_on_rebuild_and_failures_keep_old_snapshot(tmp_path: Path) -> None:
+    path = tmp_path / "feed.csv"
+    _write(path, _rows("P", 2))
+    release = threading.Event()
+    calls = []
+
+    def load() -> pd.DataFrame:
+        calls.append(1)
+        if len(calls) > 1:
+            release.wait(10)
+            raise OSError("half-written file")
+        return read_feed_csv(path)
+
+    manager = FeedManager(load, [path])
+    original = manager.current()
+    _write(path, _rows("P", 5), bump_ns=10**9)
+    manager.poll(force=True)
+
+    assert manager.current() is original  # rebuild in flight; served without waiting
+    assert manager.stats()["rebuilding"] == 1
+    release.set()
+    assert manager.wait_idle(timeout=10)
+    assert manager.current() is original
+    assert manager.stats()["rebuild_errors"] == 1
+
+
+def test_append_validates_rows_and_normalize_coerces_numbers() -> None:
+    manager = FeedManager(lambda: pd.DataFrame(_rows("BASE", 1)))
+    bad = dict(_rows("BAD", 1)[0], baseline_mean_runs="oops")
+
+    with pytest.raises(ValidationError):
+        manager.append([_rows("OK", 1)[0], bad])
+    assert manager.stats()["appended_rows"] == 0
+
+    frame = normalize_feed_frame(pd.DataFrame({"baseline_mean_runs": ["20", "oops"], "ups_score": [1.5, None]}))
+    assert frame["baseline_mean_runs"].iloc[0] == 20.0 and pd.isna(frame["baseline_mean_runs"].iloc[1])
+
+
+def test_failed_reload_is_retried_without_a_new_file_change(tmp_path: Path) -> None:
+    path = tmp_path / "feed.csv"
+    _write(path, _rows("P", 2))
+    fail_next = threading.Event()
+
+    def load() -> pd.DataFrame:
+        if fail_next.is_set():
+            fail_next.clear()
+            raise OSError("file busy")
+        return read_feed_csv(path)
+
+    manager = FeedManager(load, [path], poll_seconds=3600)
+    manager.append(_rows("LIVE", 1, ups=7.0))
+    assert manager.wait_idle(timeout=10)
+
+    fail_next.set()
+    _write(path, _rows("P", 4), bump_ns=10**9)
+    assert manager.poll(force=True)
+    assert manager.wait_idle(timeout=10)
+    assert manager.stats()["rebuild_errors"] == 1
+    assert len(manager.current()) == 3
+
+    assert manager.poll(force=True)  # same file signature, but the failed reload is still queued
+    assert manager.wait_idle(timeout=10)
+    snapshot = manager.current()
+    assert len(snapshot) == 5
+    assert snapshot.row("LIVE0-2024-05-01-T20")["ups_score"] == 7.0
+    assert not manager.poll(force=True)
+
+
+def test_only_the_winning_candidate_is_watched_and_loaded_strictly(tmp_path: Path, monkeypatch) -> None:
+    from plaix.services import anomaly_feed
+
+    primary, secondary = tmp_path / "feed.csv", tmp_path / "fallback.csv"
+    _write(primary, _rows("P", 2))
+    _write(secondary, _rows("S", 3))
+    monkeypatch.setattr(anomaly_feed, "DATA_CANDIDATES", [primary, secondary])
+    manager = FeedManager(lambda: anomaly_feed.load_feed_dataset(strict=True), [primary, secondary], poll_seconds=3600)
+    original = manager.current()
+    assert len(original) == 2
+
+    _write(secondary, _rows("S", 4), bump_ns=10**9)
+    assert not manager.poll(force=True)  # lower-priority change: nothing to rebuild
+
+    primary.write_text("player_id,match_format,date,ups_score\n\"P0,T20")  # half-written
+    assert manager.poll(force=True)
+    assert manager.wait_idle(timeout=10)
+    assert manager.current() is original
+    assert manager.stats()["rebuild_errors"] == 1
+
+    primary.unlink()  # the fallback now wins
+    assert manager.poll(force=True)
+    assert manager.wait_idle(timeout=10)
+    assert len(manager.current()) == 4
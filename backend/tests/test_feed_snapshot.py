@@ -0,0 +1,156 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+
+from plaix.services import anomaly_feed
+from plaix.services.feed_snapshot import FeedSnapshot, build_event_ids
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "player_id": ["P1", "P2", "P1", "P1"],
+            "date": ["2024-01-01", "2024-01-01", "2024-01-02", "2024-01-01"],
+            "match_format": ["T20", "ODI", "T20", "T20"],
+            "current_runs": [10, 20, 30, 40],
+        },
+        index=[7, 3, 5, 9],
+    )
+
+
+def test_event_ids_are_vectorized_and_indexed_by_position() -> None:
+    snapshot = FeedSnapshot.build(_frame())
+
+    assert list(snapshot.event_ids) == ["P1-2024-01-01-T20", "P2-2024-01-01-ODI", "P1-2024-01-02-T20", "P1-2024-01-01-T20"]
+    assert snapshot.position("P2-2024-01-01-ODI") == 1
+    assert snapshot.row("P1-2024-01-02-T20")["current_runs"] == 30
+    assert snapshot.row("missing") is None
+
+
+def test_duplicates_keep_first_row_or_raise_when_strict() -> None:
+    snapshot = FeedSnapshot.build(_frame())
+    assert snapshot.duplicate_event_ids == ("P1-2024-01-01-T20",)
+    assert snapshot.row("P1-2024-01-01-T20")["current_runs"] == 10
+
+    with pytest.raises(ValueError, match="duplicate"):
+        FeedSnapshot.build(_frame(), strict=True)
+
+
+def test_missing_id_columns_use_feed_defaults() -> None:
+    ids = build_event_ids(pd.DataFrame({"player_id": ["P1"]}))
+    assert list(ids) == ["P1--T20"]
+
+
+def test_get_event_detail_uses_index() -> None:
+    snapshot = FeedSnapshot.build(anomaly_feed._build_demo_dataset())
+    event_id = snapshot.event_ids[4]
+
+    assert anomaly_feed.get_event_detail(snapshot, event_id).equals(snapshot.df.iloc[4])
+    with pytest.raises(HTTPException):
+        anomaly_feed.get_event_detail(snapshot, "nope")
+
+
+def _ranked_frame(n: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    probs = np.round(rng.random(n), 2)
+    probs[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame(
+        {
+            "player_id": [f"P{i}" for i in range(n)],
+            "date": "2024-01-01",
+            "match_format": rng.choice(["T20", "ODI", "TEST"], n),
+            "ups_score": np.round(rng.normal(0, 2, n), 1),
+            "model_anomaly_probability": probs,
+        }
+    )
+
+
+def test_combined_score_is_precomputed() -> None:
+    snapshot = FeedSnapshot.build(_ranked_frame(50))
+    df = snapshot.df
+    expected = np.where(
+        df["model_anomaly_probability"].isna(),
+        df["ups_score"],
+        0.7 * df["ups_score"] + 1.5 * df["model_anomaly_probability"],
+    )
+    np.testing.assert_allclose(df["combined_score"], expected)
+
+
+@pytest.mark.parametrize(
+    "match_format, sort, min_ups, min_prob, limit",
+    [("ALL", "combined", 0.0, 0.0, 25), ("ODI", "ups", 1.0, 0.0, 40), ("TEST", "combined", -1.0, 0.5, 100), ("T20", "ups", 2.0, 0.3, 10)],
+)
+def test_top_matches_filter_then_sort(match_format, sort, min_ups, min_prob, limit) -> None:
+    snapshot = FeedSnapshot.build(_ranked_frame())
+    df = snapshot.df.assign(event_id=snapshot.event_ids)
+    key = "combined_score" if sort == "combined" else "ups_score"
+    mask = (df["ups_score"] >= min_ups) & (df["model_anomaly_probability"].fillna(0) >= min_prob)
+    if match_format != "ALL":
+        mask &= df["match_format"] == match_format
+    expected = df[mask].sort_values([key, "event_id"], ascending=[False, True]).index[:limit]
+
+    assert list(snapshot.top(match_format, sort=sort, min_ups=min_ups, min_prob=min_prob, limit=limit)) == list(expected)
+
+
+def test_list_feed_items_returns_ranked_items_without_mutating_snapshot() -> None:
+    snapshot = FeedSnapshot.build(anomaly_feed._build_demo_dataset())
+    before = snapshot.df.copy()
+
+    items = anomaly_feed.list_feed_items(snapshot, match_format="T20", limit=5)
+
+    assert 0 < len(items) <= 5
+    assert all(item["match_format"] == "T20" for item in items)
+    scores = [item["combined_score"] for item in items]
+    assert scores == sorted(scores, reverse=True)
+    assert items[0]["event_id"] == snapshot.event_ids[snapshot.position(items[0]["event_id"])]
+    pd.testing.assert_frame_equal(snapshot.df, before)
+    assert anomaly_feed.list_feed_items(snapshot, match_format="NOPE") == []
+
+
+def _walk(snapshot: FeedSnapshot, **params) -> list:
+    event_ids, cursor = [], None
+    while True:
+        page = anomaly_feed.list_feed_page(snapshot, cursor=cursor, **params)
+        event_ids.extend(item["event_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return event_ids
+
+
+@pytest.mark.parametrize("sort", ["combined", "ups"])
+def test_cursor_pages_walk_the_full_ranking(sort) -> None:
+    snapshot = FeedSnapshot.build(_ranked_frame())
+    params = {"match_format": "ODI", "sort": sort, "min_ups": -10.0, "min_prob": 0.2}
+    expected = list(snapshot.event_ids[snapshot.top(limit=len(snapshot), **params)])
+
+    walked = _walk(snapshot, limit=37, **params)
+
+    assert walked == expected
+    assert len(walked) > anomaly_feed.MAX_PAGE_SIZE
+
+
+def test_cursor_stays_valid_across_reload() -> None:
+    frame = _ranked_frame(300)
+    first = anomaly_feed.list_feed_page(FeedSnapshot.build(frame), limit=10)
+    last = first["items"][-1]
+
+    # Reload with extra rows ranked both above and below the cursor position.
+    extra = frame.head(20).assign(player_id=[f"NEW{i}" for i in range(20)], ups_score=np.linspace(-5, 9, 20))
+    reloaded = FeedSnapshot.build(pd.concat([extra, frame], ignore_index=True))
+    second = anomaly_feed.list_feed_page(reloaded, limit=10, cursor=first["next_cursor"])
+
+    ranked = [(reloaded.sort_key_value("combined", p), reloaded.event_ids[p]) for p in reloaded.top(limit=len(reloaded))]
+    after = [e for k, e in ranked if k < last["combined_score"] or (k == last["combined_score"] and e > last["event_id"])]
+    assert [item["event_id"] for item in second["items"]] == after[:10]
+    assert not {item["event_id"] for item in first["items"]} & set(after)
+
+
+def test_bad_cursors_are_rejected() -> None:
+    snapshot = FeedSnapshot.build(_ranked_frame(100))
+    cursor = anomaly_feed.list_feed_page(snapshot, limit=5)["next_cursor"]
+
+    for bad, params in [("not-a-cursor", {}), (cursor, {"sort": "ups"}), (cursor, {"match_format": "T20"})]:
+        with pytest.raises(HTTPException) as exc_info:
+            anomaly_feed.list_feed_page(snapshot, cursor=bad, **params)
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,56 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from plaix.services.feed_snapshot import FeedSnapshot
+from plaix.services.feed_store import read_feed_arrow, read_feed_csv, read_feed_file, write_feed_arrow
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "player_name": ["P1", "P2", "P3"],
+            "match_format": ["T20", "ODI", "TEST"],
+            "date": ["2024-01-01", "2024-01-02", "2024-01-03"],
+            "runs_scored": [10, 80, 35],
+            "ups_score": [0.1, 3.2, 1.4],
+            "model_anomaly_probability": [0.2, 0.9, 0.5],
+            "raw_notes": ["a", "b", "c"],
+        }
+    )
+
+
+def test_csv_import_projects_and_normalizes(tmp_path: Path) -> None:
+    path = tmp_path / "feed.csv"
+    _frame().to_csv(path, index=False)
+
+    df = read_feed_csv(path)
+
+    assert "raw_notes" not in df.columns
+    assert df["player_id"].tolist() == ["P1", "P2", "P3"]
+    assert df["current_runs"].tolist() == [10, 80, 35]
+
+
+def test_arrow_round_trip_matches_csv_import(tmp_path: Path) -> None:
+    csv_path = tmp_path / "feed.csv"
+    _frame().to_csv(csv_path, index=False)
+    arrow_path = write_feed_arrow(read_feed_csv(csv_path, columns=None), tmp_path / "feed.arrow")
+
+    from_arrow = read_feed_file(arrow_path)
+    from_csv = read_feed_file(csv_path)
+
+    pd.testing.assert_frame_equal(from_arrow[from_csv.columns], from_csv)
+    assert read_feed_arrow(arrow_path, columns=["player_id", "ups_score"]).columns.tolist() == ["player_id", "ups_score", "date"]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_snapshot_shares_mapped_numeric_columns(tmp_path: Path) -> None:
+    arrow_path = write_feed_arrow(_frame(), tmp_path / "feed.arrow")
+    df = read_feed_arrow(arrow_path)
+
+    snapshot = FeedSnapshot.build(df)
+
+    assert not df["ups_score"].to_numpy().flags.owndata
+    assert np.shares_memory(snapshot.ups, df["ups_score"].to_numpy())
+    assert snapshot.row("P2-2024-01-02-ODI")["current_runs"] == 80
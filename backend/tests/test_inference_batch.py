@@ -0,0 +1,101 @@
+import time
+from typing import Any, Dict, Iterable
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from plaix.api.inference import InferenceService
+from plaix.core.model import AnomalyModel
+
+HISTORY = [{"runs_scored": r} for r in (20, 22, 25, 18, 30, 24, 21)]
+
+
+class HistoryProvider:
+    def get_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        return HISTORY if player_id != "new" else []
+
+
+class CountingModel(AnomalyModel):
+    def __init__(self) -> None:
+        super().__init__(model_type="logistic_regression", model_config={}, sport="cricket")
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(200, 6)) * [5, 3, 20, 0.2, 0.2, 2] + [22, 10, 30, 0.5, 0.5, 4]
+        y = (X[:, 2] > X[:, 0] + X[:, 1]).astype(int)
+        self.model = LogisticRegression().fit(X, y)
+        self.proba_calls = 0
+        self.predict_calls = 0
+
+    def predict_proba(self, X: Any) -> Any:
+        self.proba_calls += 1
+        return super().predict_proba(X)
+
+    def predict(self, X: Any) -> Any:
+        self.predict_calls += 1
+        return super().predict(X)
+
+
+def _payloads(n: int) -> list[dict]:
+    return [
+        {
+            "player_id": "new" if i % 7 == 0 else f"P{i % 50}",
+            "match_format": "ODI" if i % 3 else "T20",
+            "current_runs": float((i * 13) % 120),
+            "baseline_mean_runs": 22,
+            "baseline_std_runs": 10,
+            "batting_position": 1 + i % 8,
+        }
+        for i in range(n)
+    ]
+
+
+def test_batch_matches_single_record_inference() -> None:
+    service = InferenceService(history_provider=HistoryProvider())
+    service.model = CountingModel()
+    payloads = _payloads(60)
+
+    batch = service.run_inference_batch([dict(p) for p in payloads], ["analyst"] * len(payloads))
+    single = [service.run_inference(dict(p)) for p in payloads]
+
+    # Matrix products may round differently for one row vs many, so probabilities are compared approximately.
+    for got, expected in zip(batch, single):
+        assert got.model_dump(exclude={"model_anomaly_probability"}) == expected.model_dump(exclude={"model_anomaly_probability"})
+        assert got.model_anomaly_probability == pytest.approx(expected.model_anomaly_probability, rel=1e-9, abs=1e-12)
+    assert {r.model_anomaly_label for r in batch} == {0, 1}
+
+
+def test_batch_uses_one_predict_proba_call_and_no_predict() -> None:
+    service = InferenceService(history_provider=HistoryProvider())
+    model = CountingModel()
+    service.model = model
+
+    started = time.perf_counter()
+    results = service.run_inference_batch(_payloads(10_000))
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 10_000
+    assert model.proba_calls == 1
+    assert model.predict_calls == 0
+    assert elapsed < 5.0
+
+
+def test_empty_batch() -> None:
+    service = InferenceService(history_provider=HistoryProvider())
+    assert service.run_inference_batch([]) == []
+
+
+def test_preprocessing_does_not_mutate_payloads() -> None:
+    service = InferenceService(history_provider=HistoryProvider())
+    service.model = CountingModel()
+    payload = {"player_id": "P1", "match_format": "T20", "current_runs": 70.0, "batting_position": 3}
+    original = dict(payload)
+
+    features = service.preprocess_input(payload)
+    matrix = service.preprocess_batch([payload, payload])
+    single = service.run_inference(payload)
+    batch = service.run_inference_batch([payload])
+
+    assert payload == original
+    assert features["baseline_mean_runs"] == 20.0 and features["batting_position"] == 3.0
+    assert matrix.shape == (2, len(features)) and matrix[0].tolist() == list(features.values())
+    assert single.model_dump(exclude={"model_anomaly_probability"}) == batch[0].model_dump(exclude={"model_anomaly_probability"})
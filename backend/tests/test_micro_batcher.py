@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from typing import Any, List
+
+import pytest
+
+from plaix.api.inference import InferenceService
+from plaix.services.micro_batcher import MicroBatcher
+from plaix.utils.metrics import Histogram
+
+
+class RecordingProcessor:
+    def __init__(self) -> None:
+        self.batches: List[List[Any]] = []
+
+    def __call__(self, items: List[Any]) -> List[Any]:
+        self.batches.append(list(items))
+        if any(item == "bad" for item in items):
+            raise ValueError("bad item")
+        return [item * 2 for item in items]
+
+
+def test_concurrent_requests_are_batched_and_fanned_out() -> None:
+    processor = RecordingProcessor()
+    batcher = MicroBatcher(processor, max_batch_size=8, max_wait_ms=50)
+
+    async def run() -> list:
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(run()) == [i * 2 for i in range(20)]
+    assert sorted(len(b) for b in processor.batches) == [4, 8, 8]
+    stats = batcher.stats()
+    assert stats["batch_size_count"] == 3 and stats["batch_size_le_8"] == 3
+    assert stats["queue_depth_count"] == 20 and stats["pending"] == 0
+
+
+def test_lone_request_waits_at_most_max_wait() -> None:
+    processor = RecordingProcessor()
+    batcher = MicroBatcher(processor, max_batch_size=64, max_wait_ms=20)
+
+    async def run() -> float:
+        started = time.perf_counter()
+        assert await batcher.submit(21) == 42
+        elapsed = time.perf_counter() - started
+        await batcher.close()
+        return elapsed
+
+    assert asyncio.run(run()) < 0.5
+    assert processor.batches == [[21]]
+
+
+def test_failed_batch_only_fails_bad_request() -> None:
+    processor = RecordingProcessor()
+    batcher = MicroBatcher(processor, max_batch_size=3, max_wait_ms=50)
+
+    async def run() -> list:
+        results = await asyncio.gather(batcher.submit(1), batcher.submit("bad"), batcher.submit(3), return_exceptions=True)
+        await batcher.close()
+        return results
+
+    ok_first, failed, ok_last = asyncio.run(run())
+    assert (ok_first, ok_last) == (2, 6)
+    assert isinstance(failed, ValueError)
+
+
+def test_batches_are_dispatched_concurrently_within_limit() -> None:
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, max
+
+    def slow(items: List[Any]) -> List[Any]:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.1)
+        with lock:
+            in_flight[0] -= 1
+        if "bad" in items:
+            raise ValueError("bad item")
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(slow, max_batch_size=3, max_wait_ms=1, max_in_flight=3)
+
+    async def run() -> list:
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(8)), batcher.submit("bad"), return_exceptions=True)
+        await batcher.close()
+        return results
+
+    started = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    assert results[:8] == [i * 2 for i in range(8)] and isinstance(results[8], ValueError)
+    assert in_flight[1] == 3
+    assert elapsed < 0.35  # 3 batches at once, then the failed batch's items retried at once
+    with pytest.raises(ValueError):
+        MicroBatcher(slow, max_in_flight=0)
+
+
+class DummyModel:
+    def predict_proba(self, X):
+        return [[0.3, 0.7] for _ in X]
+
+
+def test_batched_inference_matches_single_inference() -> None:
+    service = InferenceService()
+    service.model = DummyModel()
+    batcher = MicroBatcher(
+        lambda items: service.run_inference_batch([p for p, _, _ in items], [t for _, t, _ in items]), max_wait_ms=20
+    )
+    payloads = [
+        {"player_id": f"P{i}", "match_format": "T20", "current_runs": 10 * i, "baseline_mean_runs": 22, "baseline_std_runs": 10}
+        for i in range(6)
+    ]
+
+    async def run() -> list:
+        results = await asyncio.gather(*(batcher.submit((dict(p), "analyst", None)) for p in payloads))
+        await batcher.close()
+        return results
+
+    assert asyncio.run(run()) == [service.run_inference(dict(p)) for p in payloads]
+
+
+def test_histogram_cumulative_buckets() -> None:
+    histogram = Histogram([1, 4])
+    for value in (1, 2, 5, 3):
+        histogram.observe(value)
+
+    assert histogram.snapshot() == {"le_1": 1, "le_4": 3, "le_inf": 4, "count": 4, "sum": 11.0}
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
+
+
+def test_predict_single_endpoint_uses_micro_batcher(monkeypatch) -> None:
+    from fastapi.testclient import TestClient
+
+    from plaix.api import main
+
+    monkeypatch.setattr(main.inference_service, "model", DummyModel())
+    batcher = MicroBatcher(main._score_single_batch, max_wait_ms=5)
+    monkeypatch.setattr(main, "micro_batcher", batcher)
+    payload = {"player_id": "P1", "match_format": "T20", "current_runs": 70, "baseline_mean_runs": 22, "baseline_std_runs": 10}
+
+    with TestClient(main.app) as client:
+        response = client.post("/predict/single", json={"payload": payload})
+        metrics = client.get("/internal/metrics").json()
+
+    assert response.status_code == 200
+    assert response.json()["model_anomaly_probability"] == 0.7
+    assert metrics["micro_batch_batch_size_count"] == 1
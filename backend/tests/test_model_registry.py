@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from plaix.api import inference
+from plaix.api.inference import InferenceService
+from plaix.config import settings
+from plaix.core.model import AnomalyModel
+from plaix.core.model_registry import ModelRegistry
+
+PAYLOAD = {"player_id": "P1", "match_format": "T20", "current_runs": 60, "baseline_mean_runs": 22, "baseline_std_runs": 10}
+
+
+def _fitted_model(flip: bool = False) -> AnomalyModel:
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(200, 6)) * [5, 3, 20, 0.2, 0.2, 2] + [22, 10, 30, 0.5, 0.5, 4]
+    y = (X[:, 2] > X[:, 0] + X[:, 1]).astype(int)
+    model = AnomalyModel(model_type="logistic_regression", model_config={"max_iter": 500}, sport="cricket")
+    model.fit(X, 1 - y if flip else y)
+    return model
+
+
+def test_register_and_activate(tmp_path: Path) -> None:
+    registry = ModelRegistry(tmp_path)
+    assert registry.active_version() is None
+
+    first = registry.register(_fitted_model(), metadata={"metrics": {"accuracy": 0.9}})
+    second = registry.register(_fitted_model(flip=True), activate=False)
+
+    assert (first, second) == ("v0001", "v0002")
+    assert registry.versions() == ["v0001", "v0002"]
+    assert registry.active_version() == "v0001"
+    assert registry.metadata(first)["metrics"] == {"accuracy": 0.9}
+    assert registry.metadata(first)["model_type"] == "logistic_regression"
+
+    registry.activate(second)
+    version, model = registry.load(compiled=True)
+    assert version == "v0002" and model.is_compiled
+    with pytest.raises(ValueError):
+        registry.activate("v0999")
+    with pytest.raises(ValueError):
+        registry.register(_fitted_model(), version="v0001")
+
+
+def test_service_hot_swaps_active_version(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "model_registry_poll_seconds", 0.0)
+    registry = ModelRegistry(tmp_path)
+    registry.register(_fitted_model())
+    service = InferenceService(registry=registry)
+
+    before = service.run_inference(dict(PAYLOAD))
+    in_flight_version, in_flight_model = service._served
+    registry.register(_fitted_model(flip=True))
+    after = service.run_inference(dict(PAYLOAD))
+
+    assert before.model_version == "v0001"
+    assert after.model_version == "v0002"
+    assert after.model_anomaly_label != before.model_anomaly_label
+    # A request that captured the old pair keeps using it after the swap.
+    assert in_flight_version == "v0001" and in_flight_model is not service.model
+    assert service.refresh_model(force=True) is False
+
+
+def test_poll_interval_limits_registry_checks(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "model_registry_poll_seconds", 3600.0)
+    registry = ModelRegistry(tmp_path)
+    registry.register(_fitted_model())
+    service = InferenceService(registry=registry)
+    registry.register(_fitted_model(flip=True))
+
+    assert service.run_inference(dict(PAYLOAD)).model_version == "v0001"
+    assert service.refresh_model(force=True) is True
+    assert service.model_version == "v0002"
+
+
+def test_missing_model_logs_warning(tmp_path: Path, monkeypatch) -> None:
+    warnings = []
+    monkeypatch.setattr(inference.logger, "warning", lambda msg, *args: warnings.append(msg % args))
+
+    service = InferenceService(model_path=str(tmp_path / "missing.pkl"), registry=ModelRegistry(tmp_path / "registry"))
+
+    assert service.model_version is None
+    assert warnings and "missing.pkl" in warnings[0]
@@ -1,5 +1,12 @@
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from threadpoolctl import ThreadpoolController
+
+from plaix.core.compiled_model import CompiledLinearPredictor
 from plaix.core.model import AnomalyModel
 
 
@@ -53,3 +60,94 @@ def test_model_save_and_load_callable() -> None:
     model = FakeModel()
     model.save_model("path")
     model.load_model("path")
+
+
+def _training_data(n_classes: int = 2):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(300, 6)) * [5, 3, 20, 0.2, 0.2, 2] + [22, 10, 30, 0.5, 0.5, 4]
+    y = np.digitize(X[:, 2] - X[:, 0], np.linspace(-10, 30, n_classes + 1)[1:-1])
+    return X, y
+
+
+def test_compiled_predictor_matches_sklearn(tmp_path: Path) -> None:
+    X, y = _training_data()
+    model = AnomalyModel(model_type="logistic_regression", model_config={"max_iter": 500})
+    model.fit(X, y)
+    path = tmp_path / "model.pkl"
+    model.save_model(str(path))
+
+    compiled = AnomalyModel(model_type="logistic_regression")
+    compiled.load_model(str(path), compiled=True)
+
+    assert compiled.is_compiled and not model.is_compiled
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X), model.predict(X))
+    np.testing.assert_allclose(compiled.predict_proba(X[0]), model.predict_proba(X[:1]), rtol=1e-9, atol=1e-12)
+
+
+def test_compiled_predictor_multiclass_and_validation() -> None:
+    X, y = _training_data(n_classes=3)
+    estimator = LogisticRegression(max_iter=500).fit(X, y)
+    predictor = CompiledLinearPredictor.from_estimator(estimator)
+
+    np.testing.assert_allclose(predictor.predict_proba(X), estimator.predict_proba(X), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(predictor.predict(X), estimator.predict(X))
+    with pytest.raises(ValueError):
+        predictor.predict_proba(X[:, :3])
+    with pytest.raises(ValueError):
+        CompiledLinearPredictor.from_estimator(LogisticRegression())
+
+
+@pytest.mark.parametrize("multi_class", ["auto", "ovr", "multinomial"])
+def test_compiled_predictor_matches_binary_sklearn_for_each_multi_class(multi_class: str) -> None:
+    X, y = _training_data()
+    estimator = LogisticRegression(max_iter=500, multi_class=multi_class).fit(X, y)
+    predictor = CompiledLinearPredictor.from_estimator(estimator)
+
+    assert predictor.multinomial == (multi_class == "multinomial")
+    np.testing.assert_allclose(predictor.predict_proba(X), estimator.predict_proba(X), rtol=1e-9, atol=1e-12)
+    np.testing.assert_array_equal(predictor.predict(X), estimator.predict(X))
+
+
+@pytest.mark.parametrize("n_jobs", [None, 1, -1])
+def test_hist_gradient_boosting_backend(n_jobs) -> None:
+    X, y = _training_data()
+    model = AnomalyModel(model_type="hist_gradient_boosting", model_config={"n_jobs": n_jobs, "random_state": 0})
+
+    model.fit(X, y)
+    proba = model.predict_proba(X)
+
+    assert proba.shape == (len(X), 2)
+    assert (model.predict(X) == y).mean() > 0.9
+
+
+def test_hist_gradient_boosting_thread_cap_reuses_one_controller() -> None:
+    model = AnomalyModel(model_type="hist_gradient_boosting", model_config={"n_jobs": 2})
+    controller = model._threadpool_controller
+
+    with model._threads():
+        openmp = ThreadpoolController().select(user_api="openmp")
+        assert all(info["num_threads"] == 2 for info in openmp.info())
+    assert model._threadpool_controller is controller
+    assert AnomalyModel(model_type="hist_gradient_boosting", model_config={"n_jobs": -1})._threadpool_controller is None
+
+
+def test_isolation_forest_calibrated_probabilities() -> None:
+    rng = np.random.default_rng(4)
+    inliers = rng.normal(size=(5000, 6))
+    outliers = rng.uniform(-8.0, 8.0, size=(50, 6))
+    X = np.vstack([inliers, outliers])
+    y = np.r_[np.zeros(len(inliers), dtype=int), np.ones(len(outliers), dtype=int)]
+
+    unsupervised = AnomalyModel(model_type="isolation_forest", model_config={"n_jobs": 2, "random_state": 0})
+    unsupervised.fit(X, None)
+    forest_flags = (unsupervised.model.forest.predict(X) == -1).astype(int)
+    np.testing.assert_array_equal(unsupervised.predict(X), forest_flags)
+
+    calibrated = AnomalyModel(model_type="isolation_forest", model_config={"n_jobs": 2, "random_state": 0})
+    calibrated.fit(X, y)
+    proba = calibrated.predict_proba(X)[:, 1]
+    assert np.all((proba >= 0) & (proba <= 1))
+    assert proba[y == 1].mean() > 10 * proba[y == 0].mean()
+    # Parallel block scoring matches single-threaded scoring.
+    np.testing.assert_allclose(calibrated.model.anomaly_score(X), -calibrated.model.forest.decision_function(X))
@@ -0,0 +1,114 @@
+import asyncio
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from llm.anomaly_narrator import AnomalyEvent
+from llm.narration_cache import CachedAnomalyNarrator, NarrationCache, event_fingerprint
+
+EVENT = AnomalyEvent(
+    player_id="P1",
+    match_format="T20",
+    team="A",
+    opposition="B",
+    venue="V",
+    baseline_mean_runs=22.0,
+    baseline_std_runs=10.0,
+    current_runs=70.0,
+    ups_score=4.8,
+    ups_bucket="extreme_spike",
+    ups_anomaly_flag_baseline=1,
+    model_anomaly_probability=0.7,
+    model_anomaly_label=1,
+    match_context={"innings": 1},
+)
+
+
+class CountingLLMClient:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt, temperature=None, max_tokens=None) -> str:
+        self.calls += 1
+        if "summary_title" in prompt:
+            return '{"summary_title": "Trend", "summary_body": "Up"}'
+        return '{"narrative_title": "Spike", "narrative_summary": "Big innings"}'
+
+
+class AsyncCountingLLMClient(CountingLLMClient):
+    async def agenerate(self, prompt, temperature=None, max_tokens=None) -> str:
+        return self.generate(prompt, temperature, max_tokens)
+
+
+def test_fingerprint_is_stable_and_value_based() -> None:
+    numpy_event = replace(EVENT, current_runs=np.float64(70.0), model_anomaly_label=np.int64(1))
+
+    assert event_fingerprint("d", "analyst", EVENT) == event_fingerprint("d", "analyst", numpy_event)
+    assert event_fingerprint("d", "analyst", EVENT) != event_fingerprint("d", "casual", EVENT)
+    assert event_fingerprint("d", "analyst", EVENT) != event_fingerprint("d", "analyst", replace(EVENT, current_runs=71.0))
+
+
+def test_cached_narrator_reuses_descriptions_and_summaries() -> None:
+    client = CountingLLMClient()
+    narrator = CachedAnomalyNarrator(client, NarrationCache(maxsize=8))
+
+    first = narrator.generate_description(EVENT)
+    again = narrator.generate_description(replace(EVENT))
+    other_tone = narrator.generate_description(EVENT, tone="casual")
+    summaries = [narrator.generate_sequence_summary([EVENT, EVENT]) for _ in range(3)]
+
+    assert first == again == {"narrative_title": "Spike", "narrative_summary": "Big innings"}
+    assert other_tone == first
+    assert summaries[0] == summaries[2] == {"summary_title": "Trend", "summary_body": "Up"}
+    assert client.calls == 3
+    first["narrative_title"] = "mutated"
+    assert narrator.generate_description(EVENT)["narrative_title"] == "Spike"
+
+
+def test_disk_cache_survives_restart(tmp_path: Path) -> None:
+    path = tmp_path / "narrations.sqlite"
+    cache = NarrationCache(maxsize=1, path=path)
+    CachedAnomalyNarrator(CountingLLMClient(), cache).generate_description(EVENT)
+    cache.close()
+
+    client = CountingLLMClient()
+    restarted = CachedAnomalyNarrator(client, NarrationCache(maxsize=1, path=path))
+
+    assert restarted.generate_description(EVENT)["narrative_title"] == "Spike"
+    assert client.calls == 0
+
+
+@pytest.mark.parametrize("client_type", [CountingLLMClient, AsyncCountingLLMClient])
+def test_async_describe_keeps_disk_tier_off_the_event_loop(tmp_path: Path, client_type) -> None:
+    cache = NarrationCache(maxsize=8, path=tmp_path / "narrations.sqlite")
+    client = client_type()
+    narrator = CachedAnomalyNarrator(client, cache)
+    query_threads: list = []
+    cache._conn.set_trace_callback(lambda _: query_threads.append(threading.current_thread()))
+
+    async def describe_twice() -> tuple:
+        loop_thread = threading.current_thread()
+        first = await narrator.agenerate_description(EVENT)
+        second = await narrator.agenerate_description(EVENT)  # memory hit: no disk access
+        return loop_thread, first, second
+
+    loop_thread, first, second = asyncio.run(describe_twice())
+
+    assert first == second == {"narrative_title": "Spike", "narrative_summary": "Big innings"}
+    assert query_threads and loop_thread not in query_threads
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert client.calls == 1
+
+
+def test_lru_eviction() -> None:
+    cache = NarrationCache(maxsize=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"v": key})
+
+    assert cache.get("a") is None and cache.get("c") == {"v": "c"}
+    assert len(cache) == 2
+    with pytest.raises(ValueError):
+        NarrationCache(maxsize=0)
@@ -0,0 +1,156 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from plaix.api.inference import InferenceService
+from plaix.config import Settings
+from plaix.services.narration_worker import NarrationWorker
+from llm.anomaly_narrator import AnomalyEvent
+from llm.narration_cache import NarrationCache
+
+PAYLOAD = {"player_id": "P1", "match_format": "T20", "current_runs": 70, "baseline_mean_runs": 22, "baseline_std_runs": 10}
+
+
+class DummyModel:
+    def predict_proba(self, X):
+        return [[0.3, 0.7] for _ in X]
+
+
+def _event() -> AnomalyEvent:
+    return AnomalyEvent(
+        player_id="P1",
+        match_format="T20",
+        team=None,
+        opposition=None,
+        venue=None,
+        baseline_mean_runs=22.0,
+        baseline_std_runs=10.0,
+        current_runs=70.0,
+        ups_score=4.8,
+        ups_bucket="extreme_spike",
+        ups_anomaly_flag_baseline=1,
+        model_anomaly_probability=0.7,
+        model_anomaly_label=1,
+    )
+
+
+def test_worker_reports_pending_then_done() -> None:
+    release = threading.Event()
+
+    def narrate(event, tone):
+        release.wait(5)
+        return {"narrative_title": f"{tone} title", "narrative_summary": event.player_id}
+
+    worker = NarrationWorker(narrate, max_workers=1)
+    narration_id = worker.submit(_event(), "casual")
+
+    assert worker.get(narration_id)["status"] == "pending"
+    release.set()
+    result = worker.get(narration_id, wait=5)
+    assert result == {"narration_id": narration_id, "status": "done", "narrative_title": "casual title", "narrative_summary": "P1"}
+    assert worker.get("unknown") is None
+    worker.shutdown()
+
+
+def test_worker_marks_failures_and_evicts_oldest() -> None:
+    def narrate(event, tone):
+        raise RuntimeError("llm down")
+
+    worker = NarrationWorker(narrate, max_workers=1, max_jobs=2)
+    ids = [worker.submit(_event()) for _ in range(3)]
+
+    assert worker.get(ids[0]) is None
+    assert worker.get(ids[2], wait=5)["status"] == "failed"
+    assert worker.stats()["retained"] == 2
+    worker.shutdown()
+    # Threads restart on the next submission after shutdown.
+    assert worker.get(worker.submit(_event()), wait=5)["status"] == "failed"
+    worker.shutdown()
+
+
+def test_ids_resolve_across_workers_sharing_a_sqlite_store(tmp_path: Path) -> None:
+    release = threading.Event()
+
+    def narrate(event, tone):
+        release.wait(5)
+        return {"narrative_title": "shared", "narrative_summary": event.player_id}
+
+    # Two workers with their own caches over one file stand in for two server processes.
+    issuing = NarrationWorker(narrate, max_workers=1, store=NarrationCache(path=tmp_path / "narrations.db"))
+    other = NarrationWorker(narrate, max_workers=1, store=NarrationCache(path=tmp_path / "narrations.db"))
+    narration_id = issuing.submit(_event())
+    assert issuing.flush(timeout=5)
+
+    assert other.future(narration_id) is None
+    assert other.get(narration_id)["status"] == "pending"
+    threading.Timer(0.1, release.set).start()
+    result = other.get(narration_id, wait=5)
+    assert result == {"narration_id": narration_id, "status": "done", "narrative_title": "shared", "narrative_summary": "P1"}
+    assert other.get("unknown") is None
+    assert NarrationWorker(narrate, store=NarrationCache()).store is None  # memory-only caches are not shared
+    issuing.shutdown()
+
+
+def test_job_records_are_kept_apart_from_narrations_and_expire(tmp_path: Path) -> None:
+    store = NarrationCache(path=tmp_path / "narrations.db")
+    worker = NarrationWorker(lambda event, tone: {"narrative_title": "t"}, max_workers=1, store=store, job_ttl_seconds=60)
+    narration_id = worker.submit(_event())
+    assert worker.get(narration_id, wait=5)["status"] == "done"
+    assert worker.flush(timeout=5)
+
+    assert store.get_job(narration_id)["status"] == "done"
+    assert store.get(narration_id) is None and len(store) == 0
+    assert store.expire_jobs(60) == 0
+    assert store.expire_jobs(-1) == 1
+    assert store.get_job(narration_id) is None
+    worker.shutdown()
+
+
+def test_default_narration_mode_is_validated() -> None:
+    assert Settings(default_narration_mode="deferred").default_narration_mode == "deferred"
+    with pytest.raises(ValidationError):
+        Settings(default_narration_mode="later")
+
+
+def test_deferred_and_skipped_narration_modes() -> None:
+    service = InferenceService()
+    service.model = DummyModel()
+    slow_narrate = service.narrator.generate_description
+
+    def narrate(event, tone="analyst"):
+        time.sleep(0.2)
+        return slow_narrate(event, tone=tone)
+
+    service.narrator.generate_description = narrate
+
+    started = time.perf_counter()
+    deferred = service.run_inference(dict(PAYLOAD), narration="deferred")
+    elapsed = time.perf_counter() - started
+    skipped = service.run_inference(dict(PAYLOAD), narration="none")
+    inline = service.run_inference(dict(PAYLOAD))
+
+    assert elapsed < 0.2
+    assert deferred.narrative_title is None and deferred.narration_id is not None
+    assert skipped.narrative_title is None and skipped.narration_id is None
+    assert inline.narrative_title is not None and inline.narration_id is None
+    fetched = service.narration_worker.get(deferred.narration_id, wait=5)
+    assert fetched["status"] == "done" and fetched["narrative_title"] == inline.narrative_title
+    service.narration_worker.shutdown()
+
+
+def test_narration_endpoint_long_polls(monkeypatch) -> None:
+    from plaix.api import main
+
+    monkeypatch.setattr(main.inference_service, "model", DummyModel())
+    with TestClient(main.app) as client:
+        scored = client.post("/predict/single", json={"payload": PAYLOAD, "narration": "deferred"}).json()
+        fetched = client.get(f"/narration/{scored['narration_id']}", params={"wait_ms": 5000}).json()
+        missing = client.get("/narration/unknown")
+
+    assert scored["narrative_title"] is None
+    assert fetched["status"] == "done" and fetched["narrative_title"]
+    assert missing.status_code == 404
@@ -0,0 +1,91 @@
+import asyncio
+import random
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pytest
+
+from plaix.core.online_baseline import OnlineBaselineState, OnlineBaselineStore
+from plaix.core.ups_scorer import UPSScorer
+
+
+class CountingHistoryProvider:
+    """History provider backed by a dict, counting lookups."""
+
+    def __init__(self, data: Dict[Tuple[str, str], List[float]]) -> None:
+        self.data = data
+        self.calls = 0
+
+    def get_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        self.calls += 1
+        return [{"runs_scored": r} for r in self.data.get((player_id, match_format), [])]
+
+
+def test_state_matches_full_recompute_over_many_appends() -> None:
+    rnd = random.Random(7)
+    state = OnlineBaselineState(window_size=10, decay_lambda=0.3)
+    history: List[float] = []
+    reference = UPSScorer(CountingHistoryProvider({}))
+    for _ in range(57):
+        runs = rnd.uniform(0, 150)
+        state.append(runs)
+        history.insert(0, runs)
+        mean, std, n = state.stats()
+        ref_mean, ref_std, ref_n = reference._compute_weighted_stats(history[:10])
+        assert (mean, std, n) == (ref_mean, ref_std, ref_n)
+    assert state.recent_runs() == history[:10]
+
+
+def test_scorer_online_mode_reads_history_once() -> None:
+    provider = CountingHistoryProvider({("P1", "T20"): [20, 22, 25, 18, 30, 24]})
+    store = OnlineBaselineStore(window_size=10, decay_lambda=0.3)
+    scorer = UPSScorer(provider, online_store=store)
+    offline = UPSScorer(CountingHistoryProvider({("P1", "T20"): [20, 22, 25, 18, 30, 24]}))
+
+    first = scorer.compute_player_baseline("P1", "T20")
+    assert first.mean_runs == pytest.approx(offline.compute_player_baseline("P1", "T20").mean_runs)
+
+    scorer.record_innings("P1", "T20", 95)
+    scorer.record_innings("P1", "T20", 80)
+    updated = scorer.score_innings("P1", "T20", current_runs=60)
+    batch = scorer.score_innings_batch(["P1"], ["T20"], [60])
+
+    assert provider.calls == 1
+    assert updated["baseline_mean_runs"] > first.mean_runs
+    assert batch[0] == updated
+
+
+def test_record_innings_builds_state_for_new_player() -> None:
+    provider = CountingHistoryProvider({})
+    scorer = UPSScorer(provider, min_history=3, online_store=OnlineBaselineStore())
+    for runs in (10, 20, 30):
+        scorer.record_innings("NEW", "ODI", runs)
+
+    baseline = scorer.compute_player_baseline("NEW", "ODI")
+    assert baseline.source == "player"
+    assert baseline.num_innings == 3
+    assert provider.calls == 1
+
+
+def test_store_config_must_match_scorer() -> None:
+    with pytest.raises(ValueError):
+        UPSScorer(CountingHistoryProvider({}), window_size=5, online_store=OnlineBaselineStore(window_size=10))
+
+
+def test_async_baseline_does_not_overwrite_state_recorded_during_lookup() -> None:
+    class SlowProvider(CountingHistoryProvider):
+        async def aget_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+            history = self.get_player_innings_history(player_id, match_format)
+            scorer.record_innings(player_id, match_format, 99)  # lands while the lookup is in flight
+            await asyncio.sleep(0)
+            return history
+
+    provider = SlowProvider({("P1", "T20"): [20, 22, 25, 18, 30]})
+    store = OnlineBaselineStore()
+    scorer = UPSScorer(provider, online_store=store)
+
+    baseline = asyncio.run(scorer.compute_player_baseline_async("P1", "T20"))
+
+    assert store.get("P1", "T20").recent_runs() == [99, 20, 22, 25, 18, 30]
+    assert baseline.num_innings == 6
+    assert store.stats("P1", "T20") == store.get("P1", "T20").stats()
+    assert store.stats("NOPE", "T20") is None
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from llm.anomaly_narrator import AnomalyEvent, AnomalyNarrator
+from llm.narration_cache import CachedAnomalyNarrator, NarrationCache
+from llm.openai_client import OpenAILLMClient
+
+
+class _StubState:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.peers = set()
+
+
+def _start_stub(state: _StubState):
+    """Minimal OpenAI-compatible chat completions server echoing the player id from the prompt."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive
+
+        def do_POST(self):  # noqa: N802 - http.server API
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            with state.lock:
+                state.requests += 1
+                state.peers.add(self.client_address)
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                time.sleep(state.delay)
+                prompt = body["messages"][0]["content"]
+                player = re.search(r'"player_id": "([^"]+)"', prompt).group(1)
+                content = json.dumps({"narrative_title": f"LLM {player}", "narrative_summary": "stub"})
+                payload = json.dumps(
+                    {
+                        "id": "cmpl-stub",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": body["model"],
+                        "choices": [
+                            {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}
+                        ],
+                    }
+                ).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.handle_error = lambda request, client_address: None  # clients that timed out hang up early
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(delay: float = 0.0):
+        state = _StubState(delay)
+        server, url = _start_stub(state)
+        servers.append(server)
+        return state, url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _event(player_id: str) -> AnomalyEvent:
+    return AnomalyEvent(
+        player_id=player_id,
+        match_format="T20",
+        team=None,
+        opposition=None,
+        venue=None,
+        baseline_mean_runs=20.0,
+        baseline_std_runs=10.0,
+        current_runs=80.0,
+        ups_score=6.0,
+        ups_bucket="extreme_spike",
+        ups_anomaly_flag_baseline=1,
+        model_anomaly_probability=0.9,
+        model_anomaly_label=1,
+    )
+
+
+def test_generate_reuses_keep_alive_connection(stub):
+    state, url = stub()
+    client = OpenAILLMClient(api_key="test", base_url=url, timeout=5)
+    narrator = AnomalyNarrator(client)
+
+    titles = [narrator.generate_description(_event(f"P{i}"))["narrative_title"] for i in range(5)]
+
+    assert titles == [f"LLM P{i}" for i in range(5)]
+    assert state.requests == 5
+    assert len(state.peers) == 1
+    client.close()
+
+
+def test_async_batch_runs_concurrently_within_limit(stub):
+    state, url = stub(delay=0.1)
+    client = OpenAILLMClient(api_key="test", base_url=url, timeout=5, max_concurrency=4)
+    narrator = AnomalyNarrator(client)
+    events = [_event(f"P{i}") for i in range(12)]
+
+    start = time.perf_counter()
+    narratives = asyncio.run(narrator.agenerate_descriptions(events, ["analyst"] * len(events)))
+    elapsed = time.perf_counter() - start
+
+    assert [n["narrative_title"] for n in narratives] == [f"LLM P{i}" for i in range(12)]
+    assert 1 < state.max_in_flight <= 4
+    assert elapsed < 12 * 0.1
+
+
+def test_sync_batch_narration_is_parallel_and_ordered(stub):
+    state, url = stub(delay=0.1)
+    client = OpenAILLMClient(api_key="test", base_url=url, timeout=5, max_concurrency=4)
+    narrator = AnomalyNarrator(client)
+    events = [_event(f"P{i}") for i in range(8)]
+
+    narratives = narrator.generate_descriptions(events, ["casual"] * len(events))
+
+    assert [n["narrative_title"] for n in narratives] == [f"LLM P{i}" for i in range(8)]
+    assert 1 < state.max_in_flight <= 4
+    client.close()
+
+
+def test_timeout_falls_back_to_rule_based_and_is_not_cached(stub):
+    _, url = stub(delay=1.0)
+    client = OpenAILLMClient(api_key="test", base_url=url, timeout=0.2)
+    narrator = CachedAnomalyNarrator(client, NarrationCache(maxsize=8))
+    event = _event("P1")
+    expected = narrator._build_rule_based_narrative(event, "analyst")
+
+    start = time.perf_counter()
+    assert narrator.generate_description(event) == expected
+    assert asyncio.run(narrator.agenerate_description(event)) == expected
+    assert time.perf_counter() - start < 1.5
+    assert len(narrator.cache) == 0
+    client.close()
+
+
+def test_async_clients_are_closed_on_loop_change_and_aclose(stub):
+    _, url = stub()
+    client = OpenAILLMClient(api_key="test", base_url=url, timeout=5)
+    narrator = AnomalyNarrator(client)
+
+    asyncio.run(narrator.agenerate_description(_event("P1")))
+    first = client._async_client
+
+    async def second_loop():
+        await narrator.agenerate_description(_event("P2"))
+        second = client._async_client
+        await client.aclose()
+        return second
+
+    second = asyncio.run(second_loop())
+
+    assert first is not second
+    assert first.is_closed() and second.is_closed()
+    assert client._client.is_closed() and client._async_client is None
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from plaix.core.baseline_cache import BaselineCache
+from plaix.core.role_baselines import RoleBaselineTable
+from plaix.core.ups_scorer import UPSScorer
+
+
+class EmptyHistoryProvider:
+    def get_player_innings_history(self, player_id, match_format):
+        return []
+
+
+def _dataset() -> pd.DataFrame:
+    rows = []
+    for i in range(40):
+        rows.append({"player_id": f"A{i % 4}", "match_format": "T20", "team": "Lions", "batting_position": 1, "runs_scored": 30 + (i % 5) * 10, "date": f"2024-01-{(i % 28) + 1:02d}"})
+        rows.append({"player_id": f"B{i % 4}", "match_format": "T20", "team": "Tigers", "batting_position": 1, "runs_scored": 10 + (i % 3), "date": f"2024-01-{(i % 28) + 1:02d}"})
+    rows.append({"player_id": "SOLO", "match_format": "T20", "team": "Eagles", "batting_position": 1, "runs_scored": 99, "date": "2024-02-01"})
+    return pd.DataFrame(rows)
+
+
+def test_from_dataframe_tiers_and_min_innings() -> None:
+    df = _dataset()
+    table = RoleBaselineTable.from_dataframe(df, min_innings=20)
+
+    lions = df[df["team"] == "Lions"]["runs_scored"]
+    mean, std, n = table.lookup_team_role("T20", "Lions", 1)
+    assert (mean, n) == (pytest.approx(lions.mean()), 40)
+    assert std == pytest.approx(lions.std())
+    assert table.lookup_team_role("T20", "Eagles", 1) is None  # below min_innings
+    assert table.lookup_global("T20", 1)[2] == 81
+    assert table.lookup_global("T20", 7) == table.lookup_global("T20")
+    assert table.lookup_global("ODI") is None
+    assert table.player_role("SOLO", "T20") == ("Eagles", 1)
+
+
+def test_save_load_roundtrip(tmp_path: Path) -> None:
+    table = RoleBaselineTable.from_dataframe(_dataset(), min_innings=20)
+    path = tmp_path / "role_baselines.json"
+    table.save(path)
+
+    loaded = RoleBaselineTable.load(path)
+
+    assert loaded.team_role == table.team_role
+    assert loaded.role == table.role
+    assert loaded.format_stats == table.format_stats
+    assert loaded.player_roles == table.player_roles
+
+
+def test_scorer_uses_table_for_fallbacks() -> None:
+    table = RoleBaselineTable.from_dataframe(_dataset(), min_innings=20)
+    scorer = UPSScorer(EmptyHistoryProvider(), role_baselines=table)
+
+    lions = scorer.compute_player_baseline("A1", "T20")
+    assert lions.source == "team_role_fallback"
+    assert lions.mean_runs == pytest.approx(table.lookup_team_role("T20", "Lions", 1)[0])
+
+    solo = scorer.compute_player_baseline("SOLO", "T20")
+    assert solo.source == "global_fallback"
+    assert solo.num_innings == 81
+
+    unknown = scorer.compute_player_baseline("NOBODY", "ODI")
+    assert unknown.source == "default"
+
+    tigers = scorer.compute_player_baseline("B0", "T20")
+    assert tigers.std_runs == scorer.sigma_min  # tiny spread clamped by sigma_min
+
+
+def test_scorer_without_table_keeps_constant_fallbacks() -> None:
+    baseline = UPSScorer(EmptyHistoryProvider()).compute_player_baseline("X", "T20")
+    assert (baseline.mean_runs, baseline.source) == (25.0, "team_role_fallback")
+
+
+def test_innings_role_selects_fallback_tier_for_unknown_players() -> None:
+    table = RoleBaselineTable.from_dataframe(_dataset(), min_innings=20)
+    scorer = UPSScorer(EmptyHistoryProvider(), role_baselines=table)
+    tigers_mean = table.lookup_team_role("T20", "Tigers", 1)[0]
+
+    debut = scorer.compute_player_baseline("DEBUT", "T20", team="Tigers", batting_position=1)
+    assert (debut.source, debut.mean_runs) == ("team_role_fallback", pytest.approx(tigers_mean))
+    assert scorer.compute_player_baseline("DEBUT", "T20", batting_position=1).num_innings == 81
+    assert scorer.compute_player_baseline("DEBUT", "T20").source == "global_fallback"
+
+    moved = scorer.compute_player_baseline("A1", "T20", team="Tigers")  # position from the table
+    assert moved.mean_runs == pytest.approx(tigers_mean)
+
+    batch = scorer.score_innings_batch(["DEBUT", "DEBUT"], ["T20", "T20"], [40, 40], teams=["Tigers", None], batting_positions=[1, None])
+    assert batch[0] == scorer.score_innings("DEBUT", "T20", 40, team="Tigers", batting_position=1)
+    assert batch[1] == scorer.score_innings("DEBUT", "T20", 40)
+    assert batch[0]["baseline_mean_runs"] != batch[1]["baseline_mean_runs"]
+
+
+def test_bucket_thresholds_follow_the_innings_role() -> None:
+    table = RoleBaselineTable.from_dataframe(_dataset(), min_innings=20)
+    scorer = UPSScorer(EmptyHistoryProvider(), baseline_cache=BaselineCache(), role_baselines=table)
+
+    tigers = scorer.get_bucket_thresholds("DEBUT", "T20", team="Tigers", batting_position=1)
+    default = scorer.get_bucket_thresholds("DEBUT", "T20")
+    assert tigers.baseline == scorer.compute_player_baseline("DEBUT", "T20", team="Tigers", batting_position=1)
+    assert tigers.mild_runs < default.mild_runs
+    assert scorer.get_bucket_thresholds("DEBUT", "T20", team="Tigers", batting_position=1) is tigers
+    for runs in (0, 15, 25, 40, 60, 90):
+        scored = scorer.score_innings("DEBUT", "T20", runs, team="Tigers", batting_position=1)
+        assert scorer.classify_runs("DEBUT", "T20", runs, team="Tigers", batting_position=1) == (
+            scored["ups_anomaly_flag"],
+            scored["ups_bucket"],
+        )
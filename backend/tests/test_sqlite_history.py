@@ -0,0 +1,106 @@
+import threading
+from pathlib import Path
+
+from plaix.api.inference import InferenceService
+from plaix.core.ups_scorer import UPSScorer
+from plaix.history import sqlite as sqlite_history
+from plaix.history.sqlite import SQLiteHistoryProvider
+
+
+def _provider(tmp_path: Path) -> SQLiteHistoryProvider:
+    provider = SQLiteHistoryProvider(tmp_path / "history.db")
+    provider.add_innings(
+        [{"player_id": "P1", "match_format": "T20", "date": f"2024-01-{d:02d}", "runs_scored": r} for d, r in enumerate((10, 20, 30, 40, 50, 60), start=1)]
+        + [{"player_id": "P2", "match_format": "ODI", "date": "2024-02-01", "current_runs": 77}]
+    )
+    return provider
+
+
+def test_history_is_most_recent_first_and_wal(tmp_path: Path) -> None:
+    provider = _provider(tmp_path)
+
+    history = provider.get_player_innings_history("P1", "T20")
+    assert [h["runs_scored"] for h in history] == [60, 50, 40, 30, 20, 10]
+    assert history[0]["date"] == "2024-01-06"
+    assert provider.get_recent_runs("P1", "T20", limit=2) == [60, 50]
+    assert provider.get_player_innings_history("P1", "ODI") == []
+    mode = provider._connection().execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+    provider.close()
+
+
+def test_bulk_histories_span_chunks(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(sqlite_history, "BULK_CHUNK_SIZE", 1)
+    provider = SQLiteHistoryProvider(tmp_path / "history.db")
+    provider.add_innings([{"player_id": "P1", "match_format": "T20", "date": "2024-01-01", "runs_scored": 5}])
+    provider.add_innings([{"player_id": "P2", "match_format": "ODI", "date": "2024-01-01", "runs_scored": 9}])
+
+    histories = provider.get_many_player_innings_histories([("P1", "T20"), ("P2", "ODI"), ("P3", "T20")], limit=3)
+
+    assert [h["runs_scored"] for h in histories[("P1", "T20")]] == [5]
+    assert [h["runs_scored"] for h in histories[("P2", "ODI")]] == [9]
+    assert histories[("P3", "T20")] == []
+
+
+def test_connections_are_per_thread(tmp_path: Path) -> None:
+    provider = _provider(tmp_path)
+    seen = []
+
+    def worker() -> None:
+        seen.append((provider._connection(), provider.get_recent_runs("P1", "T20", limit=1)))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(conn) for conn, _ in seen}) == 3
+    assert all(runs == [60] for _, runs in seen)
+    provider.close()
+
+
+def test_scorer_and_inference_service_use_sqlite(tmp_path: Path) -> None:
+    provider = _provider(tmp_path)
+    scorer = UPSScorer(provider)
+
+    baseline = scorer.compute_player_baseline("P1", "T20")
+    batch = scorer.score_innings_batch(["P1", "P2"], ["T20", "ODI"], [90, 10])
+    assert baseline.source == "player"
+    assert batch[0] == scorer.score_innings("P1", "T20", 90)
+
+    service = InferenceService(history_provider=provider)
+    assert service.ups_scorer.compute_player_baseline("P1", "T20") == baseline
+
+
+def test_batch_scoring_issues_one_statement_per_chunk(tmp_path: Path) -> None:
+    provider = SQLiteHistoryProvider(tmp_path / "history.db")
+    provider.add_innings(
+        {"player_id": f"P{p}", "match_format": "T20", "date": f"2024-01-{d:02d}", "runs_scored": 10 * d} for p in range(50) for d in range(1, 8)
+    )
+    scorer = UPSScorer(provider)
+    statements: list = []
+    provider._connection().set_trace_callback(statements.append)
+
+    batch = scorer.score_innings_batch([f"P{p}" for p in range(50)], ["T20"] * 50, [90] * 50)
+
+    assert len(statements) == 1
+    assert batch[7] == scorer.score_innings("P7", "T20", 90)
+    provider.close()
+
+
+def test_inference_service_sees_innings_written_by_another_connection(tmp_path: Path) -> None:
+    provider = _provider(tmp_path)
+    service = InferenceService(history_provider=provider)
+    before = service.ups_scorer.compute_player_baseline("P1", "T20")
+    assert service.ups_scorer.compute_player_baseline("P1", "T20") is before
+
+    writer = SQLiteHistoryProvider(provider.path)
+    writer.add_innings({"player_id": "P1", "match_format": "T20", "date": f"2025-01-0{d}", "runs_scored": 100} for d in range(1, 7))
+    writer.close()
+
+    assert service.refresh_history(force=True) == 1
+    after = service.ups_scorer.compute_player_baseline("P1", "T20")
+    assert after.mean_runs > before.mean_runs
+    assert service.refresh_history(force=True) == 0
+    provider.close()
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from plaix.core.feature_schema import FEATURE_COLUMNS, FEATURE_SCHEMA
+from plaix.core.model import AnomalyModel
+from plaix.pipeline.streaming_training import iter_csv_chunks, train_incremental
+
+LABEL = "ups_anomaly_flag"
+
+
+def _write_dataset(path: Path, n: int = 3000) -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame(
+        {
+            "baseline_mean_runs": rng.uniform(10, 40, n),
+            "baseline_std_runs": rng.uniform(5, 15, n),
+            "current_runs": rng.uniform(0, 120, n),
+            "venue_flatness": rng.uniform(0, 1, n),
+            "opposition_strength": rng.uniform(0, 1, n),
+            "batting_position": rng.integers(1, 9, n),
+            "unused_text": "x",
+        }
+    )
+    df[LABEL] = ((df["current_runs"] - df["baseline_mean_runs"]) / df["baseline_std_runs"] >= 2).astype(int)
+    df.to_csv(path, index=False)
+    return df
+
+
+def test_iter_csv_chunks_bounds_chunk_size(tmp_path: Path) -> None:
+    _write_dataset(tmp_path / "innings.csv", n=1050)
+
+    chunks = list(iter_csv_chunks(tmp_path / "innings.csv", LABEL, chunksize=200))
+
+    assert [len(rows) for rows, _, _ in chunks] == [200] * 5 + [50]
+    assert chunks[-1][0][0] == 1000
+    assert chunks[0][1].shape == (200, len(FEATURE_COLUMNS)) and chunks[0][1].dtype == np.float32
+
+
+def test_streaming_training_learns_and_compiles(tmp_path: Path) -> None:
+    df = _write_dataset(tmp_path / "innings.csv")
+    model = AnomalyModel(model_type="sgd_logistic", model_config={"random_state": 0})
+
+    metrics = train_incremental(
+        model, lambda: iter_csv_chunks(tmp_path / "innings.csv", LABEL, chunksize=250), epochs=3
+    )
+
+    assert metrics["n_train"] + metrics["n_val"] == len(df)
+    assert metrics["accuracy"] > 0.9
+    X = FEATURE_SCHEMA.transform_frame(df)
+    expected = model.predict_proba(X)
+    model.compile()
+    assert model.is_compiled
+    np.testing.assert_allclose(model.predict_proba(X), expected, rtol=1e-7, atol=1e-10)
+
+
+def test_partial_fit_requires_incremental_backend() -> None:
+    model = AnomalyModel(model_type="logistic_regression")
+    with pytest.raises(AttributeError):
+        model.partial_fit([[1.0] * 6], [0])
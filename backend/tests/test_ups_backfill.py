@@ -0,0 +1,100 @@
+import random
+from pathlib import Path
+
+import pandas as pd
+
+from plaix.core.role_baselines import RoleBaselineTable
+from plaix.core.ups_scorer import UPSScorer
+from plaix.pipeline.ups_backfill import backfill_ups, write_backfill
+
+
+class PriorInningsProvider:
+    """Serves the innings strictly before a cutoff, most recent first."""
+
+    def __init__(self) -> None:
+        self.history = []
+
+    def get_player_innings_history(self, player_id, match_format):
+        return self.history
+
+
+def _career_frame(n_rows: int = 400, seed: int = 3) -> pd.DataFrame:
+    rnd = random.Random(seed)
+    rows = [
+        {
+            "player_id": f"P{rnd.randint(0, 9)}",
+            "match_format": rnd.choice(["T20", "ODI"]),
+            "date": f"20{rnd.randint(10, 23)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+            "runs_scored": rnd.randint(0, 150),
+        }
+        for _ in range(n_rows)
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_backfill_matches_point_in_time_scorer() -> None:
+    df = _career_frame()
+    out = backfill_ups(df)
+
+    provider = PriorInningsProvider()
+    scorer = UPSScorer(provider)
+    df_sorted = df.assign(_date=pd.to_datetime(df["date"])).sort_values(["player_id", "match_format", "_date"], kind="mergesort")
+    for _, group in df_sorted.groupby(["player_id", "match_format"]):
+        prior = []
+        for idx, row in group.iterrows():
+            provider.history = [{"runs_scored": r} for r in reversed(prior)]
+            expected = scorer.score_innings(row["player_id"], row["match_format"], float(row["runs_scored"]))
+            actual = out.loc[idx]
+            assert actual["ups_score"] == expected["ups_score"]
+            assert actual["ups_bucket"] == expected["ups_bucket"]
+            assert actual["ups_anomaly_flag"] == expected["ups_anomaly_flag"]
+            assert actual["baseline_mean_runs"] == expected["baseline_mean_runs"]
+            assert actual["baseline_std_runs"] == expected["baseline_std_runs"]
+            assert actual["baseline_source"] == expected["baseline_source"]
+            prior.append(float(row["runs_scored"]))
+
+
+def test_backfill_preserves_row_order_and_has_no_lookahead() -> None:
+    df = pd.DataFrame(
+        {
+            "player_id": ["A"] * 7,
+            "match_format": ["T20"] * 7,
+            "date": ["2024-01-07", "2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05", "2024-01-06"],
+            "runs_scored": [500, 10, 10, 10, 10, 10, 10],
+        }
+    )
+    out = backfill_ups(df, min_history=5)
+
+    assert out["runs_scored"].tolist() == df["runs_scored"].tolist()
+    assert out.loc[1, "baseline_source"] != "player"  # first innings: no prior history
+    assert out.loc[6, "baseline_source"] == "player"
+    assert out.loc[6, "baseline_mean_runs"] == 10.0  # the later 500 never leaks backwards
+    assert out.loc[0, "ups_bucket"] == "extreme_spike"
+
+
+def test_write_backfill_csv_and_parquet(tmp_path: Path) -> None:
+    out = backfill_ups(_career_frame(50))
+    csv_path = write_backfill(out, tmp_path / "ups.csv")
+    parquet_path = write_backfill(out, tmp_path / "ups.parquet")
+
+    assert len(pd.read_csv(csv_path)) == 50
+    assert pd.read_parquet(parquet_path)["ups_score"].tolist() == out["ups_score"].tolist()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ups.csv", "ups.parquet"]  # temp files renamed away
+
+
+def test_backfill_fallbacks_use_each_rows_role() -> None:
+    rnd = random.Random(5)
+    df = _career_frame(300).assign(
+        team=lambda d: [rnd.choice(["A", "B", None]) for _ in range(len(d))],
+        batting_position=lambda d: [rnd.choice([1, 4, 7, None]) for _ in range(len(d))],
+    )
+    table = RoleBaselineTable.from_dataframe(df, min_innings=5)
+    out = backfill_ups(df, min_history=5, role_baselines=table)
+
+    scorer = UPSScorer(PriorInningsProvider(), role_baselines=table)
+    fallback = out[out["baseline_source"] != "player"]
+    assert fallback["baseline_source"].nunique() > 1
+    for idx, row in fallback.iterrows():
+        position = None if pd.isna(row["batting_position"]) else int(row["batting_position"])
+        expected = scorer._fallback_baseline(row["player_id"], row["match_format"], (row["team"], position))
+        assert (row["baseline_mean_runs"], row["baseline_source"]) == (expected.mean_runs, expected.source), idx
@@ -1,5 +1,9 @@
+import math
 from typing import Any, Dict, Iterable
 
+import pytest
+
+from plaix.core.baseline_cache import BaselineCache
 from plaix.core.ups_scorer import UPSScorer
 
 
@@ -73,3 +77,91 @@ def test_score_innings_integration() -> None:
     assert expected_keys.issubset(result.keys())
     assert result["ups_score"] > 0
     assert result["ups_anomaly_flag"] in {0, 1}
+
+
+def test_score_innings_batch_matches_scalar_path() -> None:
+    provider = FakeHistoryProvider()
+    provider.data[("P2", "ODI")] = [{"runs_scored": r} for r in (5, 88, 41, 0, 17, 63, 9)]
+    provider.data[("P3", "T20")] = [{"runs_scored": 12}, {"runs_scored": 30}]  # below min_history
+    scorer = UPSScorer(provider)
+
+    player_ids = ["P1", "P2", "P3", "P1", "UNKNOWN", "P2"]
+    formats = ["T20", "ODI", "T20", "T20", "TEST", "ODI"]
+    runs = [60, 12.5, 45, 18, 80, 140]
+
+    batch = scorer.score_innings_batch(player_ids, formats, runs)
+
+    assert len(batch) == len(runs)
+    for result, player_id, match_format, current_runs in zip(batch, player_ids, formats, runs):
+        assert result == scorer.score_innings(player_id, match_format, current_runs)
+
+
+def test_score_innings_batch_empty_and_mismatched() -> None:
+    scorer = _scorer()
+    assert scorer.score_innings_batch([], [], []) == []
+    with pytest.raises(ValueError):
+        scorer.score_innings_batch(["P1"], ["T20", "ODI"], [10])
+
+
+class BulkHistoryProvider(FakeHistoryProvider):
+    """Adds bulk lookups and records how the scorer fetched history."""
+
+    def __init__(self):
+        super().__init__()
+        self.single_calls = 0
+        self.bulk_calls = []
+
+    def get_player_innings_history(self, player_id: str, match_format: str) -> Iterable[Dict[str, Any]]:
+        self.single_calls += 1
+        return super().get_player_innings_history(player_id, match_format)
+
+    def get_many_player_innings_histories(self, keys, limit=None):
+        self.bulk_calls.append((list(keys), limit))
+        return {key: self.data[key][:limit] for key in keys if key in self.data}
+
+
+def test_batch_uses_bulk_history_when_available() -> None:
+    provider = BulkHistoryProvider()
+    scorer = UPSScorer(provider)
+
+    batch = scorer.score_innings_batch(["P1", "P9", "P1"], ["T20", "T20", "T20"], [60, 30, 10])
+
+    assert provider.single_calls == 0
+    assert provider.bulk_calls == [([("P1", "T20"), ("P9", "T20")], scorer.window_size)]
+    reference = _scorer()
+    assert batch == [
+        reference.score_innings("P1", "T20", 60),
+        reference.score_innings("P9", "T20", 30),
+        reference.score_innings("P1", "T20", 10),
+    ]
+
+
+def test_bucket_thresholds_agree_with_ups_classification() -> None:
+    scorer = _scorer()
+    thresholds = scorer.get_bucket_thresholds("P1", "T20")
+    baseline = scorer.compute_player_baseline("P1", "T20")
+
+    assert thresholds.mild_runs < thresholds.strong_runs < thresholds.extreme_runs
+    assert thresholds.mild_runs == pytest.approx(baseline.mean_runs + baseline.std_runs)
+    probes = [0, 10, 25.5, 40]
+    for t in (thresholds.mild_runs, thresholds.strong_runs, thresholds.extreme_runs):
+        probes += [t, math.nextafter(t, -math.inf), math.nextafter(t, math.inf)]
+    for runs in probes:
+        expected = scorer.classify_ups(scorer.compute_ups_score("P1", "T20", runs))
+        assert scorer.classify_runs("P1", "T20", runs) == expected
+    flags, buckets = thresholds.classify_array(probes)
+    assert [(int(f), str(b)) for f, b in zip(flags, buckets)] == [scorer.classify_runs("P1", "T20", r) for r in probes]
+
+
+def test_bucket_thresholds_cached_and_invalidated() -> None:
+    provider = FakeHistoryProvider()
+    scorer = UPSScorer(provider, baseline_cache=BaselineCache())
+
+    first = scorer.get_bucket_thresholds("P1", "T20")
+    assert scorer.get_bucket_thresholds("P1", "T20") is first
+
+    provider.data[("P1", "T20")].insert(0, {"runs_scored": 120})
+    scorer.invalidate_player("P1", "T20")
+    refreshed = scorer.get_bucket_thresholds("P1", "T20")
+    assert refreshed is not first
+    assert refreshed.mild_runs > first.mild_runs